@@ -8,6 +8,7 @@
 #include <ctime>
 #include <cstdlib>
 #include <string>
+#include <chrono>
 
 #ifdef _WIN32
 #include <windows.h>
@@ -16,6 +17,7 @@
 #else
 #include <unistd.h>
 #include <sys/types.h>
+#include <sys/resource.h>
 #include <dirent.h>
 #endif
 
@@ -41,6 +43,23 @@ struct Process {
           completionTime(0), responseTime(-1), priority(pr), state("NEW") {}
 };
 
+// Run metrics exported with --metrics; the fields match metrics.py records
+struct RunMetrics {
+    string algorithm;
+    int quantum;
+    int processes;
+    int contextSwitches;
+    int totalTime;
+    double avgWait;
+    double avgTurnaround;
+    double avgResponse;
+    double cpuUtil;
+    double throughput;
+    long long events;
+    int peakReadyQueue;
+    vector<pair<string, double>> phases;
+};
+
 // Context Switch Event for logging
 struct ContextSwitchEvent {
     int time;
@@ -61,17 +80,39 @@ private:
     int contextSwitches;
     Process* currentProcess;
     string algorithm;
+    bool verbose;
+    long long events;
+    int peakReadyQueue;
+    
+    // Remember the longest ready queue seen
+    void noteReadyQueue(int size) {
+        if (size > peakReadyQueue) peakReadyQueue = size;
+    }
     
 public:
     ProcessScheduler(int quantum = 2, string algo = "RR") 
         : currentTime(0), timeQuantum(quantum), contextSwitches(0), 
-          currentProcess(nullptr), algorithm(algo) {}
+          currentProcess(nullptr), algorithm(algo), verbose(true),
+          events(0), peakReadyQueue(0) {}
     
     // Add process to scheduler
     void addProcess(Process p) {
         processes.push_back(p);
     }
     
+    // Turn per-event console output on/off (off for benchmarks)
+    void setVerbose(bool v) {
+        verbose = v;
+    }
+    
+    int getCurrentTime() const {
+        return currentTime;
+    }
+    
+    int getContextSwitches() const {
+        return contextSwitches;
+    }
+    
     // Get system processes (Windows)
     #ifdef _WIN32
     void fetchSystemProcesses(int count = 10) {
@@ -200,9 +241,9 @@ public:
         switchLog.push_back(event);
         
         // Display context switch
-        cout << "[Time " << currentTime << "] Context Switch: " 
-             << event.fromProcess << " -> " << event.toProcess 
-             << " (" << reason << ")\n";
+        if (verbose) cout << "[Time " << currentTime << "] Context Switch: " 
+                 << event.fromProcess << " -> " << event.toProcess 
+                 << " (" << reason << ")\n";
     }
     
     // Round Robin Scheduling
@@ -211,7 +252,7 @@ public:
         int completed = 0;
         int n = processes.size();
         
-        cout << "\n--- Starting Round Robin Scheduling ---\n";
+        if (verbose) cout << "\n--- Starting Round Robin Scheduling ---\n";
         
         while (completed < n) {
             // Check for newly arrived processes
@@ -219,8 +260,8 @@ public:
                 if (processes[i].arrivalTime == currentTime && processes[i].state == "NEW") {
                     processes[i].state = "READY";
                     readyQueue.push(i);
-                    cout << "[Time " << currentTime << "] Process " 
-                         << processes[i].name << " arrived\n";
+                    if (verbose) cout << "[Time " << currentTime << "] Process " 
+                             << processes[i].name << " arrived\n";
                 }
             }
             
@@ -231,6 +272,8 @@ public:
             
             int idx = readyQueue.front();
             readyQueue.pop();
+            events++;
+            noteReadyQueue(readyQueue.size());
             
             Process* prev = currentProcess;
             currentProcess = &processes[idx];
@@ -264,18 +307,19 @@ public:
                     if (processes[i].arrivalTime == currentTime && processes[i].state == "NEW") {
                         processes[i].state = "READY";
                         readyQueue.push(i);
-                        cout << "[Time " << currentTime << "] Process " 
-                             << processes[i].name << " arrived\n";
+                        if (verbose) cout << "[Time " << currentTime << "] Process " 
+                                 << processes[i].name << " arrived\n";
                     }
                 }
+                noteReadyQueue(readyQueue.size());
             }
             
             if (currentProcess->remainingTime == 0) {
                 currentProcess->state = "COMPLETED";
                 currentProcess->completionTime = currentTime;
                 currentProcess->turnaroundTime = currentProcess->completionTime - currentProcess->arrivalTime;
-                cout << "[Time " << currentTime << "] Process " 
-                     << currentProcess->name << " completed\n";
+                if (verbose) cout << "[Time " << currentTime << "] Process " 
+                         << currentProcess->name << " completed\n";
                 completed++;
             } else {
                 currentProcess->state = "READY";
@@ -291,8 +335,11 @@ public:
                  return a.arrivalTime < b.arrivalTime;
              });
         
-        cout << "\n--- Starting FCFS Scheduling ---\n";
+        if (verbose) cout << "\n--- Starting FCFS Scheduling ---\n";
         
+        int n = processes.size();
+        int arrived = 0;
+        int started = 0;
         for (auto& proc : processes) {
             if (currentTime < proc.arrivalTime) {
                 currentTime = proc.arrivalTime;
@@ -308,13 +355,19 @@ public:
             
             currentTime += proc.burstTime;
             proc.remainingTime = 0;
+            events++;
+            started++;
+            
+            // The queue is longest just before this process completes
+            while (arrived < n && processes[arrived].arrivalTime < currentTime) arrived++;
+            noteReadyQueue(arrived - started);
             
             proc.completionTime = currentTime;
             proc.turnaroundTime = proc.completionTime - proc.arrivalTime;
             proc.state = "COMPLETED";
             
-            cout << "[Time " << currentTime << "] Process " 
-                 << proc.name << " completed\n";
+            if (verbose) cout << "[Time " << currentTime << "] Process " 
+                     << proc.name << " completed\n";
         }
     }
     
@@ -323,26 +376,40 @@ public:
         int completed = 0;
         int n = processes.size();
         
-        cout << "\n--- Starting Priority Scheduling ---\n";
+        if (verbose) cout << "\n--- Starting Priority Scheduling ---\n";
         
+        // The choice can only change once the running process completes
+        // or something arrives; count a dispatch only at those points, as
+        // the Python engine does, not for every time unit it keeps running
+        bool decide = true;
         while (completed < n) {
             int idx = -1;
             int highestPriority = 9999;
+            int ready = 0;
             
             // Find highest priority ready process
             for (int i = 0; i < n; i++) {
                 if (processes[i].arrivalTime <= currentTime && 
-                    processes[i].remainingTime > 0 &&
-                    processes[i].priority < highestPriority) {
-                    highestPriority = processes[i].priority;
-                    idx = i;
+                    processes[i].remainingTime > 0) {
+                    ready++;
+                    if (processes[i].arrivalTime == currentTime) decide = true;
+                    if (processes[i].priority < highestPriority) {
+                        highestPriority = processes[i].priority;
+                        idx = i;
+                    }
                 }
             }
             
             if (idx == -1) {
                 currentTime++;
+                decide = true;
                 continue;
             }
+            noteReadyQueue(ready - 1);
+            if (decide) {
+                events++;
+                decide = false;
+            }
             
             Process* prev = currentProcess;
             currentProcess = &processes[idx];
@@ -371,18 +438,21 @@ public:
                 currentProcess->state = "COMPLETED";
                 currentProcess->completionTime = currentTime;
                 currentProcess->turnaroundTime = currentProcess->completionTime - currentProcess->arrivalTime;
-                cout << "[Time " << currentTime << "] Process " 
-                     << currentProcess->name << " completed\n";
+                if (verbose) cout << "[Time " << currentTime << "] Process " 
+                         << currentProcess->name << " completed\n";
                 completed++;
+                decide = true;
             }
         }
     }
     
     // Start scheduling
     void startScheduling() {
-        cout << "\n========================================\n";
-        cout << "   Starting " << algorithm << " Scheduling\n";
-        cout << "========================================\n";
+        if (verbose) {
+            cout << "\n========================================\n";
+            cout << "   Starting " << algorithm << " Scheduling\n";
+            cout << "========================================\n";
+        }
         
         clock_t start = clock();
         
@@ -397,10 +467,12 @@ public:
         clock_t end = clock();
         double duration = double(end - start) / CLOCKS_PER_SEC * 1000;
         
-        cout << "\n========================================\n";
-        cout << "Scheduling completed in " << duration << "ms\n";
-        cout << "Total Context Switches: " << contextSwitches << "\n";
-        cout << "========================================\n";
+        if (verbose) {
+            cout << "\n========================================\n";
+            cout << "Scheduling completed in " << duration << "ms\n";
+            cout << "Total Context Switches: " << contextSwitches << "\n";
+            cout << "========================================\n";
+        }
     }
     
     // Save results to CSV
@@ -440,6 +512,34 @@ public:
         cout << "✓ Context switches saved to: context_switches.csv\n";
     }
     
+    // Statistics and internal counters of the finished run
+    RunMetrics collectMetrics() const {
+        RunMetrics m;
+        m.algorithm = algorithm;
+        m.quantum = timeQuantum;
+        m.processes = processes.size();
+        m.contextSwitches = contextSwitches;
+        m.totalTime = currentTime;
+        m.events = events;
+        m.peakReadyQueue = peakReadyQueue;
+        
+        double wait = 0, turnaround = 0, response = 0, burst = 0;
+        for (const auto& p : processes) {
+            wait += p.waitTime;
+            turnaround += p.turnaroundTime;
+            response += p.responseTime;
+            burst += p.burstTime;
+        }
+        
+        int n = m.processes;
+        m.avgWait = n ? wait / n : 0;
+        m.avgTurnaround = n ? turnaround / n : 0;
+        m.avgResponse = n ? response / n : 0;
+        m.cpuUtil = currentTime > 0 ? burst / currentTime * 100 : 0;
+        m.throughput = currentTime > 0 ? (double)n / currentTime : 0;
+        return m;
+    }
+    
     // Display statistics
     void displayStatistics() {
         cout << "\n========================================\n";
@@ -447,38 +547,258 @@ public:
         cout << "========================================\n";
         cout << fixed << setprecision(2);
         
-        double avgWaitTime = 0, avgTurnaroundTime = 0, avgResponseTime = 0;
-        
-        for (const auto& p : processes) {
-            avgWaitTime += p.waitTime;
-            avgTurnaroundTime += p.turnaroundTime;
-            avgResponseTime += p.responseTime;
-        }
-        
-        int n = processes.size();
-        avgWaitTime /= n;
-        avgTurnaroundTime /= n;
-        avgResponseTime /= n;
-        
-        double cpuUtilization = 0;
-        for (const auto& p : processes) {
-            cpuUtilization += p.burstTime;
-        }
-        cpuUtilization = (cpuUtilization / currentTime) * 100;
-        
-        cout << "Total Processes: " << n << "\n";
-        cout << "Context Switches: " << contextSwitches << "\n";
-        cout << "Total Time: " << currentTime << " units\n";
-        cout << "CPU Utilization: " << cpuUtilization << "%\n";
-        cout << "Average Wait Time: " << avgWaitTime << " units\n";
-        cout << "Average Turnaround Time: " << avgTurnaroundTime << " units\n";
-        cout << "Average Response Time: " << avgResponseTime << " units\n";
-        cout << "Throughput: " << (double)n / currentTime << " processes/unit\n";
+        RunMetrics m = collectMetrics();
+        
+        cout << "Total Processes: " << m.processes << "\n";
+        cout << "Context Switches: " << m.contextSwitches << "\n";
+        cout << "Total Time: " << m.totalTime << " units\n";
+        cout << "CPU Utilization: " << m.cpuUtil << "%\n";
+        cout << "Average Wait Time: " << m.avgWait << " units\n";
+        cout << "Average Turnaround Time: " << m.avgTurnaround << " units\n";
+        cout << "Average Response Time: " << m.avgResponse << " units\n";
+        cout << "Throughput: " << m.throughput << " processes/unit\n";
+        cout << "Peak Ready Queue: " << m.peakReadyQueue << "\n";
         cout << "========================================\n";
     }
 };
 
-int main() {
+// Seconds elapsed since start
+double secondsSince(chrono::steady_clock::time_point start) {
+    return chrono::duration<double>(chrono::steady_clock::now() - start).count();
+}
+
+// Peak resident set size of this process in bytes (-1 if unknown)
+long long peakRssBytes() {
+#ifdef _WIN32
+    PROCESS_MEMORY_COUNTERS counters;
+    if (GetProcessMemoryInfo(GetCurrentProcess(), &counters, sizeof(counters))) {
+        return (long long)counters.PeakWorkingSetSize;
+    }
+    return -1;
+#else
+    struct rusage usage;
+    if (getrusage(RUSAGE_SELF, &usage) != 0) return -1;
+#ifdef __APPLE__
+    return (long long)usage.ru_maxrss;
+#else
+    return (long long)usage.ru_maxrss * 1024;
+#endif
+#endif
+}
+
+// Escape a string for a JSON value or an OpenMetrics label
+string escapeText(const string& text) {
+    string escaped;
+    for (char c : text) {
+        if (c == '\\' || c == '"') escaped += '\\';
+        if (c == '\n') {
+            escaped += "\\n";
+            continue;
+        }
+        escaped += c;
+    }
+    return escaped;
+}
+
+string formatNumber(double value) {
+    ostringstream out;
+    out << setprecision(15) << value;
+    return out.str();
+}
+
+double phaseSeconds(const RunMetrics& m, const string& phase) {
+    for (const auto& entry : m.phases) {
+        if (entry.first == phase) return entry.second;
+    }
+    return 0;
+}
+
+// One JSON line with the same fields as metrics.run_metrics
+void writeMetricsJson(ostream& out, const RunMetrics& m, double timestamp, long long rss) {
+    double seconds = phaseSeconds(m, "simulate");
+    out << "{\"timestamp\": " << formatNumber(timestamp)
+        << ", \"engine\": \"cpp\", \"algorithm\": \"" << escapeText(m.algorithm) << "\""
+        << ", \"quantum\": " << m.quantum
+        << ", \"total_processes\": " << m.processes
+        << ", \"context_switches\": " << m.contextSwitches
+        << ", \"total_time\": " << m.totalTime
+        << ", \"avg_wait\": " << formatNumber(m.avgWait)
+        << ", \"avg_turnaround\": " << formatNumber(m.avgTurnaround)
+        << ", \"avg_response\": " << formatNumber(m.avgResponse)
+        << ", \"cpu_util\": " << formatNumber(m.cpuUtil)
+        << ", \"throughput\": " << formatNumber(m.throughput)
+        << ", \"events\": " << m.events
+        << ", \"simulate_seconds\": " << formatNumber(seconds)
+        << ", \"events_per_second\": ";
+    if (seconds > 0) out << formatNumber(m.events / seconds);
+    else out << "null";
+    out << ", \"peak_ready_queue\": " << m.peakReadyQueue
+        << ", \"peak_rss_bytes\": ";
+    if (rss >= 0) out << rss;
+    else out << "null";
+    out << ", \"phases\": {";
+    for (size_t k = 0; k < m.phases.size(); k++) {
+        out << (k ? ", " : "") << "\"" << escapeText(m.phases[k].first) << "\": "
+            << formatNumber(m.phases[k].second);
+    }
+    out << "}, \"counters\": {}}\n";
+}
+
+void writeGauge(ostream& out, const string& name, const string& unit, const string& help,
+                const string& labels, const string& value) {
+    out << "# TYPE " << name << " gauge\n";
+    if (!unit.empty()) out << "# UNIT " << name << " " << unit << "\n";
+    out << "# HELP " << name << " " << help << "\n";
+    out << name << "{" << labels << "} " << value << "\n";
+}
+
+// OpenMetrics text with the same metric names as metrics.py
+void writeMetricsOpenMetrics(ostream& out, const RunMetrics& m, double timestamp, long long rss) {
+    string labels = "engine=\"cpp\",algorithm=\"" + escapeText(m.algorithm) + "\"";
+    if (m.algorithm == "RR") labels += ",quantum=\"" + to_string(m.quantum) + "\"";
+    double seconds = phaseSeconds(m, "simulate");
+    
+    writeGauge(out, "ctxsim_processes", "", "Processes in the run", labels, to_string(m.processes));
+    writeGauge(out, "ctxsim_context_switches", "", "Context switches in the run", labels,
+               to_string(m.contextSwitches));
+    writeGauge(out, "ctxsim_simulated_time", "", "Simulated time units until the last completion",
+               labels, to_string(m.totalTime));
+    writeGauge(out, "ctxsim_avg_wait_time", "", "Mean wait time in time units", labels,
+               formatNumber(m.avgWait));
+    writeGauge(out, "ctxsim_avg_turnaround_time", "", "Mean turnaround time in time units", labels,
+               formatNumber(m.avgTurnaround));
+    writeGauge(out, "ctxsim_avg_response_time", "", "Mean response time in time units", labels,
+               formatNumber(m.avgResponse));
+    writeGauge(out, "ctxsim_cpu_utilization_percent", "", "Share of the run the CPU was busy", labels,
+               formatNumber(m.cpuUtil));
+    writeGauge(out, "ctxsim_throughput", "", "Completed processes per time unit", labels,
+               formatNumber(m.throughput));
+    writeGauge(out, "ctxsim_events", "", "Scheduler dispatch decisions in the run", labels,
+               to_string(m.events));
+    if (seconds > 0) {
+        writeGauge(out, "ctxsim_events_per_second", "", "Dispatch decisions per second of simulation",
+                   labels, formatNumber(m.events / seconds));
+    }
+    writeGauge(out, "ctxsim_peak_ready_queue", "", "Most processes waiting in the ready queue at once",
+               labels, to_string(m.peakReadyQueue));
+    if (rss >= 0) {
+        writeGauge(out, "ctxsim_peak_rss_bytes", "bytes", "Peak resident set size of the simulating process",
+                   labels, to_string(rss));
+    }
+    writeGauge(out, "ctxsim_last_run_timestamp_seconds", "seconds", "When the run was recorded (Unix time)",
+               labels, formatNumber(timestamp));
+    
+    if (!m.phases.empty()) {
+        out << "# TYPE ctxsim_phase_duration_seconds gauge\n";
+        out << "# UNIT ctxsim_phase_duration_seconds seconds\n";
+        out << "# HELP ctxsim_phase_duration_seconds Wall time of each profiled phase of the run\n";
+        for (const auto& entry : m.phases) {
+            out << "ctxsim_phase_duration_seconds{" << labels << ",phase=\"" << escapeText(entry.first)
+                << "\"} " << formatNumber(entry.second) << "\n";
+        }
+    }
+    out << "# TYPE ctxsim_runs counter\n";
+    out << "# HELP ctxsim_runs Runs recorded since the exporter started\n";
+    out << "ctxsim_runs_total{" << labels << "} 1\n";
+    out << "# EOF\n";
+}
+
+// Export run metrics: "jsonl" appends a line to path, "openmetrics"
+// rewrites it; "-" writes to stdout
+bool exportMetrics(const string& path, const string& format, const RunMetrics& m) {
+    double timestamp = chrono::duration<double>(chrono::system_clock::now().time_since_epoch()).count();
+    long long rss = peakRssBytes();
+    
+    ofstream file;
+    if (path != "-") {
+        file.open(path, format == "jsonl" ? ios::app : ios::trunc);
+        if (!file.is_open()) {
+            cerr << "Error opening metrics file: " << path << "\n";
+            return false;
+        }
+    }
+    ostream& out = path == "-" ? cout : file;
+    if (format == "jsonl") {
+        writeMetricsJson(out, m, timestamp, rss);
+    } else {
+        writeMetricsOpenMetrics(out, m, timestamp, rss);
+    }
+    return true;
+}
+
+// Benchmark mode: backend --bench <ALGO> <quantum> <workload.csv>
+// The workload file has one "arrival,burst,priority" line per process.
+// Prints a single JSON line with the scheduling time so benchmark.py can
+// compare it against the Python engine on the same workload. With
+// --metrics it also exports the run metrics (see exportMetrics).
+int runBenchmark(const string& algorithm, int quantum, const string& workloadPath,
+                 const string& metricsPath, const string& metricsFormat) {
+    auto loadStart = chrono::steady_clock::now();
+    ifstream file(workloadPath);
+    if (!file.is_open()) {
+        cerr << "Error opening workload file: " << workloadPath << "\n";
+        return 1;
+    }
+    
+    ProcessScheduler scheduler(quantum, algorithm);
+    scheduler.setVerbose(false);
+    
+    string line;
+    int count = 0;
+    while (getline(file, line)) {
+        if (line.empty()) continue;
+        stringstream ss(line);
+        string field;
+        int values[3] = {0, 0, 3};
+        for (int k = 0; k < 3 && getline(ss, field, ','); k++) {
+            values[k] = atoi(field.c_str());
+        }
+        Process p(1000 + count, "P" + to_string(count + 1), values[0], values[1], values[2]);
+        scheduler.addProcess(p);
+        count++;
+    }
+    double loadSeconds = secondsSince(loadStart);
+    
+    auto start = chrono::steady_clock::now();
+    scheduler.startScheduling();
+    double seconds = secondsSince(start);
+    
+    cout << "{\"engine\": \"cpp\", \"algorithm\": \"" << algorithm << "\", "
+         << "\"processes\": " << count << ", "
+         << "\"seconds\": " << setprecision(9) << seconds << ", "
+         << "\"context_switches\": " << scheduler.getContextSwitches() << ", "
+         << "\"total_time\": " << scheduler.getCurrentTime() << "}\n";
+    
+    if (!metricsPath.empty()) {
+        RunMetrics m = scheduler.collectMetrics();
+        m.phases.push_back(make_pair("load_workload", loadSeconds));
+        m.phases.push_back(make_pair("simulate", seconds));
+        if (!exportMetrics(metricsPath, metricsFormat, m)) return 1;
+    }
+    return 0;
+}
+
+int main(int argc, char* argv[]) {
+    // --metrics PATH [--metrics-format jsonl|openmetrics] may go with either mode
+    vector<string> args;
+    string metricsPath, metricsFormat = "jsonl";
+    for (int i = 1; i < argc; i++) {
+        string arg = argv[i];
+        if ((arg == "--metrics" || arg == "--metrics-format") && i + 1 < argc) {
+            (arg == "--metrics" ? metricsPath : metricsFormat) = argv[++i];
+        } else {
+            args.push_back(arg);
+        }
+    }
+    if (metricsFormat != "jsonl" && metricsFormat != "openmetrics") {
+        cerr << "Unknown metrics format: " << metricsFormat << " (use jsonl or openmetrics)\n";
+        return 2;
+    }
+    
+    if (args.size() == 4 && args[0] == "--bench") {
+        return runBenchmark(args[1], atoi(args[2].c_str()), args[3], metricsPath, metricsFormat);
+    }
+    
     srand(time(0));
     
     cout << "\n========================================\n";
@@ -515,16 +835,32 @@ int main() {
     
     ProcessScheduler scheduler(quantum, algorithm);
     
+    auto inputStart = chrono::steady_clock::now();
     if (choice == 1) {
         cout << "\nFetching system processes...\n";
         scheduler.fetchSystemProcesses(8);
     } else {
         scheduler.addUserProcesses();
     }
+    double inputSeconds = secondsSince(inputStart);
     
+    auto start = chrono::steady_clock::now();
     scheduler.startScheduling();
+    double seconds = secondsSince(start);
     scheduler.displayStatistics();
+    auto saveStart = chrono::steady_clock::now();
     scheduler.saveToCSV();
+    double saveSeconds = secondsSince(saveStart);
+    
+    if (!metricsPath.empty()) {
+        RunMetrics m = scheduler.collectMetrics();
+        m.phases.push_back(make_pair("input", inputSeconds));
+        m.phases.push_back(make_pair("simulate", seconds));
+        m.phases.push_back(make_pair("csv_export", saveSeconds));
+        if (exportMetrics(metricsPath, metricsFormat, m)) {
+            cout << "✓ Metrics written to: " << metricsPath << "\n";
+        }
+    }
     
     cout << "\n========================================\n";
     cout << "     Simulation Complete!\n";
@@ -0,0 +1,332 @@
+"""Reproducible benchmark suite for the context switching simulator.
+
+Times the scheduling engines (Python ``simulate_scheduling`` and the C++
+``ProcessScheduler``) for RR, FCFS and PRIORITY across workload sizes, plus
+CSV save/load and Gantt/performance chart rendering. Workloads are generated
+from fixed seeds so two runs of the suite time identical inputs.
+
+Examples:
+    python benchmark.py
+    python benchmark.py --sizes 100,10000 --algorithms RR,FCFS
+    python benchmark.py --output new.json --compare bench_results.json
+
+Results are written as JSON (see ``--output``). ``--compare`` reports cases
+that got slower than a previous results file and exits with status 1 if
+any regression exceeds ``--threshold``.
+"""
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ALGORITHMS = ["RR", "FCFS", "PRIORITY"]
+ENGINES = ["python", "cpp"]
+DEFAULT_SIZES = [100, 10000, 1000000]
+SCHEMA_VERSION = 1
+
+
+def make_workload(num_processes, seed):
+    """Build the same kind of workload as the GUI's classic random input"""
+    rng = np.random.RandomState(seed)
+    return {
+        'arrival': np.arange(num_processes, dtype=np.int64) * 2,
+        'burst': rng.randint(3, 12, size=num_processes).astype(np.int64),
+        'priority': rng.randint(1, 6, size=num_processes).astype(np.int64)
+    }
+
+
+def _best_of(fn, repeat):
+    times = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = fn()
+        times.append(time.perf_counter() - start)
+    return min(times), times, value
+
+
+def _run_python_case(case, algorithm, num_processes, seed, quantum, repeat, conn):
+    """Run one Python case in a child process and send the timing back"""
+    try:
+        import pandas as pd
+        import scheduler
+
+        processes = make_workload(num_processes, seed)
+        extra = {}
+
+        if case == 'generate_workload':
+            from workload import generate_workload
+
+            best, times, _ = _best_of(lambda: generate_workload(num_processes, seed=seed), repeat)
+        elif case == 'simulate':
+            best, times, result = _best_of(
+                lambda: scheduler.simulate_scheduling(processes, algorithm, quantum), repeat)
+            extra['context_switches'] = result['context_switches']
+            extra['total_time'] = result['total_time']
+            extra['counters'] = result['counters']
+        else:
+            result = scheduler.simulate_scheduling(processes, algorithm, quantum)
+            tmp_dir = tempfile.mkdtemp(prefix='ctxbench-')
+            proc_path = os.path.join(tmp_dir, 'context_switch_log.csv')
+            switch_path = os.path.join(tmp_dir, 'context_switches.csv')
+            rates_path = os.path.join(tmp_dir, 'context_switch_rates.csv')
+            try:
+                if case == 'csv_save':
+                    best, times, _ = _best_of(
+                        lambda: scheduler.save_simulation_results(result, proc_path, switch_path,
+                                                                  rates_path),
+                        repeat)
+                elif case == 'csv_load':
+                    scheduler.save_simulation_results(result, proc_path, switch_path, rates_path)
+                    best, times, _ = _best_of(
+                        lambda: (pd.read_csv(proc_path), pd.read_csv(switch_path)), repeat)
+                else:
+                    from matplotlib.backends.backend_agg import FigureCanvasAgg
+                    import charts
+
+                    builder = {
+                        'gantt_render': charts.build_gantt_figure,
+                        'performance_render': charts.build_performance_figure,
+                    }[case]
+                    process_data = scheduler.process_frame(result)
+
+                    def render():
+                        FigureCanvasAgg(builder(process_data)).draw()
+
+                    best, times, _ = _best_of(render, repeat)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        conn.send({'status': 'ok', 'seconds': best, 'runs': times, **extra})
+    except Exception as e:
+        conn.send({'status': 'error', 'error': f'{type(e).__name__}: {e}'})
+    finally:
+        conn.close()
+
+
+def run_python_case(case, algorithm, num_processes, seed, quantum, repeat, budget):
+    """Run a Python case in a fresh process so a runaway case can be killed"""
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    worker = multiprocessing.Process(
+        target=_run_python_case,
+        args=(case, algorithm, num_processes, seed, quantum, repeat, child_conn))
+    worker.start()
+    child_conn.close()
+
+    if parent_conn.poll(budget):
+        outcome = parent_conn.recv()
+        worker.join()
+        return outcome
+
+    worker.terminate()
+    worker.join()
+    return {'status': 'timeout'}
+
+
+def build_cpp_backend(source='backend.cpp'):
+    """Compile backend.cpp into a temporary directory, or return None"""
+    compiler = shutil.which('g++') or shutil.which('clang++')
+    if compiler is None or not os.path.exists(source):
+        return None
+
+    binary = os.path.join(tempfile.mkdtemp(prefix='ctxbench-'), 'backend')
+    build = subprocess.run([compiler, '-O2', '-std=c++11', '-o', binary, source],
+                           capture_output=True, text=True)
+    if build.returncode != 0:
+        print(build.stderr, file=sys.stderr)
+        return None
+    return binary
+
+
+def run_cpp_case(binary, algorithm, num_processes, seed, quantum, repeat, budget):
+    """Time the C++ ProcessScheduler on the same seeded workload"""
+    if binary is None:
+        return {'status': 'unavailable'}
+
+    fd, workload_path = tempfile.mkstemp(prefix='ctxbench-', suffix='.csv')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            workload = make_workload(num_processes, seed)
+            np.savetxt(f, np.column_stack([workload['arrival'], workload['burst'],
+                                           workload['priority']]), fmt='%d', delimiter=',')
+
+        times = []
+        outcome = {}
+        deadline = time.monotonic() + budget
+        for _ in range(repeat):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {'status': 'timeout'}
+            try:
+                run = subprocess.run([binary, '--bench', algorithm, str(quantum), workload_path],
+                                     capture_output=True, text=True, timeout=remaining)
+            except subprocess.TimeoutExpired:
+                return {'status': 'timeout'}
+            if run.returncode != 0:
+                return {'status': 'error', 'error': run.stderr.strip()}
+            outcome = json.loads(run.stdout.strip().splitlines()[-1])
+            times.append(outcome['seconds'])
+
+        return {
+            'status': 'ok',
+            'seconds': min(times),
+            'runs': times,
+            'context_switches': outcome['context_switches'],
+            'total_time': outcome['total_time']
+        }
+    finally:
+        os.remove(workload_path)
+
+
+def plan_cases(algorithms, engines):
+    """List (case, engine, algorithm) series; each series runs every size"""
+    series = []
+    for engine in engines:
+        for algorithm in algorithms:
+            series.append(('simulate', engine, algorithm))
+    if 'python' in engines:
+        series.append(('generate_workload', 'python', '-'))
+        # Export and chart cases only need a result to work on; FCFS is the
+        # cheapest engine to produce one
+        for case in ('csv_save', 'csv_load', 'gantt_render', 'performance_render'):
+            series.append((case, 'python', 'FCFS'))
+    return series
+
+
+def run_suite(args):
+    binary = args.cpp_binary
+    built_binary = None
+    if 'cpp' in args.engines and binary is None:
+        binary = built_binary = build_cpp_backend()
+
+    results = []
+    for case, engine, algorithm in plan_cases(args.algorithms, args.engines):
+        gave_up = False
+        for num_processes in sorted(args.sizes):
+            record = {
+                'case': case,
+                'engine': engine,
+                'algorithm': algorithm,
+                'processes': num_processes,
+                'seed': args.seed,
+                'quantum': args.quantum
+            }
+
+            if gave_up:
+                record['status'] = 'skipped'
+            elif case in ('gantt_render', 'performance_render') and num_processes > args.max_chart_size:
+                record['status'] = 'skipped'
+            elif engine == 'cpp':
+                record.update(run_cpp_case(binary, algorithm, num_processes, args.seed,
+                                           args.quantum, args.repeat, args.budget))
+            else:
+                record.update(run_python_case(case, algorithm, num_processes, args.seed,
+                                              args.quantum, args.repeat, args.budget))
+
+            # A case that blew the budget will only be slower on bigger inputs
+            if record['status'] in ('timeout', 'unavailable', 'error'):
+                gave_up = True
+
+            results.append(record)
+            seconds = f"{record['seconds']:.6f}s" if 'seconds' in record else record['status']
+            print(f"{case:<20}{engine:<8}{algorithm:<10}{num_processes:>10}  {seconds}",
+                  flush=True)
+
+    if built_binary:
+        shutil.rmtree(os.path.dirname(built_binary), ignore_errors=True)
+
+    return {
+        'schema': SCHEMA_VERSION,
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'budget': args.budget,
+        'repeat': args.repeat,
+        'results': results
+    }
+
+
+def _result_key(record):
+    return (record['case'], record['engine'], record['algorithm'], record['processes'])
+
+
+def compare_results(baseline, current, threshold):
+    """Return (key, old, new, ratio) for every case slower than threshold"""
+    old = {_result_key(r): r for r in baseline['results'] if r.get('status') == 'ok'}
+    regressions = []
+    for record in current['results']:
+        before = old.get(_result_key(record))
+        if before is None or record.get('status') != 'ok' or before['seconds'] <= 0:
+            continue
+        ratio = record['seconds'] / before['seconds']
+        if ratio > 1 + threshold:
+            regressions.append((_result_key(record), before['seconds'], record['seconds'], ratio))
+    return regressions
+
+
+def _csv_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=lambda v: [int(x) for x in _csv_list(v)],
+                        default=DEFAULT_SIZES, help='comma separated process counts')
+    parser.add_argument('--algorithms', type=_csv_list, default=ALGORITHMS)
+    parser.add_argument('--engines', type=_csv_list, default=ENGINES)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--quantum', type=int, default=2)
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per case; the fastest run is reported')
+    parser.add_argument('--budget', type=float, default=60.0,
+                        help='seconds per case before it is abandoned')
+    parser.add_argument('--max-chart-size', type=int, default=1000,
+                        help='largest workload to render charts for')
+    parser.add_argument('--cpp-binary', help='prebuilt backend (default: compile backend.cpp)')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='previous results file to check for regressions')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='allowed slowdown ratio before a case counts as a regression')
+    args = parser.parse_args(argv)
+
+    for algorithm in args.algorithms:
+        if algorithm not in ALGORITHMS:
+            parser.error(f'unknown algorithm: {algorithm}')
+    for engine in args.engines:
+        if engine not in ENGINES:
+            parser.error(f'unknown engine: {engine}')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = run_suite(args)
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_results(baseline, report, args.threshold)
+        for key, before, after, ratio in regressions:
+            print(f"REGRESSION {'/'.join(map(str, key))}: {before:.6f}s -> {after:.6f}s "
+                  f"({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print("No regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""Matplotlib figure builders for the Gantt chart and performance graphs.
+
+The builders return plain ``Figure`` objects so the GUI can embed them in a
+``FigureCanvasTkAgg`` and headless tools can render them with Agg.
+"""
+import matplotlib.pyplot as plt
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+import numpy as np
+
+# Beyond MAX_LABELS processes bars lose their outlines and text labels and
+# are drawn as one collection, and tick labels are thinned to at most
+# MAX_TICKS; thousands of labels are unreadable and most of the layout and
+# drawing time goes into measuring them.
+MAX_LABELS = 50
+MAX_TICKS = 15
+
+
+def _label_step(count):
+    return 1 if count <= MAX_LABELS else -(-count // MAX_TICKS)
+
+
+def _bars(ax, x, heights, width=0.8, **style):
+    """``ax.bar``, drawn as a single collection when there are many bars"""
+    if len(x) <= MAX_LABELS:
+        return ax.bar(x, heights, width, **style)
+    x = np.asarray(x, dtype=float)
+    heights = np.asarray(heights, dtype=float)
+    left, right = x - width / 2, x + width / 2
+    zeros = np.zeros_like(heights)
+    verts = np.stack([np.column_stack([left, zeros]), np.column_stack([left, heights]),
+                      np.column_stack([right, heights]), np.column_stack([right, zeros])], axis=1)
+    bars = PolyCollection(verts, facecolors=style.get('color'), linewidths=0,
+                          label=style.get('label'))
+    ax.add_collection(bars)
+    ax.update_datalim(np.column_stack([np.concatenate([left, right]),
+                                       np.concatenate([zeros, heights])]))
+    ax.autoscale_view()
+    return bars
+
+
+def _reuse(fig, figsize):
+    """A cleared ``fig``, or a new styled figure when there is none to reuse"""
+    if fig is None:
+        return Figure(figsize=figsize, facecolor='#1e293b')
+    # Keeping the Figure keeps its canvas and renderer between charts
+    fig.clf()
+    fig.set_size_inches(figsize)
+    return fig
+
+
+def build_gantt_figure(process_data, fig=None):
+    """Build the Gantt chart figure for a process table, optionally reusing ``fig``"""
+    fig = _reuse(fig, (12, 6))
+    ax = fig.add_subplot(111, facecolor='#334155')
+
+    df = process_data.sort_values('Arrival Time')
+    rows = np.arange(len(df))
+    names = df['Process Name'].astype(str).to_numpy()
+    burst = df['Burst Time'].to_numpy()
+    start_time = df['Completion Time'].to_numpy() - burst
+
+    colors = plt.cm.Set3(np.linspace(0, 1, len(df)))
+
+    ax.barh(rows, burst,
+           left=start_time,
+           color=colors,
+           edgecolor='white',
+           linewidth=2 if len(df) <= MAX_LABELS else 0)
+
+    if len(df) <= MAX_LABELS:
+        for i in rows:
+            ax.text(start_time[i] + burst[i] / 2,
+                   i,
+                   f"{names[i]}\n{burst[i]}",
+                   ha='center', va='center',
+                   fontsize=9, fontweight='bold')
+
+    step = _label_step(len(df))
+    ax.set_yticks(rows[::step])
+    ax.set_yticklabels(names[::step])
+
+    ax.set_xlabel('Time Units', fontsize=12, color='white', fontweight='bold')
+    ax.set_ylabel('Processes', fontsize=12, color='white', fontweight='bold')
+    ax.set_title('Gantt Chart - Process Execution Timeline',
+                fontsize=14, color='#60a5fa', fontweight='bold', pad=20)
+
+    ax.tick_params(colors='white', labelsize=10)
+    ax.grid(True, alpha=0.3, color='white', linestyle='--')
+    ax.spines['bottom'].set_color('white')
+    ax.spines['left'].set_color('white')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.tight_layout()
+    return fig
+
+
+def build_performance_figure(process_data, fig=None):
+    """Build the 2x2 wait/turnaround/response figure for a process table"""
+    fig = _reuse(fig, (14, 8))
+
+    df = process_data
+    x = np.arange(len(df))
+    names = df['Process Name'].astype(str).to_numpy()
+    step = _label_step(len(df))
+    edge = 1.5 if len(df) <= MAX_LABELS else 0
+
+    # Wait Time Chart
+    ax1 = fig.add_subplot(221, facecolor='#334155')
+    _bars(ax1, x, df['Wait Time'], color='#fbbf24',
+          edgecolor='white', linewidth=edge)
+    ax1.set_xticks(x[::step])
+    ax1.set_xticklabels(names[::step])
+    ax1.set_title('Wait Time per Process', fontsize=12, color='#60a5fa',
+                 fontweight='bold')
+    ax1.set_xlabel('Process', fontsize=10, color='white')
+    ax1.set_ylabel('Wait Time', fontsize=10, color='white')
+    ax1.tick_params(colors='white', labelsize=8)
+    ax1.grid(True, alpha=0.3, color='white', linestyle='--')
+
+    # Turnaround Time Chart
+    ax2 = fig.add_subplot(222, facecolor='#334155')
+    _bars(ax2, x, df['Turnaround Time'], color='#34d399',
+          edgecolor='white', linewidth=edge)
+    ax2.set_xticks(x[::step])
+    ax2.set_xticklabels(names[::step])
+    ax2.set_title('Turnaround Time per Process', fontsize=12, color='#60a5fa',
+                 fontweight='bold')
+    ax2.set_xlabel('Process', fontsize=10, color='white')
+    ax2.set_ylabel('Turnaround Time', fontsize=10, color='white')
+    ax2.tick_params(colors='white', labelsize=8)
+    ax2.grid(True, alpha=0.3, color='white', linestyle='--')
+
+    # Response Time Chart
+    ax3 = fig.add_subplot(223, facecolor='#334155')
+    _bars(ax3, x, df['Response Time'], color='#8b5cf6',
+          edgecolor='white', linewidth=edge)
+    ax3.set_xticks(x[::step])
+    ax3.set_xticklabels(names[::step])
+    ax3.set_title('Response Time per Process', fontsize=12, color='#60a5fa',
+                 fontweight='bold')
+    ax3.set_xlabel('Process', fontsize=10, color='white')
+    ax3.set_ylabel('Response Time', fontsize=10, color='white')
+    ax3.tick_params(colors='white', labelsize=8)
+    ax3.grid(True, alpha=0.3, color='white', linestyle='--')
+
+    # Comparison Chart
+    ax4 = fig.add_subplot(224, facecolor='#334155')
+    width = 0.25
+
+    _bars(ax4, x - width, df['Wait Time'], width, label='Wait Time', color='#fbbf24')
+    _bars(ax4, x, df['Turnaround Time'], width, label='Turnaround Time', color='#34d399')
+    _bars(ax4, x + width, df['Response Time'], width, label='Response Time', color='#8b5cf6')
+
+    ax4.set_title('Performance Comparison', fontsize=12, color='#60a5fa',
+                 fontweight='bold')
+    ax4.set_xlabel('Process', fontsize=10, color='white')
+    ax4.set_ylabel('Time Units', fontsize=10, color='white')
+    ax4.set_xticks(x[::step])
+    ax4.set_xticklabels(names[::step], rotation=45, ha='right')
+    ax4.legend(facecolor='#1e293b', edgecolor='white', labelcolor='white')
+    ax4.tick_params(colors='white', labelsize=8)
+    ax4.grid(True, alpha=0.3, color='white', linestyle='--')
+
+    fig.tight_layout()
+    return fig
+
+
+def build_timeline_overlay_figure(timelines):
+    """Build stacked Gantt timelines, one row per run
+
+    ``timelines`` is a list of ``(label, start, length, pid)`` tuples whose
+    arrays are execution segments as returned by ``workspace.Run.timeline``.
+    A process has the same colour in every row.
+    """
+    fig = Figure(figsize=(12, 6), facecolor='#1e293b')
+    ax = fig.add_subplot(111, facecolor='#334155')
+
+    palette = plt.cm.tab20(np.arange(20))
+    for row, (label, start, length, pid) in enumerate(timelines):
+        ax.broken_barh(np.column_stack([start, length]), (row - 0.4, 0.8),
+                       facecolors=palette[np.asarray(pid) % 20],
+                       edgecolor='white', linewidth=0.3)
+
+    ax.set_yticks(np.arange(len(timelines)))
+    ax.set_yticklabels([label for label, *_ in timelines])
+    ax.invert_yaxis()
+
+    ax.set_xlabel('Time Units', fontsize=12, color='white', fontweight='bold')
+    ax.set_title('Execution Timelines', fontsize=14, color='#60a5fa',
+                fontweight='bold', pad=20)
+
+    ax.tick_params(colors='white', labelsize=10)
+    ax.grid(True, axis='x', alpha=0.3, color='white', linestyle='--')
+    ax.spines['bottom'].set_color('white')
+    ax.spines['left'].set_color('white')
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+
+    fig.tight_layout()
+    return fig
+
+
+LIVE_PANELS = (('avg_wait', 'Avg Wait Time'), ('cpu_util', 'CPU Utilization (%)'),
+               ('switch_rate', 'Switches per Time Unit'))
+
+
+def build_live_figure(windows):
+    """Build the live dashboard figure: one panel per rolling metric, one line per window
+
+    Lines start empty; ``update_live_figure`` fills them from snapshot history.
+    """
+    fig = Figure(figsize=(12, 6), facecolor='#1e293b')
+    palette = ('#fbbf24', '#34d399', '#8b5cf6', '#60a5fa', '#f87171')
+    for k, (key, title) in enumerate(LIVE_PANELS):
+        ax = fig.add_subplot(len(LIVE_PANELS), 1, k + 1, facecolor='#334155')
+        for n, width in enumerate(windows):
+            ax.plot([], [], color=palette[n % len(palette)], linewidth=1.5, label=f"last {width:,}")
+        ax.set_ylabel(title, fontsize=9, color='white')
+        ax.tick_params(colors='white', labelsize=8)
+        ax.grid(True, alpha=0.3, color='white', linestyle='--')
+        if k == 0:
+            ax.legend(facecolor='#1e293b', edgecolor='white', labelcolor='white',
+                      fontsize=8, loc='upper left')
+    fig.axes[-1].set_xlabel('Simulated Time', fontsize=10, color='white')
+    fig.tight_layout()
+    return fig
+
+
+def update_live_figure(fig, history):
+    """Redraw the live dashboard lines from a sequence of metric snapshots"""
+    if not history:
+        return
+    times = [snapshot['time'] for snapshot in history]
+    windows = list(history[-1]['windows'])
+    for ax, (key, _) in zip(fig.axes, LIVE_PANELS):
+        for line, width in zip(ax.lines, windows):
+            line.set_data(times, [snapshot['windows'][width][key] for snapshot in history])
+        ax.relim()
+        ax.autoscale_view()
+
+
+def build_time_series_figure(series):
+    """Build stacked load panels from a ``timeseries.LoadSeries.series`` frame
+
+    Ready queue depth (mean and peak), CPU busy share, switches and the
+    average wait of the processes arriving in each bucket share one time axis.
+    """
+    fig = Figure(figsize=(12, 7), facecolor='#1e293b')
+    x = series['Bucket Start'].to_numpy()
+    width = series.attrs.get('width', 1)
+
+    panels = ['Ready Queue', 'CPU Busy (%)', 'Switches / Bucket']
+    if 'Avg Wait (arrivals)' in series:
+        panels.append('Avg Wait (by arrival)')
+    axes = []
+    for k, title in enumerate(panels):
+        ax = fig.add_subplot(len(panels), 1, k + 1, facecolor='#334155',
+                             sharex=axes[0] if axes else None)
+        ax.set_ylabel(title, fontsize=9, color='white')
+        ax.tick_params(colors='white', labelsize=8)
+        ax.grid(True, alpha=0.3, color='white', linestyle='--')
+        axes.append(ax)
+
+    axes[0].fill_between(x, series['Ready (peak)'], step='post', color='#60a5fa', alpha=0.3,
+                         label='Peak')
+    axes[0].step(x, series['Ready (mean)'], where='post', color='#60a5fa', linewidth=1.5,
+                 label='Mean')
+    axes[0].legend(facecolor='#1e293b', edgecolor='white', labelcolor='white',
+                   fontsize=8, loc='upper left')
+    axes[1].fill_between(x, series['CPU Busy (%)'], step='post', color='#34d399', alpha=0.7)
+    axes[1].set_ylim(0, 105)
+    axes[2].fill_between(x, series['Switches'], step='post', color='#fbbf24', alpha=0.7)
+    if len(axes) > 3:
+        axes[3].step(x, series['Avg Wait (arrivals)'], where='post', color='#8b5cf6', linewidth=1.5)
+
+    axes[0].set_title(f'Scheduler Load Over Time ({width:,} time units per bucket)',
+                      fontsize=12, color='#60a5fa', fontweight='bold')
+    axes[-1].set_xlabel('Time Units', fontsize=10, color='white')
+    if len(x):
+        axes[-1].set_xlim(x[0], x[-1] + width)
+    fig.tight_layout()
+    return fig
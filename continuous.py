@@ -0,0 +1,498 @@
+"""Continuous (open-ended) scheduling simulation with sliding-window metrics.
+
+``simulate_scheduling`` runs a fixed workload until every process completes.
+``ContinuousSimulation`` instead pulls processes from an arrival stream that
+may never end (see ``arrival_stream``), holds only the processes that have
+arrived and not finished yet, and retires each one when it completes.
+
+Rolling metrics are kept in fixed-size ring buffers, so memory stays flat no
+matter how long the simulation runs:
+
+* the last ``capacity`` completions (finish time, wait, response and
+  turnaround), for the per-process averages, and
+* per-time-bucket switch, busy-time and completion counters covering the
+  longest window, for switch rate, CPU utilization and throughput.
+
+The engines follow the same rules as the batch engines in ``scheduler``; fed
+a finite workload through ``workload_stream`` they produce the same waits,
+responses and context switch count as ``simulate_scheduling``, arrival order
+or not: the stream carries each process's table index, which the engines
+use as its number, so ties are broken the same way.
+
+``ContinuousRunner`` advances a simulation on a worker thread and posts
+metric snapshots to a queue for the GUI's live dashboard.
+
+Examples:
+    python continuous.py --algorithm RR --quantum 4 --until 1000000000
+    python continuous.py --algorithm PRIORITY --windows 10000,1000000 --max-ready 100000
+"""
+import argparse
+from collections import deque
+import heapq
+import queue
+import sys
+import threading
+import time
+
+import numpy as np
+
+from scheduler import IDLE_PID
+from workload import generate_workload
+
+ALGORITHMS = ("RR", "FCFS", "PRIORITY")
+DEFAULT_WINDOWS = (1000, 10000, 100000)
+# Upper bound on the per-bucket rings, whatever the window spans
+MAX_BUCKETS = 1 << 18
+WINDOW_METRICS = ('avg_wait', 'avg_response', 'avg_turnaround', 'switch_rate',
+                  'cpu_util', 'throughput', 'completions')
+METRIC_LABELS = {
+    'avg_wait': 'Avg Wait Time',
+    'avg_response': 'Avg Response',
+    'avg_turnaround': 'Avg Turnaround',
+    'switch_rate': 'Switches / Unit',
+    'cpu_util': 'CPU Utilization (%)',
+    'throughput': 'Throughput',
+    'completions': 'Completions'
+}
+
+# Fields of an in-flight process record
+_ARRIVAL, _REMAINING, _PRIORITY, _RESPONSE, _ADMITTED, _LATE, _BURST = range(7)
+
+
+def arrival_stream(seed=None, chunk_size=4096, **options):
+    """Endless workload chunks from ``generate_workload``, each continuing the last
+
+    ``options`` are ``generate_workload`` keyword arguments (arrival and
+    burst models, means, priority mix).
+    """
+    seeds = np.random.SeedSequence(seed)
+    gap = max(1, int(round(options.get('mean_interarrival', 8.0))))
+    offset = 0
+    while True:
+        chunk = generate_workload(chunk_size, seed=seeds.spawn(1)[0], **options)
+        chunk['arrival'] += offset
+        offset = int(chunk['arrival'][-1]) + gap
+        yield chunk
+
+
+def workload_stream(workload, chunk_size=4096):
+    """A finite columnar workload as a stream of chunks in arrival order
+
+    Each chunk's ``index`` column holds the processes' rows in ``workload``.
+    """
+    order = np.argsort(workload['arrival'], kind='stable')
+    for first in range(0, len(order), chunk_size):
+        picked = order[first:first + chunk_size]
+        chunk = {key: np.asarray(workload[key])[picked] for key in ('arrival', 'burst', 'priority')}
+        chunk['index'] = picked
+        yield chunk
+
+
+class ContinuousSimulation:
+    """An RR, FCFS or PRIORITY scheduler fed by an arrival stream
+
+    ``source`` yields columnar chunks (``arrival``, ``burst``, ``priority``)
+    whose arrivals never decrease. Processes are numbered by the chunks'
+    optional ``index`` column (unique across the stream), otherwise in
+    stream order; PRIORITY breaks ties by that number. With ``max_ready`` set, arrivals
+    that find the ready queue full are dropped (and counted), which keeps
+    memory bounded even when the offered load exceeds the CPU.
+    """
+
+    def __init__(self, source, algorithm, quantum, windows=DEFAULT_WINDOWS,
+                 capacity=65536, max_ready=None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown scheduling algorithm: {algorithm}")
+        if algorithm == "RR" and quantum < 1:
+            raise ValueError("Time quantum must be at least 1")
+        windows = tuple(sorted({int(w) for w in windows}))
+        if not windows or windows[0] < 1:
+            raise ValueError("windows must be positive time spans")
+
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.windows = windows
+        self.capacity = capacity
+        self.max_ready = max_ready
+
+        # Buckets are 1/100 of the shortest window, enough to cover the longest;
+        # when that would take more than MAX_BUCKETS they are coarsened, and
+        # rates over the short windows then span whole buckets
+        self.resolution = max(1, windows[0] // 100, -(-windows[-1] // (MAX_BUCKETS - 1)))
+        self.num_buckets = -(-windows[-1] // self.resolution) + 1
+        self._epoch = [-1] * self.num_buckets
+        self._switches = [0] * self.num_buckets
+        self._busy = [0] * self.num_buckets
+        self._done = [0] * self.num_buckets
+
+        self._done_time = [-1] * capacity
+        self._wait = [0] * capacity
+        self._response = [0] * capacity
+        self._turnaround = [0] * capacity
+
+        self.time = 0
+        self.current = IDLE_PID
+        self.busy = False
+        self.processes = {}
+        self.ready = [] if algorithm == "PRIORITY" else deque()
+        self.counters = {'arrived': 0, 'completed': 0, 'dropped': 0, 'dispatches': 0,
+                         'context_switches': 0, 'idle_time': 0}
+
+        self._source = iter(source)
+        self._last_arrival = 0
+        self._chunk = ([], [], [], [])
+        self._position = 0
+        self._pulled = 0
+        self._next_chunk()
+
+    def _next_chunk(self):
+        """Load the next non-empty chunk; an exhausted stream leaves empty lists"""
+        self._position = 0
+        for chunk in self._source:
+            arrival = np.asarray(chunk['arrival'], dtype=np.int64)
+            if not len(arrival):
+                continue
+            if arrival[0] < self._last_arrival or (np.diff(arrival) < 0).any():
+                raise ValueError("Arrival stream must be in arrival order")
+            self._last_arrival = int(arrival[-1])
+            if 'index' in chunk:
+                numbers = np.asarray(chunk['index'], dtype=np.int64).tolist()
+            else:
+                numbers = list(range(self._pulled, self._pulled + len(arrival)))
+            self._pulled += len(arrival)
+            self._chunk = (arrival.tolist(), np.asarray(chunk['burst'], dtype=np.int64).tolist(),
+                           np.asarray(chunk['priority']).tolist(), numbers)
+            return self._chunk
+        self._chunk = ([], [], [], [])
+        return self._chunk
+
+    @property
+    def finished(self):
+        """True once the stream has ended and every process has completed"""
+        return not self.processes and self._position >= len(self._chunk[0])
+
+    def _add_busy(self, start, end):
+        """Spread a slice of CPU time over the buckets it crosses"""
+        res, nb = self.resolution, self.num_buckets
+        first = start // res
+        last = (end - 1) // res
+        # Buckets older than the ring are overwritten anyway
+        first = max(first, last - nb + 1)
+        for b in range(first, last + 1):
+            k = b % nb
+            if self._epoch[k] != b:
+                self._epoch[k] = b
+                self._switches[k] = self._busy[k] = self._done[k] = 0
+            self._busy[k] += min(end, (b + 1) * res) - max(start, b * res)
+
+    def run(self, until=None, max_dispatches=None):
+        """Advance the clock to ``until`` or by ``max_dispatches`` dispatches
+
+        Stops early when the stream is exhausted and every process has
+        finished. Returns False once there is nothing left to simulate.
+        """
+        rr = self.algorithm == "RR"
+        fcfs = self.algorithm == "FCFS"
+        quantum = self.quantum
+        max_ready = self.max_ready
+        ready = self.ready
+        procs = self.processes
+        counters = self.counters
+        res, nb = self.resolution, self.num_buckets
+        epoch, switches, busy_ring, done_ring = self._epoch, self._switches, self._busy, self._done
+        capacity = self.capacity
+        done_time, wait_ring, response_ring, turnaround_ring = (
+            self._done_time, self._wait, self._response, self._turnaround)
+
+        t = self.time
+        current = self.current
+        busy = self.busy
+        arrivals, bursts, priorities, numbers = self._chunk
+        k = self._position
+        next_arrival = arrivals[k] if k < len(arrivals) else None
+        completed = counters['completed']
+        dispatches = counters['dispatches']
+        switch_count = counters['context_switches']
+        idle = counters['idle_time']
+        stop = float('inf') if max_dispatches is None else dispatches + max_dispatches
+        arrived = counters['arrived']
+        dropped = counters['dropped']
+
+        while True:
+            if (until is not None and t >= until) or dispatches >= stop:
+                break
+
+            # Admit everything that has arrived by now, in stream order
+            queued = len(ready)
+            while next_arrival is not None and next_arrival <= t:
+                if max_ready is not None and len(ready) >= max_ready:
+                    dropped += 1
+                else:
+                    burst = bursts[k]
+                    number = numbers[k]
+                    procs[number] = [next_arrival, burst, priorities[k], -1, t, 1 if busy else 0, burst]
+                    if rr or fcfs:
+                        ready.append(number)
+                    else:
+                        heapq.heappush(ready, (priorities[k], number))
+                    arrived += 1
+                k += 1
+                if k == len(arrivals):
+                    arrivals, bursts, priorities, numbers = self._next_chunk()
+                    k = 0
+                next_arrival = arrivals[k] if k < len(arrivals) else None
+            if rr and len(ready) - queued > 1:
+                # Like the batch engine, RR queues a batch of arrivals by number
+                batch = [ready.pop() for _ in range(len(ready) - queued)]
+                batch.sort()
+                ready.extend(batch)
+
+            if not ready:
+                if next_arrival is None:
+                    break
+                gap_end = next_arrival if until is None else min(next_arrival, until)
+                idle += gap_end - t
+                t = gap_end
+                busy = False
+                continue
+
+            if rr:
+                i = ready.popleft()
+            elif fcfs:
+                i = ready[0]
+            else:
+                i = ready[0][1]
+            dispatches += 1
+            p = procs[i]
+
+            if i != current:
+                switch_count += 1
+                b = t // res
+                slot = b % nb
+                if epoch[slot] != b:
+                    epoch[slot] = b
+                    switches[slot] = busy_ring[slot] = done_ring[slot] = 0
+                switches[slot] += 1
+                current = i
+
+            if p[_RESPONSE] == -1:
+                p[_RESPONSE] = t - p[_ARRIVAL]
+
+            remaining = p[_REMAINING]
+            if rr:
+                exec_time = quantum if quantum < remaining else remaining
+            elif fcfs or next_arrival is None:
+                exec_time = remaining
+            else:
+                exec_time = min(remaining, next_arrival - t)
+            p[_REMAINING] = remaining - exec_time
+            start = t
+            t += exec_time
+
+            if exec_time:
+                busy = True
+                b = start // res
+                if t <= (b + 1) * res:
+                    slot = b % nb
+                    if epoch[slot] != b:
+                        epoch[slot] = b
+                        switches[slot] = busy_ring[slot] = done_ring[slot] = 0
+                    busy_ring[slot] += exec_time
+                else:
+                    self._add_busy(start, t)
+
+            if p[_REMAINING] == 0:
+                if fcfs:
+                    ready.popleft()
+                elif not rr:
+                    heapq.heappop(ready)
+                del procs[i]
+                if rr:
+                    # Same rule as the batch engine: every slice not run
+                    # between admission and completion is waiting
+                    wait = t - p[_ADMITTED] - p[_BURST]
+                else:
+                    wait = t - p[_ARRIVAL] - p[_BURST] + (p[_LATE] if not fcfs else 0)
+                slot = completed % capacity
+                done_time[slot] = t
+                wait_ring[slot] = wait
+                response_ring[slot] = p[_RESPONSE]
+                turnaround_ring[slot] = t - p[_ARRIVAL]
+                completed += 1
+
+                b = (t - 1) // res if t else 0
+                slot = b % nb
+                if epoch[slot] != b:
+                    epoch[slot] = b
+                    switches[slot] = busy_ring[slot] = done_ring[slot] = 0
+                done_ring[slot] += 1
+            elif rr:
+                ready.append(i)
+
+        self.time = t
+        self.current = current
+        self.busy = busy
+        self._position = k
+        counters.update(arrived=arrived, dropped=dropped, completed=completed,
+                        dispatches=dispatches, context_switches=switch_count, idle_time=idle)
+        return not self.finished
+
+    def metrics(self):
+        """Whole-run counters plus per-window averages and rates at the current time"""
+        now = self.time
+        res = self.resolution
+        current_bucket = (now - 1) // res if now else 0
+        epoch = np.asarray(self._epoch)
+        switches = np.asarray(self._switches)
+        busy = np.asarray(self._busy)
+        done = np.asarray(self._done)
+
+        filled = min(self.counters['completed'], self.capacity)
+        done_time = np.asarray(self._done_time[:filled])
+        samples = {
+            'avg_wait': np.asarray(self._wait[:filled]),
+            'avg_response': np.asarray(self._response[:filled]),
+            'avg_turnaround': np.asarray(self._turnaround[:filled])
+        }
+
+        windows = {}
+        for width in self.windows:
+            buckets = -(-width // res)
+            in_window = (epoch > current_bucket - buckets) & (epoch <= current_bucket)
+            span = now - max(0, (current_bucket - buckets + 1) * res)
+            span = max(span, 1)
+            recent = done_time > now - width
+            stats = {key: float(values[recent].mean()) if recent.any() else 0.0
+                     for key, values in samples.items()}
+            completions = int(done[in_window].sum())
+            stats.update(
+                switch_rate=float(switches[in_window].sum()) / span,
+                cpu_util=float(busy[in_window].sum()) / span * 100,
+                throughput=completions / span,
+                completions=completions
+            )
+            windows[width] = stats
+
+        return {
+            'time': int(now),
+            'active': len(self.processes),
+            'ready': len(self.ready),
+            **{key: int(value) for key, value in self.counters.items()},
+            'windows': windows
+        }
+
+
+class ContinuousRunner:
+    """Advances a ContinuousSimulation on a daemon thread; read snapshots from ``messages``
+
+    Messages on ``messages``:
+        ('metrics', snapshot)   - ``ContinuousSimulation.metrics()`` every ``interval`` seconds
+        ('done', snapshot)      - the stream ended and every process finished
+        ('error', message)      - the simulation failed
+    """
+
+    def __init__(self, simulation, interval=0.25, step=20000, until=None):
+        self.simulation = simulation
+        self.interval = interval
+        self.step = step
+        self.until = until
+        self.messages = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='continuous-simulation', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def drain(self, limit=50):
+        """Up to ``limit`` pending messages, without blocking"""
+        found = []
+        try:
+            while len(found) < limit:
+                found.append(self.messages.get_nowait())
+        except queue.Empty:
+            pass
+        return found
+
+    def _run(self):
+        sim = self.simulation
+        last = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                alive = sim.run(until=self.until, max_dispatches=self.step)
+                if not alive or (self.until is not None and sim.time >= self.until):
+                    self.messages.put(('done', sim.metrics()))
+                    return
+                if time.monotonic() - last >= self.interval:
+                    last = time.monotonic()
+                    self.messages.put(('metrics', sim.metrics()))
+                # Let the GUI thread in between steps
+                time.sleep(0)
+        except Exception as e:
+            self.messages.put(('error', str(e)))
+
+
+def format_metrics(snapshot):
+    """A plain-text table of a metrics snapshot"""
+    lines = [f"t={snapshot['time']:,}  active={snapshot['active']:,}  "
+             f"completed={snapshot['completed']:,}  dropped={snapshot['dropped']:,}  "
+             f"switches={snapshot['context_switches']:,}"]
+    widths = list(snapshot['windows'])
+    lines.append(f"{'':22}" + ''.join(f"{'last ' + format(w, ','):>18}" for w in widths))
+    for key in WINDOW_METRICS:
+        values = ''.join(f"{snapshot['windows'][w][key]:>18,}" if key == 'completions'
+                         else f"{snapshot['windows'][w][key]:>18,.3f}" for w in widths)
+        lines.append(f"{METRIC_LABELS[key]:22}{values}")
+    return '\n'.join(lines)
+
+
+def _csv_ints(value):
+    return [int(float(item)) for item in value.split(',') if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--algorithm', choices=ALGORITHMS, default='RR')
+    parser.add_argument('--quantum', type=int, default=2)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--mean-interarrival', type=float, default=8.0)
+    parser.add_argument('--mean-burst', type=float, default=7.0)
+    parser.add_argument('--windows', type=_csv_ints, default=list(DEFAULT_WINDOWS),
+                        help='comma separated window lengths in time units')
+    parser.add_argument('--capacity', type=int, default=65536,
+                        help='completions kept for the per-process averages')
+    parser.add_argument('--max-ready', type=int, default=None,
+                        help='drop arrivals that find this many processes ready')
+    parser.add_argument('--until', type=lambda v: int(float(v)), default=None,
+                        help='simulated time to stop at (default: run until interrupted)')
+    parser.add_argument('--report-every', type=float, default=2.0,
+                        help='seconds between printed snapshots')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    stream = arrival_stream(args.seed, mean_interarrival=args.mean_interarrival,
+                            mean_burst=args.mean_burst)
+    sim = ContinuousSimulation(stream, args.algorithm, args.quantum, args.windows,
+                               args.capacity, args.max_ready)
+    last = time.monotonic()
+    try:
+        while sim.run(until=args.until, max_dispatches=100000):
+            if args.until is not None and sim.time >= args.until:
+                break
+            if time.monotonic() - last >= args.report_every:
+                last = time.monotonic()
+                print(format_metrics(sim.metrics()), end='\n\n', flush=True)
+    except KeyboardInterrupt:
+        pass
+    print(format_metrics(sim.metrics()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import pandas as pd
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
 import numpy as np
+from collections import deque
 import os
 import subprocess
 import tempfile
 import time
 
+import scheduler
+from charts import (build_gantt_figure, build_live_figure, build_performance_figure,
+                    build_time_series_figure, build_timeline_overlay_figure, update_live_figure)
+from continuous import (DEFAULT_WINDOWS, METRIC_LABELS, WINDOW_METRICS, ContinuousRunner,
+                        ContinuousSimulation, arrival_stream)
+from metrics import DEFAULT_PORT, MetricsExporter, run_metrics
+from profiling import Profiler
+from switchlog import REASONS, ROLES, SwitchLog
+from sysprocs import ProcessScanner
+from timeseries import DEFAULT_BUCKETS, LoadSeries
+from replicas import run_replicas
+from workload import ARRIVAL_MODELS, BURST_MODELS, generate_workload
+from workspace import COMPARE_METRICS, DEFAULT_ROOT, Workspace
+
 class ContextSwitchVisualizer:
     def __init__(self, root):
         self.root = root
@@ -19,7 +32,17 @@ class ContextSwitchVisualizer:
         
         self.process_data = None
         self.switch_data = None
-        
+        self.switch_log = None
+        self.load_series = None
+        self.profiler = Profiler()
+        self.last_result = None
+        self.last_run_label = None
+        self.simulation = None
+        self._workspace = None
+        self.live_runner = None
+        self.live_history = deque(maxlen=600)
+        self.metrics = MetricsExporter('run_metrics.jsonl', 'run_metrics.prom')
+
         self.setup_styles()
         self.create_widgets()
         
@@ -83,7 +106,9 @@ class ContextSwitchVisualizer:
             ("Avg Wait Time:", "avg_wait"),
             ("Avg Turnaround:", "avg_turnaround"),
             ("CPU Utilization:", "cpu_util"),
-            ("Throughput:", "throughput")
+            ("Throughput:", "throughput"),
+            ("Avg Response:", "avg_response"),
+            ("Replicas:", "replicas")
         ]
         
         for i, (label_text, key) in enumerate(stats_info):
@@ -118,7 +143,32 @@ class ContextSwitchVisualizer:
         # Tab 3: Performance Graphs
         self.graph_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.graph_frame, text="📈 Performance Graphs")
-        
+
+        # Tab 4: Time Series
+        self.series_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.series_frame, text="⏱️ Time Series")
+        self.create_time_series_panel()
+
+        # Tab 5: Switch Log
+        self.switch_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.switch_frame, text="🔀 Switch Log")
+        self.create_switch_log_panel()
+
+        # Tab 6: Diagnostics
+        self.diag_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.diag_frame, text="🩺 Diagnostics")
+        self.create_diagnostics_panel()
+
+        # Tab 7: Compare Runs
+        self.compare_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.compare_frame, text="🗂️ Compare Runs")
+        self.create_compare_panel()
+
+        # Tab 8: Live (continuous simulation)
+        self.live_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.live_frame, text="📡 Live")
+        self.create_live_panel()
+
         # Status bar
         self.status_bar = tk.Label(self.root, text="Ready - Click 'Run New Simulation' to start", 
                                    bd=1, relief=tk.SUNKEN,
@@ -151,12 +201,673 @@ class ContextSwitchVisualizer:
         hsb.pack(side=tk.BOTTOM, fill=tk.X)
         
         self.tree.tag_configure('completed', background='#86efac')
-        
+        self.tree.bind('<Double-1>', self.edit_process)
+
+    def edit_process(self, event=None):
+        """Edit one process of the current run and re-simulate from a checkpoint"""
+        selected = self.tree.selection()
+        if not selected:
+            return
+        if self.simulation is None:
+            messagebox.showwarning("No Simulation", "Only processes of a simulation run in this session can be edited")
+            return
+
+        index = int(self.tree.item(selected[0], 'values')[0]) - scheduler.PID_BASE
+        workload = self.simulation.workload
+
+        dialog = tk.Toplevel(self.root)
+        dialog.title("Edit Process")
+        dialog.configure(bg='#1e293b')
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        form = tk.Frame(dialog, bg='#334155', padx=20, pady=20)
+        form.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+
+        fields = {}
+        for row, (label, key) in enumerate([("Arrival", 'arrival'), ("Burst", 'burst'), ("Priority", 'priority')]):
+            tk.Label(form, text=f"{label}:", font=('Arial', 10, 'bold'),
+                    bg='#334155', fg='white').grid(row=row, column=0, sticky='w', pady=5)
+            entry = tk.Entry(form, font=('Arial', 10), width=12)
+            entry.insert(0, str(workload[key][index]))
+            entry.grid(row=row, column=1, padx=10, pady=5)
+            fields[key] = entry
+
+        def apply():
+            try:
+                values = {key: int(entry.get()) for key, entry in fields.items()}
+            except ValueError:
+                messagebox.showerror("Error", "Please enter valid integers!", parent=dialog)
+                return
+            # Same lower bounds as the service; the upper bound keeps narrow
+            # columns (priority is int8) from silently wrapping
+            minimums = {'arrival': 0, 'burst': 1, 'priority': 0}
+            for key, value in values.items():
+                lowest, highest = minimums[key], np.iinfo(workload[key].dtype).max
+                if not lowest <= value <= highest:
+                    messagebox.showerror("Error", f"{key.capitalize()} must be from {lowest} "
+                                                  f"to {highest}!", parent=dialog)
+                    return
+            dialog.destroy()
+
+            edited = {key: column.copy() for key, column in workload.items()}
+            for key, value in values.items():
+                edited[key][index] = value
+
+            profiler = self.new_profiler()
+            try:
+                with profiler.capture(), profiler.span('resimulate'):
+                    with profiler.span('simulate'):
+                        result = self.simulation.update(edited)
+                    profiler.add_counters(result['counters'])
+                    with profiler.span('csv_export'):
+                        self.save_simulation_results(result)
+                    self.last_result = result
+                    self.load_data_from_memory(result)
+            except Exception as e:
+                messagebox.showerror("Error", f"Re-simulation failed:\n{str(e)}")
+                return
+            self.update_diagnostics()
+            self.record_run_metrics(result, self.simulation.quantum)
+
+            resumed_at = self.simulation.resumed_at
+            elapsed = profiler.summary()['simulate']['total'] * 1000
+            origin = f"checkpoint at t={resumed_at}" if resumed_at is not None else "time 0"
+            self.status_bar.config(text=f"✓ Re-simulated from {origin} in {elapsed:.1f} ms")
+
+        btn_frame = tk.Frame(dialog, bg='#1e293b')
+        btn_frame.pack(pady=(0, 20))
+        tk.Button(btn_frame, text="▶ Re-run", command=apply,
+                 bg='#10b981', fg='white', font=('Arial', 11, 'bold'),
+                 padx=20, pady=8).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame, text="Cancel", command=dialog.destroy,
+                 bg='#6b7280', fg='white', font=('Arial', 11, 'bold'),
+                 padx=20, pady=8).pack(side=tk.LEFT, padx=5)
+
+    def create_time_series_panel(self):
+        toolbar = tk.Frame(self.series_frame, bg='#1e293b')
+        toolbar.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        self.series_start_var = tk.StringVar()
+        self.series_end_var = tk.StringVar()
+        self.series_buckets_var = tk.StringVar(value=str(DEFAULT_BUCKETS))
+
+        tk.Label(toolbar, text="Time:", bg='#1e293b', fg='white').pack(side=tk.LEFT)
+        tk.Entry(toolbar, textvariable=self.series_start_var, width=10).pack(side=tk.LEFT, padx=5)
+        tk.Label(toolbar, text="to", bg='#1e293b', fg='white').pack(side=tk.LEFT)
+        tk.Entry(toolbar, textvariable=self.series_end_var, width=10).pack(side=tk.LEFT, padx=5)
+        tk.Label(toolbar, text="Buckets:", bg='#1e293b', fg='white').pack(side=tk.LEFT, padx=(10, 0))
+        tk.Spinbox(toolbar, from_=10, to=5000, textvariable=self.series_buckets_var,
+                  width=6).pack(side=tk.LEFT, padx=5)
+
+        tk.Button(toolbar, text="🔍 Zoom", command=self.update_time_series,
+                 bg='#3b82f6', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+        tk.Button(toolbar, text="Reset", command=self.reset_time_series,
+                 bg='#6b7280', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT)
+        tk.Button(toolbar, text="💾 Export CSV", command=self.export_time_series,
+                 bg='#3b82f6', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=5)
+
+        self.series_chart_frame = ttk.Frame(self.series_frame)
+        self.series_chart_frame.pack(fill=tk.BOTH, expand=True)
+
+    def _time_series(self):
+        """The load series for the time window and bucket count in the toolbar"""
+        start = self.series_start_var.get().strip()
+        end = self.series_end_var.get().strip()
+        return self.load_series.series(int(start) if start else None,
+                                       int(end) if end else None,
+                                       int(self.series_buckets_var.get()))
+
+    def reset_time_series(self):
+        self.series_start_var.set("")
+        self.series_end_var.set("")
+        self.series_buckets_var.set(str(DEFAULT_BUCKETS))
+        self.update_time_series()
+
+    def update_time_series(self):
+        """Re-bucket the load series for the toolbar's window and redraw it"""
+        for widget in self.series_chart_frame.winfo_children():
+            widget.destroy()
+        if self.load_series is None:
+            return
+
+        try:
+            series = self._time_series()
+        except ValueError as e:
+            messagebox.showwarning("Invalid Window", f"Could not bucket the time series:\n{e}")
+            return
+
+        fig = build_time_series_figure(series)
+        canvas = FigureCanvasTkAgg(fig, self.series_chart_frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def export_time_series(self):
+        if self.load_series is None:
+            messagebox.showwarning("No Data", "Run a simulation or load data first!")
+            return
+
+        filename = filedialog.asksaveasfilename(
+            title="Export Time Series",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if not filename:
+            return
+
+        try:
+            self._time_series().to_csv(filename, index=False)
+            self.status_bar.config(text=f"✓ Time series exported to {filename}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export time series:\n{str(e)}")
+
+    def create_switch_log_panel(self):
+        filters = tk.Frame(self.switch_frame, bg='#1e293b')
+        filters.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        self.switch_start_var = tk.StringVar()
+        self.switch_end_var = tk.StringVar()
+        self.switch_process_var = tk.StringVar()
+        self.switch_role_var = tk.StringVar(value=ROLES[0])
+        self.switch_reason_var = tk.StringVar(value="any")
+
+        tk.Label(filters, text="Time:", bg='#1e293b', fg='white').pack(side=tk.LEFT)
+        tk.Entry(filters, textvariable=self.switch_start_var, width=8).pack(side=tk.LEFT, padx=5)
+        tk.Label(filters, text="to", bg='#1e293b', fg='white').pack(side=tk.LEFT)
+        tk.Entry(filters, textvariable=self.switch_end_var, width=8).pack(side=tk.LEFT, padx=5)
+
+        tk.Label(filters, text="Process:", bg='#1e293b', fg='white').pack(side=tk.LEFT, padx=(10, 0))
+        self.switch_process_box = ttk.Combobox(filters, textvariable=self.switch_process_var, width=14)
+        self.switch_process_box.pack(side=tk.LEFT, padx=5)
+        ttk.Combobox(filters, textvariable=self.switch_role_var, values=ROLES,
+                     state='readonly', width=5).pack(side=tk.LEFT)
+
+        tk.Label(filters, text="Reason:", bg='#1e293b', fg='white').pack(side=tk.LEFT, padx=(10, 0))
+        ttk.Combobox(filters, textvariable=self.switch_reason_var,
+                     values=("any",) + REASONS,
+                     state='readonly', width=11).pack(side=tk.LEFT, padx=5)
+
+        tk.Button(filters, text="🔍 Filter", command=self.update_switch_log,
+                 bg='#3b82f6', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+        tk.Button(filters, text="Reset", command=self.reset_switch_filter,
+                 bg='#6b7280', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT)
+
+        self.switch_summary = ttk.Label(self.switch_frame, text="No switch log loaded")
+        self.switch_summary.pack(anchor='w', padx=10, pady=5)
+
+        columns = ("Time", "From", "To", "Reason")
+        self.switch_tree = ttk.Treeview(self.switch_frame, columns=columns, show='headings')
+        for col in columns:
+            self.switch_tree.heading(col, text=col)
+            self.switch_tree.column(col, width=150, anchor='center')
+        self.switch_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+    def reset_switch_filter(self):
+        for var in (self.switch_start_var, self.switch_end_var, self.switch_process_var):
+            var.set("")
+        self.switch_role_var.set(ROLES[0])
+        self.switch_reason_var.set("any")
+        self.update_switch_log()
+
+    def update_switch_log(self, limit=1000):
+        """Show the switches matching the filter bar, answered from the log's indexes"""
+        self.switch_tree.delete(*self.switch_tree.get_children())
+        log = self.switch_log
+        if log is None:
+            self.switch_summary.config(text="No switch log loaded")
+            return
+
+        try:
+            start = int(self.switch_start_var.get()) if self.switch_start_var.get().strip() else None
+            end = int(self.switch_end_var.get()) if self.switch_end_var.get().strip() else None
+        except ValueError:
+            messagebox.showwarning("Invalid Filter", "Time bounds must be integers")
+            return
+        process = self.switch_process_var.get().strip() or None
+        reason = self.switch_reason_var.get()
+
+        matches = log.query(start, end, process, self.switch_role_var.get(),
+                            None if reason == "any" else reason)
+        for row in log.frame(matches[:limit]).itertuples(index=False):
+            self.switch_tree.insert('', tk.END, values=tuple(row))
+
+        summary = f"{len(matches)} of {len(log)} switches match"
+        if len(matches) > limit:
+            summary += f" (showing first {limit})"
+        if process is not None:
+            preempted_by = log.preempted_by(process, start, end)
+            if len(preempted_by):
+                summary += f" · preempted by: {', '.join(map(str, preempted_by[:10]))}"
+                if len(preempted_by) > 10:
+                    summary += f" and {len(preempted_by) - 10} more"
+        self.switch_summary.config(text=summary)
+
+    def create_diagnostics_panel(self):
+        options = tk.Frame(self.diag_frame, bg='#1e293b')
+        options.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        self.cprofile_var = tk.BooleanVar(value=False)
+        self.tracemalloc_var = tk.BooleanVar(value=False)
+
+        tk.Checkbutton(options, text="Capture cProfile", variable=self.cprofile_var,
+                      bg='#1e293b', fg='white', selectcolor='#334155',
+                      font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+        tk.Checkbutton(options, text="Capture memory (tracemalloc)", variable=self.tracemalloc_var,
+                      bg='#1e293b', fg='white', selectcolor='#334155',
+                      font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+
+        self.metrics_file_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(options, text="Write run metrics (run_metrics.jsonl / .prom)",
+                      variable=self.metrics_file_var,
+                      bg='#1e293b', fg='white', selectcolor='#334155',
+                      font=('Arial', 10)).pack(side=tk.LEFT, padx=5)
+
+        tk.Button(options, text="💾 Export JSON", command=self.export_diagnostics,
+                 bg='#3b82f6', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=5)
+        self.metrics_btn = tk.Button(options, text=f"📡 Serve /metrics on :{DEFAULT_PORT}",
+                                     command=self.toggle_metrics_endpoint,
+                                     bg='#8b5cf6', fg='white', font=('Arial', 10, 'bold'),
+                                     padx=15, pady=5, relief=tk.FLAT, cursor='hand2')
+        self.metrics_btn.pack(side=tk.RIGHT, padx=5)
+
+        columns = ("Calls", "Total (ms)", "Max (ms)")
+        self.diag_tree = ttk.Treeview(self.diag_frame, columns=columns, show='tree headings',
+                                     height=12)
+        self.diag_tree.heading('#0', text="Phase / Counter")
+        self.diag_tree.column('#0', width=300)
+        for col in columns:
+            self.diag_tree.heading(col, text=col)
+            self.diag_tree.column(col, width=120, anchor='center')
+        self.diag_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.diag_text = tk.Text(self.diag_frame, height=12, bg='#0f172a', fg='#e2e8f0',
+                                 font=('Courier', 9), relief=tk.FLAT)
+        self.diag_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+    def new_profiler(self):
+        """Start a fresh profiler using the diagnostics tab's capture toggles"""
+        self.profiler = Profiler(cprofile=self.cprofile_var.get(),
+                                 memory=self.tracemalloc_var.get())
+        return self.profiler
+
+    def update_diagnostics(self):
+        for item in self.diag_tree.get_children():
+            self.diag_tree.delete(item)
+        self.diag_text.delete('1.0', tk.END)
+
+        nodes = {}
+        for name, phase in self.profiler.summary().items():
+            parent = nodes.get(phase['parent'], '')
+            nodes[name] = self.diag_tree.insert(parent, tk.END, text=name, open=True, values=(
+                phase['calls'],
+                f"{phase['total'] * 1000:.2f}",
+                f"{phase['max'] * 1000:.2f}"
+            ))
+
+        if self.profiler.counters:
+            counters = self.diag_tree.insert('', tk.END, text="Counters", open=True)
+            for name, value in self.profiler.counters.items():
+                self.diag_tree.insert(counters, tk.END, text=name, values=(value, '', ''))
+
+        if self.profiler.cprofile_stats:
+            self.diag_text.insert(tk.END, "cProfile (by cumulative time)\n")
+            for entry in self.profiler.cprofile_stats:
+                self.diag_text.insert(tk.END, f"{entry['cumtime'] * 1000:10.2f} ms "
+                                              f"{entry['calls']:>8}  {entry['function']}\n")
+
+        memory = self.profiler.memory_stats
+        if memory:
+            self.diag_text.insert(tk.END, f"\ntracemalloc: peak {memory['peak_bytes'] / 1024:.1f} KiB, "
+                                          f"current {memory['current_bytes'] / 1024:.1f} KiB\n")
+            for entry in memory['top_allocations']:
+                self.diag_text.insert(tk.END, f"{entry['size_bytes'] / 1024:10.1f} KiB "
+                                              f"{entry['count']:>8}  {entry['location']}\n")
+
+    def record_run_metrics(self, result, quantum):
+        """Export the finished run's metrics to the scrape endpoint and, if enabled, to files"""
+        try:
+            record = run_metrics(result, self.profiler, quantum=quantum, series=self.load_series)
+            self.metrics.record(record, write=self.metrics_file_var.get())
+        except Exception as e:
+            self.status_bar.config(text=f"Metrics export failed: {e}")
+
+    def toggle_metrics_endpoint(self):
+        if self.metrics.serving:
+            self.metrics.close()
+            self.metrics_btn.config(text=f"📡 Serve /metrics on :{DEFAULT_PORT}")
+            self.status_bar.config(text="Metrics endpoint stopped")
+            return
+        try:
+            host, port = self.metrics.serve('127.0.0.1', DEFAULT_PORT)
+        except OSError as e:
+            messagebox.showerror("Error", f"Failed to start the metrics endpoint:\n{str(e)}")
+            return
+        self.metrics_btn.config(text="⏹ Stop /metrics")
+        self.status_bar.config(text=f"✓ Serving run metrics on http://{host}:{port}/metrics")
+
+    def export_diagnostics(self):
+        """Export the last run's profiling data as JSON"""
+        if not self.profiler.spans:
+            messagebox.showwarning("No Data", "Run a simulation or load data first!")
+            return
+
+        filename = filedialog.asksaveasfilename(
+            title="Export Diagnostics",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json")]
+        )
+        if not filename:
+            return
+
+        try:
+            self.profiler.export_json(filename)
+            self.status_bar.config(text=f"✓ Diagnostics exported to {filename}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export diagnostics:\n{str(e)}")
+
+    def create_compare_panel(self):
+        toolbar = tk.Frame(self.compare_frame, bg='#1e293b')
+        toolbar.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        tk.Button(toolbar, text="📌 Keep Current Run", command=self.keep_current_run,
+                 bg='#10b981', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+        tk.Button(toolbar, text="🗑️ Remove", command=self.remove_compared_runs,
+                 bg='#ef4444', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+
+        tk.Button(toolbar, text="🔄 Refresh", command=self.refresh_comparison,
+                 bg='#3b82f6', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.RIGHT, padx=5)
+        self.window_end_var = tk.StringVar()
+        tk.Entry(toolbar, textvariable=self.window_end_var, width=10).pack(side=tk.RIGHT, padx=5)
+        tk.Label(toolbar, text="to", bg='#1e293b', fg='white').pack(side=tk.RIGHT)
+        self.window_start_var = tk.StringVar()
+        tk.Entry(toolbar, textvariable=self.window_start_var, width=10).pack(side=tk.RIGHT, padx=5)
+        tk.Label(toolbar, text="Timeline window:", bg='#1e293b', fg='white').pack(side=tk.RIGHT)
+        self.compare_metric_var = tk.StringVar(value=COMPARE_METRICS[0])
+        ttk.Combobox(toolbar, textvariable=self.compare_metric_var, values=COMPARE_METRICS,
+                     state='readonly', width=12).pack(side=tk.RIGHT, padx=(5, 15))
+        tk.Label(toolbar, text="Per-process metric:", bg='#1e293b', fg='white').pack(side=tk.RIGHT)
+
+        body = ttk.Frame(self.compare_frame)
+        body.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        columns = ("Algorithm", "Processes", "Switches")
+        self.runs_tree = ttk.Treeview(body, columns=columns, show='tree headings',
+                                      selectmode='extended', height=10)
+        self.runs_tree.heading('#0', text="Run")
+        self.runs_tree.column('#0', width=180)
+        for col in columns:
+            self.runs_tree.heading(col, text=col)
+            self.runs_tree.column(col, width=80, anchor='center')
+        self.runs_tree.pack(side=tk.LEFT, fill=tk.Y)
+        self.runs_tree.bind('<<TreeviewSelect>>', lambda e: self.refresh_comparison())
+
+        views = ttk.Notebook(body)
+        views.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10, 0))
+
+        stats_view = ttk.Frame(views)
+        views.add(stats_view, text="Stats")
+        self.compare_stats_tree = ttk.Treeview(stats_view, show='headings')
+        self.compare_stats_tree.pack(fill=tk.BOTH, expand=True)
+
+        process_view = ttk.Frame(views)
+        views.add(process_view, text="Per-Process")
+        self.process_diff_label = ttk.Label(process_view, text="Select two runs of the same workload")
+        self.process_diff_label.pack(anchor='w', pady=5)
+        self.process_diff_tree = ttk.Treeview(process_view, show='headings')
+        self.process_diff_tree.pack(fill=tk.BOTH, expand=True)
+
+        self.timeline_frame = ttk.Frame(views)
+        views.add(self.timeline_frame, text="Timelines")
+
+        # Runs kept in earlier sessions; otherwise the workspace is only
+        # opened once a run is kept
+        if os.path.isdir(DEFAULT_ROOT):
+            self.refresh_runs_list()
+
+    @property
+    def workspace(self):
+        if self._workspace is None:
+            self._workspace = Workspace(DEFAULT_ROOT)
+        return self._workspace
+
+    def refresh_runs_list(self):
+        for item in self.runs_tree.get_children():
+            self.runs_tree.delete(item)
+        for name in self.workspace.names():
+            run = self.workspace.get(name)
+            self.runs_tree.insert('', tk.END, iid=name, text=name, values=(
+                run.meta['algorithm'],
+                run.stats['total_processes'],
+                run.stats['context_switches']
+            ))
+
+    def keep_current_run(self):
+        """Store the last simulation in the comparison workspace"""
+        if self.last_result is None:
+            messagebox.showwarning("No Data", "Run a simulation first!")
+            return
+
+        name = simpledialog.askstring("Keep Run", "Name for this run:",
+                                      initialvalue=self.workspace.unique_name(self.last_run_label),
+                                      parent=self.root)
+        if not name:
+            return
+
+        try:
+            # last_result always comes from self.simulation, which knows its quantum
+            self.workspace.add(name, self.last_result, quantum=self.simulation.quantum)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to keep run:\n{str(e)}")
+            return
+
+        self.refresh_runs_list()
+        self.runs_tree.selection_add(name)
+        self.status_bar.config(text=f"✓ Run '{name}' added to the comparison workspace")
+
+    def remove_compared_runs(self):
+        selected = self.runs_tree.selection()
+        if not selected:
+            return
+        if not messagebox.askyesno("Remove Runs", f"Remove {len(selected)} run(s) from the workspace?"):
+            return
+        for name in selected:
+            self.workspace.remove(name)
+        self.refresh_runs_list()
+        self.refresh_comparison()
+
+    def _fill_tree(self, tree, frame):
+        """Replace a Treeview's columns and rows with a DataFrame"""
+        tree.delete(*tree.get_children())
+        columns = [str(col) for col in frame.columns]
+        tree.config(columns=columns)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=110, anchor='center')
+        for row in frame.itertuples(index=False):
+            tree.insert('', tk.END, values=[f"{v:.3f}" if isinstance(v, float) else v for v in row])
+
+    def refresh_comparison(self):
+        """Redraw the stats, per-process and timeline views for the selected runs"""
+        selected = list(self.runs_tree.selection())
+
+        # Stats come from each run's metadata; columns are not touched
+        if len(selected) == 2:
+            stats = self.workspace.stats_diff(*selected)
+        else:
+            stats = self.workspace.stats_table(selected)
+        self._fill_tree(self.compare_stats_tree, stats.reset_index().rename(columns={'index': 'Statistic'}))
+
+        self.process_diff_tree.delete(*self.process_diff_tree.get_children())
+        if len(selected) == 2:
+            try:
+                summary, table = self.workspace.process_diff(*selected, metric=self.compare_metric_var.get())
+                self._fill_tree(self.process_diff_tree, table)
+                self.process_diff_label.config(
+                    text=f"Mean Δ {summary['mean_delta']:.3f} · improved {summary['improved']} · "
+                         f"worse {summary['worse']} · unchanged {summary['unchanged']} "
+                         f"(largest {len(table)} changes shown)")
+            except ValueError as e:
+                self.process_diff_label.config(text=str(e))
+        else:
+            self.process_diff_label.config(text="Select two runs of the same workload")
+
+        for widget in self.timeline_frame.winfo_children():
+            widget.destroy()
+        if not selected:
+            return
+
+        try:
+            start = float(self.window_start_var.get()) if self.window_start_var.get() else None
+            end = float(self.window_end_var.get()) if self.window_end_var.get() else None
+        except ValueError:
+            messagebox.showwarning("Invalid Window", "Timeline window bounds must be numbers")
+            return
+
+        with self.profiler.span('compare_timelines'):
+            timelines = [(name, *self.workspace.get(name).timeline(start, end, limit=5000))
+                         for name in selected]
+            fig = build_timeline_overlay_figure(timelines)
+            if start is not None or end is not None:
+                fig.axes[0].set_xlim(left=start, right=end)
+
+        canvas = FigureCanvasTkAgg(fig, self.timeline_frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+    def create_live_panel(self):
+        toolbar = tk.Frame(self.live_frame, bg='#1e293b')
+        toolbar.pack(fill=tk.X, padx=10, pady=(10, 0))
+
+        self.live_start_btn = tk.Button(toolbar, text="▶ Start", command=self.start_live,
+                                        bg='#10b981', fg='white', font=('Arial', 10, 'bold'),
+                                        padx=15, pady=5, relief=tk.FLAT, cursor='hand2')
+        self.live_start_btn.pack(side=tk.LEFT, padx=5)
+        tk.Button(toolbar, text="⏹ Stop", command=self.stop_live,
+                 bg='#ef4444', fg='white', font=('Arial', 10, 'bold'),
+                 padx=15, pady=5, relief=tk.FLAT, cursor='hand2').pack(side=tk.LEFT, padx=5)
+
+        self.live_vars = {
+            'algorithm': tk.StringVar(value="RR"),
+            'quantum': tk.StringVar(value="2"),
+            'mean_interarrival': tk.StringVar(value="8"),
+            'mean_burst': tk.StringVar(value="7"),
+            'seed': tk.StringVar(),
+            'windows': tk.StringVar(value=",".join(str(w) for w in DEFAULT_WINDOWS))
+        }
+        tk.Label(toolbar, text="Algorithm:", bg='#1e293b', fg='white').pack(side=tk.LEFT, padx=(15, 0))
+        ttk.Combobox(toolbar, textvariable=self.live_vars['algorithm'], values=("RR", "FCFS", "PRIORITY"),
+                     state='readonly', width=9).pack(side=tk.LEFT, padx=5)
+        for key, text, width in (('quantum', "Quantum:", 4),
+                                 ('mean_interarrival', "Mean gap:", 6),
+                                 ('mean_burst', "Mean burst:", 6),
+                                 ('seed', "Seed:", 6),
+                                 ('windows', "Windows:", 18)):
+            tk.Label(toolbar, text=text, bg='#1e293b', fg='white').pack(side=tk.LEFT)
+            tk.Entry(toolbar, textvariable=self.live_vars[key], width=width).pack(side=tk.LEFT, padx=5)
+
+        self.live_status = ttk.Label(self.live_frame, text="Stopped")
+        self.live_status.pack(anchor='w', padx=10, pady=5)
+
+        self.live_tree = ttk.Treeview(self.live_frame, show='headings', height=len(WINDOW_METRICS))
+        self.live_tree.pack(fill=tk.X, padx=10)
+
+        self.live_chart_frame = ttk.Frame(self.live_frame)
+        self.live_chart_frame.pack(fill=tk.BOTH, expand=True)
+        self.live_figure = None
+        self.live_canvas = None
+
+    def start_live(self):
+        """Start a continuous simulation and stream its metrics into the Live tab"""
+        self.stop_live()
+        values = {key: var.get().strip() for key, var in self.live_vars.items()}
+        try:
+            quantum = int(values['quantum'])
+            mean_interarrival = float(values['mean_interarrival'])
+            mean_burst = float(values['mean_burst'])
+            seed = int(values['seed']) if values['seed'] else None
+            windows = [int(w) for w in values['windows'].split(',') if w.strip()]
+            stream = arrival_stream(seed, mean_interarrival=mean_interarrival, mean_burst=mean_burst)
+            simulation = ContinuousSimulation(stream, values['algorithm'], quantum, windows)
+        except ValueError as e:
+            messagebox.showwarning("Invalid Settings", str(e))
+            return
+
+        columns = ["Metric"] + [f"last {w:,}" for w in simulation.windows]
+        self.live_tree.config(columns=columns)
+        for col in columns:
+            self.live_tree.heading(col, text=col)
+            self.live_tree.column(col, width=140, anchor='w' if col == "Metric" else 'center')
+
+        for widget in self.live_chart_frame.winfo_children():
+            widget.destroy()
+        self.live_figure = build_live_figure(simulation.windows)
+        self.live_canvas = FigureCanvasTkAgg(self.live_figure, self.live_chart_frame)
+        self.live_canvas.draw()
+        self.live_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        self.live_history.clear()
+        self.live_runner = ContinuousRunner(simulation).start()
+        self.live_start_btn.config(state=tk.DISABLED)
+        self.live_status.config(text="Running...")
+        self.root.after(250, self.poll_live, self.live_runner)
+
+    def stop_live(self):
+        if self.live_runner is not None:
+            self.live_runner.stop()
+            self.live_runner = None
+        self.live_start_btn.config(state=tk.NORMAL)
+
+    def poll_live(self, runner):
+        if runner is not self.live_runner:
+            # Stopped or replaced by a newer run
+            return
+        latest = None
+        for kind, payload in runner.drain():
+            if kind == 'error':
+                self.stop_live()
+                self.live_status.config(text=f"Stopped: {payload}")
+                return
+            latest = payload
+            self.live_history.append(payload)
+            if kind == 'done':
+                self.stop_live()
+                break
+        if latest is not None:
+            self.update_live_dashboard(latest)
+        if runner is self.live_runner:
+            self.root.after(250, self.poll_live, runner)
+
+    def update_live_dashboard(self, snapshot):
+        self.live_status.config(
+            text=f"Simulated time {snapshot['time']:,} · active {snapshot['active']:,} · "
+                 f"completed {snapshot['completed']:,} · dropped {snapshot['dropped']:,} · "
+                 f"switches {snapshot['context_switches']:,}"
+                 + ("" if self.live_runner is not None else " · stopped"))
+
+        self.live_tree.delete(*self.live_tree.get_children())
+        for key in WINDOW_METRICS:
+            values = [snapshot['windows'][w][key] for w in snapshot['windows']]
+            self.live_tree.insert('', tk.END, values=[METRIC_LABELS[key]] + [
+                f"{v:,}" if key == 'completions' else f"{v:.3f}" for v in values])
+
+        # Only the line data changes, so the figure and canvas are reused
+        update_live_figure(self.live_figure, self.live_history)
+        self.live_canvas.draw_idle()
+
     def run_simulation_dialog(self):
         """Show dialog to run simulation with user inputs"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Run CPU Scheduling Simulation")
-        dialog.geometry("500x600")
+        dialog.geometry("500x700")
         dialog.configure(bg='#1e293b')
         dialog.transient(self.root)
         dialog.grab_set()
@@ -199,7 +910,7 @@ class ContextSwitchVisualizer:
         tk.Label(input_frame, text="\nNumber of Processes:", 
                 font=('Arial', 11, 'bold'), bg='#334155', fg='white').pack(anchor='w', pady=(10, 5))
         num_proc_var = tk.IntVar(value=3)
-        num_proc_spin = tk.Spinbox(input_frame, from_=2, to=10, textvariable=num_proc_var,
+        num_proc_spin = tk.Spinbox(input_frame, from_=2, to=1000, textvariable=num_proc_var,
                                    font=('Arial', 10), width=10)
         num_proc_spin.pack(anchor='w')
         
@@ -221,14 +932,49 @@ class ContextSwitchVisualizer:
                       bg='#334155', fg='white', selectcolor='#1e293b',
                       font=('Arial', 10)).pack(anchor='w')
         
+        # Random workload shape
+        shape_frame = tk.Frame(input_frame, bg='#334155')
+        shape_frame.pack(anchor='w', pady=(10, 0))
+        
+        tk.Label(shape_frame, text="Arrivals:", font=('Arial', 10),
+                bg='#334155', fg='white').grid(row=0, column=0, sticky='w')
+        arrival_var = tk.StringVar(value="fixed")
+        ttk.Combobox(shape_frame, textvariable=arrival_var, values=ARRIVAL_MODELS,
+                    state='readonly', width=10).grid(row=0, column=1, padx=5)
+        
+        tk.Label(shape_frame, text="Bursts:", font=('Arial', 10),
+                bg='#334155', fg='white').grid(row=0, column=2, sticky='w')
+        burst_var = tk.StringVar(value="uniform")
+        ttk.Combobox(shape_frame, textvariable=burst_var, values=BURST_MODELS,
+                    state='readonly', width=10).grid(row=0, column=3, padx=5)
+        
+        tk.Label(shape_frame, text="Replicas:", font=('Arial', 10),
+                bg='#334155', fg='white').grid(row=1, column=0, sticky='w', pady=(5, 0))
+        replicas_var = tk.IntVar(value=1)
+        tk.Spinbox(shape_frame, from_=1, to=10000, textvariable=replicas_var,
+                  font=('Arial', 10), width=10).grid(row=1, column=1, padx=5, pady=(5, 0))
+        
+        # A fixed seed reproduces the same workload for a run under another algorithm
+        tk.Label(shape_frame, text="Seed:", font=('Arial', 10),
+                bg='#334155', fg='white').grid(row=1, column=2, sticky='w', pady=(5, 0))
+        seed_var = tk.StringVar()
+        tk.Entry(shape_frame, textvariable=seed_var,
+                font=('Arial', 10), width=10).grid(row=1, column=3, padx=5, pady=(5, 0))
+        
         # Buttons
         btn_frame = tk.Frame(dialog, bg='#1e293b')
         btn_frame.pack(pady=20)
         
         def run_sim():
+            seed = seed_var.get().strip()
+            if seed and not seed.isdigit():
+                messagebox.showwarning("Invalid Seed", "Seed must be a non-negative integer", parent=dialog)
+                return
             dialog.destroy()
             self.run_simulation(algo_var.get(), quantum_var.get(), 
-                              num_proc_var.get(), input_method_var.get())
+                              num_proc_var.get(), input_method_var.get(),
+                              arrival_var.get(), burst_var.get(), replicas_var.get(),
+                              int(seed) if seed else None)
         
         tk.Button(btn_frame, text="▶ Run Simulation", command=run_sim,
                  bg='#10b981', fg='white', font=('Arial', 11, 'bold'),
@@ -238,12 +984,14 @@ class ContextSwitchVisualizer:
                  bg='#6b7280', fg='white', font=('Arial', 11, 'bold'),
                  padx=20, pady=10).pack(side=tk.LEFT, padx=5)
     
-    def run_simulation(self, algorithm, quantum, num_processes, input_method):
+    def run_simulation(self, algorithm, quantum, num_processes, input_method,
+                       arrival_model="fixed", burst_model="uniform", replicas=1, seed=None):
         """Run simulation with given parameters"""
         try:
             self.status_bar.config(text="Running simulation...")
             self.root.update()
             
+            profiler = self.new_profiler()
             processes = []
             
             if input_method == "manual":
@@ -259,23 +1007,45 @@ class ContextSwitchVisualizer:
                     self.status_bar.config(text="Failed to fetch processes")
                     return
             else:
-                # Random generation
-                for i in range(num_processes):
-                    processes.append({
-                        'name': f'P{i+1}',
-                        'arrival': i * 2,
-                        'burst': np.random.randint(3, 12),
-                        'priority': np.random.randint(1, 6)
-                    })
+                # Random generation; "fixed" arrivals keep the classic
+                # one-process-every-2-units layout
+                workload_options = {
+                    'arrival': arrival_model,
+                    'burst': burst_model,
+                    'mean_interarrival': 2.0 if arrival_model == "fixed" else 8.0
+                }
+                with profiler.span('generate_workload'):
+                    processes = generate_workload(num_processes, seed=seed, **workload_options)
             
-            # Run scheduling algorithm
-            result = self.simulate_scheduling(processes, algorithm, quantum)
-            
-            # Save to CSV
-            self.save_simulation_results(result)
+            with profiler.capture(), profiler.span('run_simulation'):
+                # Run scheduling algorithm
+                with profiler.span('simulate'):
+                    result = self.simulate_scheduling(processes, algorithm, quantum)
+                profiler.add_counters(result['counters'])
+                self.last_result = result
+                self.last_run_label = (f"{algorithm} q={quantum}" if algorithm == "RR"
+                                       else algorithm)
+                
+                # Save to CSV
+                with profiler.span('csv_export'):
+                    self.save_simulation_results(result)
+                
+                # Load and display
+                self.load_data_from_memory(result)
+                
+                # Replica mode: the tabs show one run, the statistics panel
+                # shows means and confidence intervals over all replicas
+                if input_method == "random" and replicas > 1:
+                    self.status_bar.config(text=f"Running {replicas} replicas...")
+                    self.root.update()
+                    with profiler.span('replicas'):
+                        workers = (os.cpu_count() or 1) if replicas * num_processes >= 200000 else 1
+                        summary = run_replicas(replicas, num_processes, algorithm, quantum,
+                                               seed=seed, workers=workers, **workload_options)
+                    self.show_replica_statistics(summary)
             
-            # Load and display
-            self.load_data_from_memory(result)
+            self.update_diagnostics()
+            self.record_run_metrics(result, quantum)
             
             self.status_bar.config(text="✓ Simulation completed successfully!")
             messagebox.showinfo("Success", 
@@ -389,29 +1159,9 @@ class ContextSwitchVisualizer:
         try:
             import psutil
             
-            # Get all running processes
-            all_processes = []
-            for proc in psutil.process_iter(['pid', 'name', 'cpu_percent', 'memory_percent', 'nice']):
-                try:
-                    pinfo = proc.info
-                    # Skip system idle and very small processes
-                    if pinfo['name'] and pinfo['pid'] > 0:
-                        all_processes.append({
-                            'pid': pinfo['pid'],
-                            'name': pinfo['name'],
-                            'cpu': pinfo['cpu_percent'] or 0,
-                            'memory': pinfo['memory_percent'] or 0,
-                            'priority': pinfo['nice'] if pinfo['nice'] is not None else 0
-                        })
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-            
-            if not all_processes:
-                messagebox.showerror("Error", "No processes found!")
-                return None
-            
-            # Show selection dialog
-            return self.show_process_selection_dialog(all_processes, num_processes)
+            # psutil is used by the scanner, which enumerates processes in
+            # the background and fills the dialog as it goes
+            return self.show_process_selection_dialog(ProcessScanner().start(), num_processes)
             
         except ImportError:
             messagebox.showwarning("psutil not installed",
@@ -438,7 +1188,7 @@ class ContextSwitchVisualizer:
             
             return processes
     
-    def show_process_selection_dialog(self, all_processes, num_processes):
+    def show_process_selection_dialog(self, scanner, num_processes):
         """Show dialog to select which processes to simulate"""
         dialog = tk.Toplevel(self.root)
         dialog.title("Select System Processes")
@@ -456,11 +1206,20 @@ class ContextSwitchVisualizer:
         
         # Info label
         info_label = tk.Label(dialog, 
-                             text="Real-time processes running on your system", 
+                             text="Scanning running processes...", 
                              font=('Arial', 10), 
                              bg='#1e293b', fg='#94a3b8')
         info_label.pack()
         
+        # Search
+        search_frame = tk.Frame(dialog, bg='#1e293b')
+        search_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        tk.Label(search_frame, text="Search:", font=('Arial', 10),
+                bg='#1e293b', fg='white').pack(side=tk.LEFT)
+        search_var = tk.StringVar()
+        tk.Entry(search_frame, textvariable=search_var, font=('Arial', 10),
+                width=30).pack(side=tk.LEFT, padx=5)
+        
         # Table frame
         table_frame = tk.Frame(dialog, bg='#334155')
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -478,42 +1237,102 @@ class ContextSwitchVisualizer:
         vsb.config(command=tree.yview)
         hsb.config(command=tree.xview)
         
-        # Configure columns
+        # Sortable columns: heading click sorts, a second click reverses
+        sort_keys = {"PID": 'pid', "Process Name": 'name', "CPU %": 'cpu', "Memory %": 'memory'}
+        view = {'key': 'cpu', 'reverse': True, 'generation': 0, 'filter_job': None}
+        
+        def sort_by(column):
+            key = sort_keys[column]
+            view['reverse'] = not view['reverse'] if view['key'] == key else key != 'name'
+            view['key'] = key
+            refresh()
+        
         tree.heading("Select", text="✓")
         tree.column("Select", width=40, anchor='center')
-        tree.heading("PID", text="PID")
-        tree.column("PID", width=80, anchor='center')
-        tree.heading("Process Name", text="Process Name")
-        tree.column("Process Name", width=250)
-        tree.heading("CPU %", text="CPU %")
-        tree.column("CPU %", width=80, anchor='center')
-        tree.heading("Memory %", text="Memory %")
-        tree.column("Memory %", width=100, anchor='center')
-        
-        # Sort by CPU usage
-        all_processes.sort(key=lambda x: x['cpu'], reverse=True)
-        
-        # Insert processes
-        for proc in all_processes[:50]:  # Show top 50
-            tree.insert('', tk.END, values=(
-                '',
-                proc['pid'],
-                proc['name'],
-                f"{proc['cpu']:.1f}%",
-                f"{proc['memory']:.2f}%"
-            ))
+        for column, width in (("PID", 80), ("Process Name", 250), ("CPU %", 80), ("Memory %", 100)):
+            tree.heading(column, text=column, command=lambda c=column: sort_by(c))
+            tree.column(column, width=width, anchor='w' if column == "Process Name" else 'center')
         
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         vsb.pack(side=tk.RIGHT, fill=tk.Y)
         hsb.pack(side=tk.BOTTOM, fill=tk.X)
         
-        # Selection tracking
-        selected_items = []
+        all_processes = {}
+        chosen = []
+        
+        def row_values(proc):
+            return ('', proc['pid'], proc['name'], f"{proc['cpu']:.1f}%", f"{proc['memory']:.2f}%")
+        
+        def refresh():
+            """Re-filter and re-sort, then insert rows in slices between UI events"""
+            view['generation'] += 1
+            generation = view['generation']
+            text = search_var.get().strip().lower()
+            rows = [p for p in all_processes.values()
+                    if not text or text in p['name'].lower() or text in str(p['pid'])]
+            rows.sort(key=lambda p: p[view['key']], reverse=view['reverse'])
+            tree.delete(*tree.get_children())
+            
+            def insert_slice(start):
+                if generation != view['generation'] or not dialog.winfo_exists():
+                    return
+                for proc in rows[start:start + 300]:
+                    tree.insert('', tk.END, iid=str(proc['pid']), values=row_values(proc))
+                if start + 300 < len(rows):
+                    dialog.after(1, insert_slice, start + 300)
+                else:
+                    shown = {str(p['pid']) for p in rows}
+                    tree.selection_set([str(pid) for pid in chosen if str(pid) in shown])
+            
+            insert_slice(0)
+        
+        def schedule_refresh(*args):
+            # Wait for a pause in typing before filtering thousands of rows
+            if view['filter_job'] is not None:
+                dialog.after_cancel(view['filter_job'])
+            view['filter_job'] = dialog.after(200, refresh)
+        
+        search_var.trace_add('write', schedule_refresh)
+        
+        def poll():
+            if not dialog.winfo_exists():
+                return
+            found = False
+            for kind, payload in scanner.drain():
+                if kind == 'rows':
+                    for proc in payload:
+                        all_processes[proc['pid']] = proc
+                    found = True
+                elif kind == 'cpu':
+                    for pid, cpu in payload.items():
+                        if pid in all_processes:
+                            all_processes[pid]['cpu'] = cpu
+                            if tree.exists(str(pid)):
+                                tree.set(str(pid), "CPU %", f"{cpu:.1f}%")
+                elif kind == 'done':
+                    if not all_processes:
+                        info_label.config(text="No processes found!")
+                    else:
+                        info_label.config(text=f"{len(all_processes)} processes running on your system")
+                    refresh()
+                    return
+            if found:
+                info_label.config(text=f"Scanning... {len(all_processes)} processes found, "
+                                       f"measuring CPU usage")
+                schedule_refresh()
+            dialog.after(50, poll)
         
+        # Selection tracking (kept by PID so it survives filtering and sorting)
         def on_select(event):
-            if len(tree.selection()) > num_processes:
+            shown = set(tree.get_children())
+            selected = [int(item) for item in tree.selection()]
+            chosen[:] = [pid for pid in chosen if str(pid) not in shown or pid in selected]
+            chosen.extend(pid for pid in selected if pid not in chosen)
+            if len(chosen) > num_processes:
                 # Deselect the oldest selection
-                tree.selection_remove(tree.selection()[0])
+                oldest = chosen.pop(0)
+                if tree.exists(str(oldest)):
+                    tree.selection_remove(str(oldest))
         
         tree.bind('<<TreeviewSelect>>', on_select)
         
@@ -531,23 +1350,17 @@ class ContextSwitchVisualizer:
         result = {'processes': None}
         
         def submit():
-            selected = tree.selection()
-            if len(selected) == 0:
+            if len(chosen) == 0:
                 messagebox.showwarning("No Selection", "Please select at least one process!")
                 return
             
-            if len(selected) > num_processes:
+            if len(chosen) > num_processes:
                 messagebox.showwarning("Too Many", f"Please select maximum {num_processes} processes!")
                 return
             
             processes = []
-            for i, item in enumerate(selected):
-                values = tree.item(item)['values']
-                pid = values[1]
-                name = values[2]
-                
-                # Find original process data
-                proc_data = next((p for p in all_processes if p['pid'] == pid), None)
+            for i, pid in enumerate(chosen):
+                proc_data = all_processes.get(pid)
                 
                 if proc_data:
                     # Simulate burst time based on CPU usage
@@ -556,21 +1369,25 @@ class ContextSwitchVisualizer:
                     priority = max(1, min(5, abs(proc_data['priority']) % 5 + 1))
                     
                     processes.append({
-                        'name': name,
+                        'name': proc_data['name'],
                         'arrival': i * 2,
                         'burst': burst,
                         'priority': priority
                     })
             
             result['processes'] = processes
+            scanner.stop()
             dialog.destroy()
         
         def cancel():
+            scanner.stop()
             dialog.destroy()
         
         def auto_select():
             # Auto-select top N by CPU usage
-            tree.selection_set(tree.get_children()[:num_processes])
+            top = sorted(all_processes.values(), key=lambda p: p['cpu'], reverse=True)
+            chosen[:] = [proc['pid'] for proc in top[:num_processes]]
+            tree.selection_set([str(pid) for pid in chosen if tree.exists(str(pid))])
         
         tk.Button(btn_frame, text="Auto Select Top Processes", command=auto_select,
                  bg='#8b5cf6', fg='white', font=('Arial', 10, 'bold'),
@@ -584,193 +1401,32 @@ class ContextSwitchVisualizer:
                  bg='#6b7280', fg='white', font=('Arial', 11, 'bold'),
                  padx=30, pady=10).pack(side=tk.LEFT, padx=5)
         
+        dialog.protocol("WM_DELETE_WINDOW", cancel)
+        poll()
         dialog.wait_window()
         
         return result['processes']
     
     def simulate_scheduling(self, processes, algorithm, quantum):
-        """Simulate CPU scheduling"""
-        n = len(processes)
-        proc_list = []
-        
-        for i, p in enumerate(processes):
-            proc_list.append({
-                'pid': 1000 + i,
-                'name': p['name'],
-                'arrival': p['arrival'],
-                'burst': p['burst'],
-                'remaining': p['burst'],
-                'priority': p['priority'],
-                'wait': 0,
-                'turnaround': 0,
-                'completion': 0,
-                'response': -1,
-                'state': 'NEW'
-            })
-        
-        current_time = 0
-        completed = 0
-        context_switches = 0
-        current_proc = None
-        switch_log = []
-        
-        if algorithm == "RR":
-            # Round Robin
-            queue = []
-            while completed < n:
-                # Add arrived processes
-                for p in proc_list:
-                    if p['arrival'] == current_time and p['state'] == 'NEW':
-                        p['state'] = 'READY'
-                        queue.append(p)
-                
-                if not queue:
-                    current_time += 1
-                    continue
-                
-                proc = queue.pop(0)
-                
-                if current_proc != proc:
-                    context_switches += 1
-                    switch_log.append({
-                        'time': current_time,
-                        'from': current_proc['name'] if current_proc else 'IDLE',
-                        'to': proc['name']
-                    })
-                    current_proc = proc
-                
-                if proc['response'] == -1:
-                    proc['response'] = current_time - proc['arrival']
-                
-                exec_time = min(quantum, proc['remaining'])
-                proc['remaining'] -= exec_time
-                current_time += exec_time
-                
-                # Update wait times
-                for p in proc_list:
-                    if p['state'] == 'READY' and p != proc:
-                        p['wait'] += exec_time
-                
-                if proc['remaining'] == 0:
-                    proc['state'] = 'COMPLETED'
-                    proc['completion'] = current_time
-                    proc['turnaround'] = proc['completion'] - proc['arrival']
-                    completed += 1
-                else:
-                    queue.append(proc)
-        
-        elif algorithm == "FCFS":
-            # FCFS
-            proc_list.sort(key=lambda x: x['arrival'])
-            for proc in proc_list:
-                if current_time < proc['arrival']:
-                    current_time = proc['arrival']
-                
-                if current_proc != proc:
-                    context_switches += 1
-                    switch_log.append({
-                        'time': current_time,
-                        'from': current_proc['name'] if current_proc else 'IDLE',
-                        'to': proc['name']
-                    })
-                    current_proc = proc
-                
-                proc['response'] = current_time - proc['arrival']
-                proc['wait'] = current_time - proc['arrival']
-                current_time += proc['burst']
-                proc['completion'] = current_time
-                proc['turnaround'] = proc['completion'] - proc['arrival']
-                proc['state'] = 'COMPLETED'
-        
-        elif algorithm == "PRIORITY":
-            # Priority Scheduling
-            while completed < n:
-                ready = [p for p in proc_list if p['arrival'] <= current_time and p['remaining'] > 0]
-                if not ready:
-                    current_time += 1
-                    continue
-                
-                proc = min(ready, key=lambda x: x['priority'])
-                
-                if current_proc != proc:
-                    context_switches += 1
-                    switch_log.append({
-                        'time': current_time,
-                        'from': current_proc['name'] if current_proc else 'IDLE',
-                        'to': proc['name']
-                    })
-                    current_proc = proc
-                
-                if proc['response'] == -1:
-                    proc['response'] = current_time - proc['arrival']
-                
-                proc['remaining'] -= 1
-                current_time += 1
-                
-                # Update wait times
-                for p in proc_list:
-                    if p != proc and p['arrival'] <= current_time and p['remaining'] > 0:
-                        p['wait'] += 1
-                
-                if proc['remaining'] == 0:
-                    proc['state'] = 'COMPLETED'
-                    proc['completion'] = current_time
-                    proc['turnaround'] = proc['completion'] - proc['arrival']
-                    completed += 1
-        
-        return {
-            'processes': proc_list,
-            'switches': switch_log,
-            'context_switches': context_switches,
-            'total_time': current_time,
-            'algorithm': algorithm
-        }
+        """Simulate CPU scheduling, keeping checkpoints so edits can re-run quickly"""
+        self.simulation = scheduler.IncrementalSimulation(processes, algorithm, quantum)
+        return self.simulation.result
     
     def save_simulation_results(self, result):
-        """Save results to CSV files"""
-        # Process data
-        df_proc = pd.DataFrame(result['processes'])
-        df_proc = df_proc.rename(columns={
-            'pid': 'PID',
-            'name': 'Process Name',
-            'arrival': 'Arrival Time',
-            'burst': 'Burst Time',
-            'completion': 'Completion Time',
-            'turnaround': 'Turnaround Time',
-            'wait': 'Wait Time',
-            'response': 'Response Time',
-            'priority': 'Priority',
-            'state': 'State'
-        })
-        df_proc = df_proc[['PID', 'Process Name', 'Arrival Time', 'Burst Time', 
-                           'Completion Time', 'Turnaround Time', 'Wait Time', 
-                           'Response Time', 'Priority', 'State']]
-        df_proc.to_csv('context_switch_log.csv', index=False)
-        
-        # Switch data
-        if result['switches']:
-            df_switch = pd.DataFrame(result['switches'])
-            df_switch.columns = ['Time', 'From Process', 'To Process']
-            df_switch.to_csv('context_switches.csv', index=False)
+        """Save results to CSV files, with per-bucket switch rates"""
+        # The indexed log is built once here and reused by the Switch Log tab
+        self.switch_log = SwitchLog.from_result(result)
+        scheduler.save_simulation_results(result, switch_log=self.switch_log)
     
     def load_data_from_memory(self, result):
         """Load data from simulation result"""
-        df_proc = pd.DataFrame(result['processes'])
-        self.process_data = pd.DataFrame({
-            'PID': df_proc['pid'],
-            'Process Name': df_proc['name'],
-            'Arrival Time': df_proc['arrival'],
-            'Burst Time': df_proc['burst'],
-            'Completion Time': df_proc['completion'],
-            'Turnaround Time': df_proc['turnaround'],
-            'Wait Time': df_proc['wait'],
-            'Response Time': df_proc['response'],
-            'Priority': df_proc['priority'],
-            'State': df_proc['state']
-        })
-        
-        if result['switches']:
-            self.switch_data = pd.DataFrame(result['switches'])
+        with self.profiler.span('build_frames'):
+            self.process_data = scheduler.process_frame(result)
+            
+            if result['context_switches']:
+                self.switch_data = scheduler.switch_frame(result)
+            else:
+                self.switch_data = None
         
         self.update_display()
     
@@ -778,7 +1434,7 @@ class ContextSwitchVisualizer:
         """Load data from CSV files"""
         try:
             if os.path.exists('context_switch_log.csv'):
-                self.process_data = pd.read_csv('context_switch_log.csv')
+                filename = 'context_switch_log.csv'
             else:
                 filename = filedialog.askopenfilename(
                     title="Select Process Log CSV",
@@ -786,12 +1442,27 @@ class ContextSwitchVisualizer:
                 )
                 if not filename:
                     return
-                self.process_data = pd.read_csv(filename)
             
-            if os.path.exists('context_switches.csv'):
-                self.switch_data = pd.read_csv('context_switches.csv')
+            # A loaded table has no simulation behind it to edit and re-run
+            self.simulation = None
+            self.last_result = None
+            self.last_run_label = None
+            self.switch_data = None
             
-            self.update_display()
+            profiler = self.new_profiler()
+            with profiler.capture(), profiler.span('load_data'):
+                with profiler.span('csv_load'):
+                    self.process_data = pd.read_csv(filename)
+                    
+                    if os.path.exists('context_switches.csv'):
+                        self.switch_data = pd.read_csv('context_switches.csv')
+                
+                with profiler.span('index_switches'):
+                    self.switch_log = (SwitchLog.from_frame(self.switch_data, self.process_data)
+                                       if self.switch_data is not None else None)
+                
+                self.update_display()
+            self.update_diagnostics()
             messagebox.showinfo("Success", "Data loaded successfully!")
             self.status_bar.config(text="✓ Data loaded from CSV")
             
@@ -802,27 +1473,49 @@ class ContextSwitchVisualizer:
         """Clear all data and visualizations"""
         self.process_data = None
         self.switch_data = None
+        self.switch_log = None
+        self.load_series = None
+        self.last_result = None
+        self.simulation = None
         
         for widget in self.gantt_frame.winfo_children():
             widget.destroy()
         for widget in self.graph_frame.winfo_children():
             widget.destroy()
+        self.update_time_series()
         for item in self.tree.get_children():
             self.tree.delete(item)
+        self.update_switch_log()
         
         for key in self.stats_labels:
             self.stats_labels[key].config(text="--")
         
+        self.profiler = Profiler()
+        self.update_diagnostics()
+        
         self.status_bar.config(text="Data cleared")
     
     def update_display(self):
         if self.process_data is None:
             return
         
-        self.update_statistics()
-        self.update_process_table()
-        self.create_gantt_chart()
-        self.create_performance_graphs()
+        with self.profiler.span('update_display'):
+            with self.profiler.span('statistics'):
+                self.update_statistics()
+            with self.profiler.span('process_table'):
+                self.update_process_table()
+            with self.profiler.span('gantt_chart'):
+                self.create_gantt_chart()
+            with self.profiler.span('performance_graphs'):
+                self.create_performance_graphs()
+            with self.profiler.span('time_series'):
+                switch_times = self.switch_log.time if self.switch_log is not None else ()
+                self.load_series = LoadSeries.from_frame(self.process_data, switch_times)
+                self.update_time_series()
+            with self.profiler.span('switch_log'):
+                self.switch_process_box.config(
+                    values=sorted(self.process_data['Process Name'].astype(str).unique()))
+                self.update_switch_log()
     
     def update_statistics(self):
         df = self.process_data
@@ -843,6 +1536,29 @@ class ContextSwitchVisualizer:
         self.stats_labels['avg_turnaround'].config(text=f"{avg_turnaround:.2f}")
         self.stats_labels['cpu_util'].config(text=f"{cpu_util:.1f}%")
         self.stats_labels['throughput'].config(text=f"{throughput:.3f}")
+        self.stats_labels['avg_response'].config(text=f"{df['Response Time'].mean():.2f}")
+        self.stats_labels['replicas'].config(text="1")
+    
+    def show_replica_statistics(self, summary):
+        """Show replica means with confidence interval half-widths"""
+        formats = {
+            'avg_wait': '.2f',
+            'avg_turnaround': '.2f',
+            'avg_response': '.2f',
+            'throughput': '.3f',
+            'context_switches': '.1f'
+        }
+        for metric, fmt in formats.items():
+            stats = summary['metrics'][metric]
+            self.stats_labels[metric].config(
+                text=f"{stats['mean']:{fmt}} ± {stats['half_width']:{fmt}}")
+        cpu_util = summary['metrics']['cpu_util']
+        self.stats_labels['cpu_util'].config(text=f"{cpu_util['mean']:.1f} ± {cpu_util['half_width']:.1f}%")
+        # Every replica has the same number of processes
+        self.stats_labels['total_proc'].config(text=f"{summary['processes']} per replica")
+        
+        confidence = int(round(summary['confidence'] * 100))
+        self.stats_labels['replicas'].config(text=f"{summary['replicas']} ({confidence}% CI)")
     
     def update_process_table(self):
         for item in self.tree.get_children():
@@ -869,41 +1585,7 @@ class ContextSwitchVisualizer:
         for widget in self.gantt_frame.winfo_children():
             widget.destroy()
         
-        fig = Figure(figsize=(12, 6), facecolor='#1e293b')
-        ax = fig.add_subplot(111, facecolor='#334155')
-        
-        df = self.process_data.sort_values('Arrival Time')
-        
-        colors = plt.cm.Set3(np.linspace(0, 1, len(df)))
-        
-        for i, (_, proc) in enumerate(df.iterrows()):
-            start_time = proc['Completion Time'] - proc['Burst Time']
-            ax.barh(proc['Process Name'], 
-                   proc['Burst Time'],
-                   left=start_time,
-                   color=colors[i],
-                   edgecolor='white',
-                   linewidth=2)
-            
-            ax.text(start_time + proc['Burst Time'] / 2,
-                   i, 
-                   f"{proc['Process Name']}\n{proc['Burst Time']}",
-                   ha='center', va='center',
-                   fontsize=9, fontweight='bold')
-        
-        ax.set_xlabel('Time Units', fontsize=12, color='white', fontweight='bold')
-        ax.set_ylabel('Processes', fontsize=12, color='white', fontweight='bold')
-        ax.set_title('Gantt Chart - Process Execution Timeline', 
-                    fontsize=14, color='#60a5fa', fontweight='bold', pad=20)
-        
-        ax.tick_params(colors='white', labelsize=10)
-        ax.grid(True, alpha=0.3, color='white', linestyle='--')
-        ax.spines['bottom'].set_color('white')
-        ax.spines['left'].set_color('white')
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        
-        fig.tight_layout()
+        fig = build_gantt_figure(self.process_data)
         
         canvas = FigureCanvasTkAgg(fig, self.gantt_frame)
         canvas.draw()
@@ -913,63 +1595,7 @@ class ContextSwitchVisualizer:
         for widget in self.graph_frame.winfo_children():
             widget.destroy()
         
-        fig = Figure(figsize=(14, 8), facecolor='#1e293b')
-        
-        df = self.process_data
-        
-        # Wait Time Chart
-        ax1 = fig.add_subplot(221, facecolor='#334155')
-        ax1.bar(df['Process Name'], df['Wait Time'], color='#fbbf24', 
-                edgecolor='white', linewidth=1.5)
-        ax1.set_title('Wait Time per Process', fontsize=12, color='#60a5fa', 
-                     fontweight='bold')
-        ax1.set_xlabel('Process', fontsize=10, color='white')
-        ax1.set_ylabel('Wait Time', fontsize=10, color='white')
-        ax1.tick_params(colors='white', labelsize=8)
-        ax1.grid(True, alpha=0.3, color='white', linestyle='--')
-        
-        # Turnaround Time Chart
-        ax2 = fig.add_subplot(222, facecolor='#334155')
-        ax2.bar(df['Process Name'], df['Turnaround Time'], color='#34d399', 
-                edgecolor='white', linewidth=1.5)
-        ax2.set_title('Turnaround Time per Process', fontsize=12, color='#60a5fa', 
-                     fontweight='bold')
-        ax2.set_xlabel('Process', fontsize=10, color='white')
-        ax2.set_ylabel('Turnaround Time', fontsize=10, color='white')
-        ax2.tick_params(colors='white', labelsize=8)
-        ax2.grid(True, alpha=0.3, color='white', linestyle='--')
-        
-        # Response Time Chart
-        ax3 = fig.add_subplot(223, facecolor='#334155')
-        ax3.bar(df['Process Name'], df['Response Time'], color='#8b5cf6', 
-                edgecolor='white', linewidth=1.5)
-        ax3.set_title('Response Time per Process', fontsize=12, color='#60a5fa', 
-                     fontweight='bold')
-        ax3.set_xlabel('Process', fontsize=10, color='white')
-        ax3.set_ylabel('Response Time', fontsize=10, color='white')
-        ax3.tick_params(colors='white', labelsize=8)
-        ax3.grid(True, alpha=0.3, color='white', linestyle='--')
-        
-        # Comparison Chart
-        ax4 = fig.add_subplot(224, facecolor='#334155')
-        x = np.arange(len(df))
-        width = 0.25
-        
-        ax4.bar(x - width, df['Wait Time'], width, label='Wait Time', color='#fbbf24')
-        ax4.bar(x, df['Turnaround Time'], width, label='Turnaround Time', color='#34d399')
-        ax4.bar(x + width, df['Response Time'], width, label='Response Time', color='#8b5cf6')
-        
-        ax4.set_title('Performance Comparison', fontsize=12, color='#60a5fa', 
-                     fontweight='bold')
-        ax4.set_xlabel('Process', fontsize=10, color='white')
-        ax4.set_ylabel('Time Units', fontsize=10, color='white')
-        ax4.set_xticks(x)
-        ax4.set_xticklabels(df['Process Name'], rotation=45, ha='right')
-        ax4.legend(facecolor='#1e293b', edgecolor='white', labelcolor='white')
-        ax4.tick_params(colors='white', labelsize=8)
-        ax4.grid(True, alpha=0.3, color='white', linestyle='--')
-        
-        fig.tight_layout()
+        fig = build_performance_figure(self.process_data)
         
         canvas = FigureCanvasTkAgg(fig, self.graph_frame)
         canvas.draw()
@@ -0,0 +1,365 @@
+"""Machine-readable run metrics in OpenMetrics text format and JSON lines.
+
+``run_metrics`` turns a simulation result and the ``Profiler`` of its run
+into one flat record: the run statistics, the engine's internal counters,
+dispatch events per second, the peak ready-queue size, the peak RSS of the
+simulating process and the duration of every profiled phase. The C++
+backend writes records with the same fields (``backend --bench ...
+--metrics FILE``), so both engines feed the same dashboards.
+
+A ``MetricsExporter`` keeps the latest record per engine, algorithm and
+quantum. It can append every record to a JSON lines file, rewrite an
+OpenMetrics text file (for a textfile collector), and serve the OpenMetrics
+text on an HTTP scrape endpoint. Files given to ``watch`` are read for new
+JSON lines at every scrape, so records written by other processes, such as
+the C++ backend, show up on the same endpoint.
+
+Examples:
+    python metrics.py run --algorithm RR --processes 100000 --jsonl metrics.jsonl
+    python metrics.py run --algorithm PRIORITY --openmetrics metrics.prom
+    python metrics.py serve --port 9464 --watch metrics.jsonl --watch cpp_metrics.jsonl
+"""
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+from profiling import Profiler
+import scheduler
+from timeseries import LoadSeries
+from workload import ARRIVAL_MODELS, BURST_MODELS, generate_workload
+from workspace import run_statistics
+
+PREFIX = 'ctxsim_'
+CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+DEFAULT_PORT = 9464
+ALGORITHMS = ("RR", "FCFS", "PRIORITY")
+
+# (record field, metric name, unit, help) of the per-run gauges
+GAUGES = (
+    ('total_processes', 'processes', '', 'Processes in the run'),
+    ('context_switches', 'context_switches', '', 'Context switches in the run'),
+    ('total_time', 'simulated_time', '', 'Simulated time units until the last completion'),
+    ('avg_wait', 'avg_wait_time', '', 'Mean wait time in time units'),
+    ('avg_turnaround', 'avg_turnaround_time', '', 'Mean turnaround time in time units'),
+    ('avg_response', 'avg_response_time', '', 'Mean response time in time units'),
+    ('cpu_util', 'cpu_utilization_percent', '', 'Share of the run the CPU was busy'),
+    ('throughput', 'throughput', '', 'Completed processes per time unit'),
+    ('events', 'events', '', 'Scheduler dispatch decisions in the run'),
+    ('events_per_second', 'events_per_second', '', 'Dispatch decisions per second of simulation'),
+    ('peak_ready_queue', 'peak_ready_queue', '', 'Most processes waiting in the ready queue at once'),
+    ('peak_rss_bytes', 'peak_rss', 'bytes', 'Peak resident set size of the simulating process'),
+    ('timestamp', 'last_run_timestamp', 'seconds', 'When the run was recorded (Unix time)')
+)
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where it is unknown"""
+    try:
+        import resource
+    except ImportError:
+        # Windows: psutil reports the peak working set
+        try:
+            import psutil
+        except ImportError:
+            return None
+        info = psutil.Process().memory_info()
+        return int(getattr(info, 'peak_wset', info.rss))
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return int(peak if sys.platform == 'darwin' else peak * 1024)
+
+
+def run_metrics(result, profiler=None, engine='python', quantum=None, series=None):
+    """One metrics record for a simulation result
+
+    ``profiler`` supplies the phase durations; its ``simulate`` phase is the
+    time events per second are measured against. ``series`` is the run's
+    ``LoadSeries`` if one was already built for it.
+    """
+    phases = {}
+    if profiler is not None:
+        phases = {name: phase['total'] for name, phase in profiler.summary().items()}
+    counters = dict(result.get('counters', {}))
+    events = counters.get('dispatches', result['context_switches'])
+    seconds = phases.get('simulate')
+    if series is None:
+        series = LoadSeries.from_result(result)
+
+    return {
+        'timestamp': time.time(),
+        'engine': engine,
+        'algorithm': result['algorithm'],
+        'quantum': quantum,
+        **run_statistics(result),
+        'events': int(events),
+        'simulate_seconds': seconds,
+        'events_per_second': events / seconds if seconds else None,
+        'peak_ready_queue': series.peak_ready,
+        'peak_rss_bytes': peak_rss_bytes(),
+        'phases': phases,
+        'counters': counters
+    }
+
+
+def _labels(record, **extra):
+    labels = {'engine': record.get('engine', ''), 'algorithm': record.get('algorithm', '')}
+    if record.get('algorithm') == 'RR' and record.get('quantum') is not None:
+        labels['quantum'] = record['quantum']
+    labels.update(extra)
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+               for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+def _number(value):
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 'NaN'
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(int(value))
+
+
+def _family(lines, name, kind, unit, help_text, samples):
+    if not samples:
+        return
+    lines.append(f"# TYPE {name} {kind}")
+    if unit:
+        lines.append(f"# UNIT {name} {unit}")
+    lines.append(f"# HELP {name} {help_text}")
+    suffix = '_total' if kind == 'counter' else ''
+    lines.extend(f"{name}{suffix}{labels} {_number(value)}" for labels, value in samples)
+
+
+def openmetrics(records, runs=None):
+    """OpenMetrics text exposition of the given records
+
+    ``runs`` maps ``series_key(record)`` to the number of runs recorded for
+    it, exported as the ``runs`` counter.
+    """
+    lines = []
+    for field, name, unit, help_text in GAUGES:
+        family = PREFIX + name + (f'_{unit}' if unit else '')
+        _family(lines, family, 'gauge', unit, help_text,
+                [(_labels(r), r[field]) for r in records if r.get(field) is not None])
+    _family(lines, PREFIX + 'phase_duration_seconds', 'gauge', 'seconds',
+            'Wall time of each profiled phase of the run',
+            [(_labels(r, phase=phase), seconds) for r in records
+             for phase, seconds in (r.get('phases') or {}).items()])
+    _family(lines, PREFIX + 'engine_counter', 'gauge', '', 'Internal counters of the scheduling engine',
+            [(_labels(r, counter=counter), value) for r in records
+             for counter, value in (r.get('counters') or {}).items()])
+    if runs is not None:
+        _family(lines, PREFIX + 'runs', 'counter', '', 'Runs recorded since the exporter started',
+                [(_labels(r), runs[series_key(r)]) for r in records])
+    lines.append('# EOF')
+    return '\n'.join(lines) + '\n'
+
+
+def series_key(record):
+    quantum = record.get('quantum') if record.get('algorithm') == 'RR' else None
+    return (record.get('engine'), record.get('algorithm'), quantum)
+
+
+class MetricsExporter:
+    """Latest run metrics per engine/algorithm, exported to files and/or HTTP"""
+
+    def __init__(self, jsonl_path=None, openmetrics_path=None, watch=()):
+        self.jsonl_path = jsonl_path
+        self.openmetrics_path = openmetrics_path
+        self.latest = {}
+        self.runs = {}
+        self._offsets = {path: 0 for path in watch}
+        self._lock = threading.Lock()
+        self._server = None
+
+    def _add(self, record):
+        key = series_key(record)
+        self.latest[key] = record
+        self.runs[key] = self.runs.get(key, 0) + 1
+
+    def record(self, record, write=True):
+        """Add a run's record; with ``write``, also append/rewrite the export files"""
+        with self._lock:
+            self._add(record)
+        if not write:
+            return
+        if self.jsonl_path:
+            with open(self.jsonl_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+        if self.openmetrics_path:
+            # Replace the file in one step so a collector never reads half of it
+            partial = self.openmetrics_path + '.tmp'
+            with open(partial, 'w', encoding='utf-8') as f:
+                f.write(self.openmetrics())
+            os.replace(partial, self.openmetrics_path)
+
+    def watch(self, path):
+        """Also export the records other processes append to the JSON lines file ``path``"""
+        with self._lock:
+            self._offsets.setdefault(path, 0)
+
+    def poll(self):
+        """Read the complete lines appended to the watched files since the last poll"""
+        with self._lock:
+            for path, offset in self._offsets.items():
+                try:
+                    with open(path, 'rb') as f:
+                        f.seek(0, os.SEEK_END)
+                        if f.tell() < offset:
+                            offset = 0  # truncated or replaced
+                        f.seek(offset)
+                        data = f.read()
+                except OSError:
+                    continue
+                # A line still being written has no newline yet
+                complete = data[:data.rfind(b'\n') + 1]
+                self._offsets[path] = offset + len(complete)
+                for line in complete.splitlines():
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(record, dict):
+                        self._add(record)
+
+    def records(self):
+        self.poll()
+        with self._lock:
+            return list(self.latest.values())
+
+    def openmetrics(self):
+        self.poll()
+        with self._lock:
+            return openmetrics(list(self.latest.values()), dict(self.runs))
+
+    def serve(self, host='127.0.0.1', port=DEFAULT_PORT):
+        """Serve ``/metrics`` (OpenMetrics) and ``/metrics.json`` on a daemon thread
+
+        Returns the bound (host, port); port 0 picks a free port.
+        """
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if path == '/metrics':
+                    status, content_type, body = 200, CONTENT_TYPE, exporter.openmetrics()
+                elif path == '/metrics.json':
+                    status, content_type, body = 200, 'application/json', json.dumps(exporter.records())
+                else:
+                    status, content_type, body = 404, 'text/plain', f"No such endpoint: {path}\n"
+                body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name='metrics-endpoint',
+                         daemon=True).start()
+        return self._server.server_address[:2]
+
+    @property
+    def serving(self):
+        return self._server is not None
+
+    def close(self):
+        """Stop the HTTP endpoint, if it is running"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def simulate_with_metrics(num_processes, algorithm, quantum, seed=None, **workload_options):
+    """Generate and simulate a workload, profiling each phase; returns its record"""
+    profiler = Profiler()
+    with profiler.span('run'):
+        with profiler.span('generate_workload'):
+            workload = generate_workload(num_processes, seed=seed, **workload_options)
+        with profiler.span('simulate'):
+            result = scheduler.simulate_scheduling(workload, algorithm, quantum)
+        with profiler.span('load_series'):
+            series = LoadSeries.from_result(result)
+    return run_metrics(result, profiler, quantum=quantum, series=series)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='simulate seeded workloads and export their metrics')
+    run.add_argument('--algorithm', choices=ALGORITHMS, default='RR')
+    run.add_argument('--quantum', type=int, default=2)
+    run.add_argument('--processes', type=int, default=100000)
+    run.add_argument('--seed', type=int, default=1)
+    run.add_argument('--arrival', choices=ARRIVAL_MODELS, default='poisson')
+    run.add_argument('--burst', choices=BURST_MODELS, default='lognormal')
+    run.add_argument('--repeat', type=int, default=1, help='runs, each with the next seed')
+    run.add_argument('--jsonl', help='append one JSON line per run to this file')
+    run.add_argument('--openmetrics', help='rewrite this OpenMetrics text file after each run')
+    run.add_argument('--serve', type=int, metavar='PORT',
+                     help='keep serving the results on this port once the runs finish')
+
+    serve = commands.add_parser('serve', help='serve the records in JSON lines files on /metrics')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--watch', action='append', default=[], metavar='FILE',
+                       help='JSON lines file to export (repeatable)')
+
+    args = parser.parse_args(argv)
+    if args.command == 'serve' and not args.watch:
+        parser.error("give at least one --watch file")
+    return args
+
+
+def _wait_forever(exporter, host, port):
+    print(f"Serving metrics on http://{host}:{port}/metrics")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        exporter.close()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'serve':
+        exporter = MetricsExporter(watch=args.watch)
+        host, port = exporter.serve(args.host, args.port)
+        _wait_forever(exporter, host, port)
+        return 0
+
+    exporter = MetricsExporter(args.jsonl, args.openmetrics)
+    for k in range(args.repeat):
+        record = simulate_with_metrics(args.processes, args.algorithm, args.quantum,
+                                       seed=args.seed + k, arrival=args.arrival, burst=args.burst)
+        exporter.record(record)
+        rate = record['events_per_second']
+        print(f"[{k + 1}/{args.repeat}] {record['algorithm']} {record['total_processes']} processes: "
+              f"{record['simulate_seconds']:.3f}s, {rate or 0:,.0f} events/s, "
+              f"peak ready queue {record['peak_ready_queue']}", file=sys.stderr)
+    if not args.jsonl and not args.openmetrics and args.serve is None:
+        sys.stdout.write(exporter.openmetrics())
+    if args.serve is not None:
+        host, port = exporter.serve('127.0.0.1', args.serve)
+        _wait_forever(exporter, host, port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
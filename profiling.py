@@ -0,0 +1,128 @@
+"""Instrumentation for the simulation pipeline.
+
+A ``Profiler`` collects named phase timings (spans) and counters for one run,
+and can optionally capture a cProfile profile and tracemalloc statistics.
+Everything it gathers can be exported as JSON.
+"""
+import cProfile
+import io
+import json
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class Profiler:
+    """Collects named phase timings and counters for one simulation run"""
+
+    def __init__(self, cprofile=False, memory=False):
+        self.cprofile_enabled = cprofile
+        self.memory_enabled = memory
+        self.spans = []
+        self.counters = {}
+        self.cprofile_stats = []
+        self.memory_stats = {}
+        self._stack = []
+        self._origin = time.perf_counter()
+        self._profile = None
+        self._owns_tracemalloc = False
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block and record it under ``name``"""
+        start = time.perf_counter()
+        self._stack.append(name)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            self.spans.append({
+                'name': name,
+                'parent': self._stack[-1] if self._stack else None,
+                'start': start - self._origin,
+                'duration': time.perf_counter() - start
+            })
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_counters(self, counters, prefix=''):
+        for name, amount in counters.items():
+            self.count(prefix + name, amount)
+
+    def start(self):
+        """Start the optional cProfile / tracemalloc captures"""
+        if self.cprofile_enabled:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        if self.memory_enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._owns_tracemalloc = True
+
+    def stop(self, top=25):
+        """Stop the captures and keep their ``top`` entries"""
+        if self._profile is not None:
+            self._profile.disable()
+            stats = pstats.Stats(self._profile, stream=io.StringIO())
+            stats.sort_stats('cumulative')
+            self.cprofile_stats = []
+            for func in stats.fcn_list[:top]:
+                calls, primitive, tottime, cumtime, _ = stats.stats[func]
+                filename, line, funcname = func
+                self.cprofile_stats.append({
+                    'function': f"{funcname} ({filename}:{line})",
+                    'calls': calls,
+                    'tottime': tottime,
+                    'cumtime': cumtime
+                })
+            self._profile = None
+
+        if self._owns_tracemalloc:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self._owns_tracemalloc = False
+            self.memory_stats = {
+                'current_bytes': current,
+                'peak_bytes': peak,
+                'top_allocations': [{
+                    'location': str(stat.traceback),
+                    'size_bytes': stat.size,
+                    'count': stat.count
+                } for stat in snapshot.statistics('lineno')[:top]]
+            }
+
+    @contextmanager
+    def capture(self):
+        """Run ``start``/``stop`` around the enclosed block"""
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def summary(self):
+        """Aggregate spans by name, ordered by when each phase first started"""
+        phases = {}
+        for span in sorted(self.spans, key=lambda s: s['start']):
+            phase = phases.setdefault(span['name'], {
+                'parent': span['parent'], 'calls': 0, 'total': 0.0, 'max': 0.0
+            })
+            phase['calls'] += 1
+            phase['total'] += span['duration']
+            phase['max'] = max(phase['max'], span['duration'])
+        return phases
+
+    def to_dict(self):
+        return {
+            'phases': self.summary(),
+            'spans': self.spans,
+            'counters': self.counters,
+            'cprofile': self.cprofile_stats,
+            'memory': self.memory_stats
+        }
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,185 @@
+"""Monte Carlo replicas: many independent random workloads, one summary.
+
+``run_replicas`` simulates K seeded random workloads for the same algorithm
+and quantum and reports the mean and a Student-t confidence interval for
+each run metric. FCFS replicas are computed together, one replica per row
+of a 2-D array; RR and PRIORITY replicas are split into chunks that can run
+on a pool of worker processes.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+
+import numpy as np
+
+import scheduler
+from workload import generate_workload
+
+METRICS = ('avg_wait', 'avg_turnaround', 'avg_response', 'throughput', 'context_switches',
+           'cpu_util')
+
+# Rows of (replicas x processes) handled per FCFS batch, to bound memory
+FCFS_BATCH_ELEMENTS = 1 << 21
+
+# Two-sided Student-t critical values by confidence, for 1..30 degrees of
+# freedom; the expansion in _t_quantile is only accurate beyond that
+T_TABLE = {
+    0.9: (6.313752, 2.919986, 2.353363, 2.131847, 2.015048, 1.943180,
+           1.894579, 1.859548, 1.833113, 1.812461, 1.795885, 1.782288,
+           1.770933, 1.761310, 1.753050, 1.745884, 1.739607, 1.734064,
+           1.729133, 1.724718, 1.720743, 1.717144, 1.713872, 1.710882,
+           1.708141, 1.705618, 1.703288, 1.701131, 1.699127, 1.697261),
+    0.95: (12.706205, 4.302653, 3.182446, 2.776445, 2.570582, 2.446912,
+           2.364624, 2.306004, 2.262157, 2.228139, 2.200985, 2.178813,
+           2.160369, 2.144787, 2.131450, 2.119905, 2.109816, 2.100922,
+           2.093024, 2.085963, 2.079614, 2.073873, 2.068658, 2.063899,
+           2.059539, 2.055529, 2.051831, 2.048407, 2.045230, 2.042272),
+    0.98: (31.820516, 6.964557, 4.540703, 3.746947, 3.364930, 3.142668,
+           2.997952, 2.896459, 2.821438, 2.763769, 2.718079, 2.680998,
+           2.650309, 2.624494, 2.602480, 2.583487, 2.566934, 2.552380,
+           2.539483, 2.527977, 2.517648, 2.508325, 2.499867, 2.492159,
+           2.485107, 2.478630, 2.472660, 2.467140, 2.462021, 2.457262),
+    0.99: (63.656741, 9.924843, 5.840909, 4.604095, 4.032143, 3.707428,
+           3.499483, 3.355387, 3.249836, 3.169273, 3.105807, 3.054540,
+           3.012276, 2.976843, 2.946713, 2.920782, 2.898231, 2.878440,
+           2.860935, 2.845340, 2.831360, 2.818756, 2.807336, 2.796940,
+           2.787436, 2.778715, 2.770683, 2.763262, 2.756386, 2.749996),
+}
+
+
+def run_metrics(result):
+    """Whole-run scalars for one simulation result, in ``METRICS`` order"""
+    processes = result['processes']
+    n = len(processes['pid'])
+    total_time = result['total_time']
+    return (
+        float(np.mean(processes['wait'])),
+        float(np.mean(processes['turnaround'])),
+        float(np.mean(processes['response'])),
+        n / total_time if total_time > 0 else 0.0,
+        float(result['context_switches']),
+        float(np.sum(processes['burst'])) / total_time * 100 if total_time > 0 else 0.0
+    )
+
+
+def _simulate_chunk(seeds, num_processes, algorithm, quantum, workload_options):
+    """Simulate one replica per seed; module level so worker processes can run it"""
+    samples = np.empty((len(seeds), len(METRICS)))
+    for row, seed in enumerate(seeds):
+        workload = generate_workload(num_processes, seed=seed, **workload_options)
+        samples[row] = run_metrics(scheduler.simulate_scheduling(workload, algorithm, quantum))
+    return samples
+
+
+def _fcfs_batch(seeds, num_processes, workload_options):
+    """FCFS metrics for many replicas at once, one replica per array row"""
+    rows = max(1, FCFS_BATCH_ELEMENTS // num_processes)
+    samples = np.empty((len(seeds), len(METRICS)))
+
+    for first in range(0, len(seeds), rows):
+        batch = [generate_workload(num_processes, seed=seed, **workload_options)
+                 for seed in seeds[first:first + rows]]
+        arrival = np.stack([w['arrival'] for w in batch])
+        burst = np.stack([w['burst'] for w in batch])
+
+        order = np.argsort(arrival, axis=1, kind='stable')
+        arrival = np.take_along_axis(arrival, order, axis=1)
+        burst = np.take_along_axis(burst, order, axis=1)
+
+        # Same closed form as scheduler._fcfs, applied along each row
+        busy_before = np.cumsum(burst, axis=1) - burst
+        slack = np.maximum.accumulate(arrival - busy_before, axis=1)
+        np.maximum(slack, 0, out=slack)
+        start = busy_before + slack
+        wait = start - arrival
+        total_time = start[:, -1] + burst[:, -1]
+
+        out = samples[first:first + len(batch)]
+        out[:, 0] = wait.mean(axis=1)
+        out[:, 1] = (wait + burst).mean(axis=1)
+        out[:, 2] = out[:, 0]
+        out[:, 3] = np.where(total_time > 0, num_processes / np.maximum(total_time, 1), 0.0)
+        out[:, 4] = num_processes
+        out[:, 5] = np.where(total_time > 0, burst.sum(axis=1) / np.maximum(total_time, 1) * 100, 0.0)
+    return samples
+
+
+def _t_quantile(p, dof):
+    """Student-t quantile via the Cornish-Fisher expansion of the normal one"""
+    z = NormalDist().inv_cdf(p)
+    return (z
+            + (z ** 3 + z) / (4 * dof)
+            + (5 * z ** 5 + 16 * z ** 3 + 3 * z) / (96 * dof ** 2)
+            + (3 * z ** 7 + 19 * z ** 5 + 17 * z ** 3 - 15 * z) / (384 * dof ** 3))
+
+
+def t_critical(confidence, dof):
+    """Two-sided Student-t critical value for ``confidence`` with ``dof`` degrees of freedom"""
+    if dof <= len(T_TABLE[0.95]):
+        for level, values in T_TABLE.items():
+            if abs(confidence - level) < 1e-9:
+                return values[dof - 1]
+        raise ValueError(f"with {dof + 1} replicas or fewer, confidence must be one of "
+                         f"{', '.join(map(str, T_TABLE))}")
+    return _t_quantile((1 + confidence) / 2, dof)
+
+
+def summarize(samples, confidence=0.95):
+    """Mean and confidence interval of every metric column in ``samples``"""
+    count = len(samples)
+    means = samples.mean(axis=0)
+    if count > 1:
+        stds = samples.std(axis=0, ddof=1)
+        half_widths = t_critical(confidence, count - 1) * stds / np.sqrt(count)
+    else:
+        stds = np.full(len(METRICS), np.nan)
+        half_widths = np.full(len(METRICS), np.nan)
+
+    return {
+        metric: {
+            'mean': float(means[k]),
+            'std': float(stds[k]),
+            'half_width': float(half_widths[k]),
+            'ci_low': float(means[k] - half_widths[k]),
+            'ci_high': float(means[k] + half_widths[k])
+        } for k, metric in enumerate(METRICS)
+    }
+
+
+def run_replicas(num_replicas, num_processes, algorithm, quantum, seed=None,
+                 workers=1, confidence=0.95, **workload_options):
+    """Simulate ``num_replicas`` independent random workloads and summarize them
+
+    ``workload_options`` are passed to ``generate_workload``. Each replica
+    gets its own child seed of ``seed``, so results do not depend on how the
+    replicas are split across ``workers``.
+    """
+    if num_replicas < 1 or num_processes < 1:
+        raise ValueError("num_replicas and num_processes must be at least 1")
+    if num_replicas > 1:
+        # Reject an unsupported confidence level before simulating anything
+        t_critical(confidence, num_replicas - 1)
+
+    seeds = np.random.SeedSequence(seed).spawn(num_replicas)
+
+    if algorithm == "FCFS":
+        samples = _fcfs_batch(seeds, num_processes, workload_options)
+    elif workers <= 1:
+        samples = _simulate_chunk(seeds, num_processes, algorithm, quantum, workload_options)
+    else:
+        chunks = [list(chunk) for chunk in np.array_split(np.array(seeds, dtype=object), workers * 4)
+                  if len(chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(_simulate_chunk, chunks,
+                             [num_processes] * len(chunks), [algorithm] * len(chunks),
+                             [quantum] * len(chunks), [workload_options] * len(chunks))
+            samples = np.concatenate(list(parts))
+
+    return {
+        'algorithm': algorithm,
+        'quantum': quantum,
+        'replicas': num_replicas,
+        'processes': num_processes,
+        'confidence': confidence,
+        'metrics': summarize(samples, confidence),
+        'samples': samples
+    }
@@ -0,0 +1,314 @@
+"""Headless batch rendering of scheduling reports.
+
+Renders the Gantt chart, the performance graphs and the statistics summary
+of many result sets without a display, using the Agg backend in a pool of
+worker processes. Each report is written to its own directory as image
+files plus a self-contained ``report.html`` (charts embedded, no external
+files), and an ``index.html`` with every report's statistics links them.
+
+A result set is either a directory holding ``context_switch_log.csv`` (and
+optionally ``context_switches.csv``) as written by the GUI, a process table
+CSV file, or a run from a comparison workspace (``--workspace``).
+
+Each worker keeps one figure per chart and clears and redraws it for every
+report instead of building a new figure, canvas and renderer each time.
+
+Examples:
+    python report.py nightly/trace-*/ --output reports
+    python report.py --workspace workspace --formats png,svg,html --workers 8
+"""
+import argparse
+import base64
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import html
+import io
+import os
+import re
+import sys
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np
+import pandas as pd
+
+import charts
+import scheduler
+from workspace import STAT_LABELS, Run, Workspace
+
+FORMATS = ('png', 'svg', 'html')
+CHARTS = (('gantt', 'Gantt Chart', charts.build_gantt_figure),
+          ('performance', 'Performance Graphs', charts.build_performance_figure))
+STAT_FORMATS = {
+    'avg_wait': '{:.2f}',
+    'avg_turnaround': '{:.2f}',
+    'avg_response': '{:.2f}',
+    'cpu_util': '{:.1f}',
+    'throughput': '{:.3f}'
+}
+
+# Figures kept by each worker process and redrawn for every report
+_templates = {}
+
+
+def frame_statistics(process_data, context_switches=None):
+    """The summary statistics of a process table, as shown in the GUI"""
+    n = len(process_data)
+    total_time = int(process_data['Completion Time'].max()) if n else 0
+    total_burst = int(process_data['Burst Time'].sum())
+    return {
+        'total_processes': n,
+        'context_switches': context_switches,
+        'total_time': total_time,
+        'avg_wait': float(process_data['Wait Time'].mean()) if n else 0.0,
+        'avg_turnaround': float(process_data['Turnaround Time'].mean()) if n else 0.0,
+        'avg_response': float(process_data['Response Time'].mean()) if n else 0.0,
+        'cpu_util': total_burst / total_time * 100 if total_time > 0 else 0.0,
+        'throughput': n / total_time if total_time > 0 else 0.0
+    }
+
+
+def format_stat(key, value):
+    if value is None:
+        return '-'
+    return STAT_FORMATS.get(key, '{}').format(value)
+
+
+def _count_rows(path):
+    """Data rows of a CSV file, without parsing it"""
+    with open(path, 'rb') as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+def load_source(source):
+    """The process table and statistics of one result set"""
+    kind, path, name = source
+    if kind == 'workspace':
+        # ``path`` is the run's own directory; opening the whole workspace
+        # would read every run's metadata for each report
+        run = Run(path)
+        columns = {field: np.asarray(run.column(field))
+                   for field in ('pid', 'arrival', 'burst', 'priority', 'wait',
+                                 'turnaround', 'completion', 'response')}
+        if run.has_column('name'):
+            columns['name'] = np.asarray(run.column('name')).astype(object)
+        process_data = scheduler.process_frame({'processes': columns})
+        run.release()
+        return process_data, run.stats
+
+    if os.path.isdir(path):
+        process_path = os.path.join(path, 'context_switch_log.csv')
+        switch_path = os.path.join(path, 'context_switches.csv')
+    else:
+        process_path = path
+        switch_path = os.path.join(os.path.dirname(path), 'context_switches.csv')
+        if os.path.basename(path) != 'context_switch_log.csv':
+            # A loose process table has no switch log of its own
+            switch_path = None
+    process_data = pd.read_csv(process_path)
+    switches = None
+    if switch_path is not None:
+        switches = _count_rows(switch_path) if os.path.exists(switch_path) else 0
+    return process_data, frame_statistics(process_data, switches)
+
+
+def chart_rows(process_data, max_processes):
+    """The processes to chart: all of them, or the first ``max_processes`` by arrival"""
+    if len(process_data) <= max_processes:
+        return process_data
+    return process_data.sort_values('Arrival Time', kind='stable').head(max_processes)
+
+
+def _stats_table(stats):
+    rows = ''.join(f"<tr><th>{html.escape(label)}</th><td>{format_stat(key, stats.get(key))}</td></tr>"
+                   for key, label in STAT_LABELS.items())
+    return f"<table class='stats'>{rows}</table>"
+
+
+STYLE = """
+body { background: #0f172a; color: #e2e8f0; font-family: Arial, sans-serif; margin: 24px; }
+h1 { color: #60a5fa; }
+h2 { color: #94a3b8; }
+table { border-collapse: collapse; margin-bottom: 24px; }
+th, td { border: 1px solid #334155; padding: 6px 12px; text-align: right; }
+th { background: #1e293b; color: #60a5fa; }
+td:first-child, th:first-child { text-align: left; }
+a { color: #60a5fa; }
+.chart img, .chart svg { max-width: 100%; height: auto; }
+.note { color: #94a3b8; }
+"""
+
+
+def report_html(title, stats, images, note=''):
+    """A self-contained HTML report: statistics table plus embedded charts"""
+    sections = []
+    for heading, (fmt, data) in images:
+        if fmt == 'svg':
+            body = data.decode('utf-8')
+            # Inline SVG must not carry its own XML prolog
+            body = body[body.index('<svg'):]
+        else:
+            body = f"<img alt='{html.escape(heading)}' src='data:image/png;base64,{base64.b64encode(data).decode()}'>"
+        sections.append(f"<h2>{html.escape(heading)}</h2><div class='chart'>{body}</div>")
+    note = f"<p class='note'>{html.escape(note)}</p>" if note else ''
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(title)}</title><style>{STYLE}</style></head><body>"
+            f"<h1>{html.escape(title)}</h1>{_stats_table(stats)}{note}{''.join(sections)}"
+            f"</body></html>")
+
+
+def render_report(source, title, out_dir, formats, max_processes, dpi):
+    """Render one result set's charts and report into ``out_dir``; returns its stats"""
+    start = time.perf_counter()
+    process_data, stats = load_source(source)
+    os.makedirs(out_dir, exist_ok=True)
+
+    shown = chart_rows(process_data, max_processes)
+    note = ''
+    if len(shown) < len(process_data):
+        note = f"Charts show the first {len(shown)} of {len(process_data)} processes by arrival."
+
+    images = []
+    if len(shown):
+        for key, heading, build in CHARTS:
+            fig = build(shown, _templates.get(key))
+            _templates[key] = fig
+            rendered = {}
+            for fmt in ('png', 'svg'):
+                if fmt in formats or (fmt == 'png' and 'html' in formats and 'svg' not in formats):
+                    buffer = io.BytesIO()
+                    fig.savefig(buffer, format=fmt, dpi=dpi, facecolor=fig.get_facecolor())
+                    rendered[fmt] = buffer.getvalue()
+                    if fmt in formats:
+                        with open(os.path.join(out_dir, f"{key}.{fmt}"), 'wb') as f:
+                            f.write(rendered[fmt])
+            embed = 'svg' if 'svg' in rendered else 'png'
+            images.append((heading, (embed, rendered[embed])))
+
+    if 'html' in formats:
+        with open(os.path.join(out_dir, 'report.html'), 'w', encoding='utf-8') as f:
+            f.write(report_html(title, stats, images, note))
+    return {'stats': stats, 'seconds': time.perf_counter() - start}
+
+
+def index_html(entries):
+    """The index page linking every report, with their statistics side by side"""
+    header = ''.join(f"<th>{html.escape(label)}</th>" for label in STAT_LABELS.values())
+    rows = []
+    for title, directory, outcome in entries:
+        if 'error' in outcome:
+            cells = f"<td colspan='{len(STAT_LABELS)}'>failed: {html.escape(outcome['error'])}</td>"
+        else:
+            cells = ''.join(f"<td>{format_stat(key, outcome['stats'].get(key))}</td>"
+                            for key in STAT_LABELS)
+        link = f"<a href='{html.escape(directory)}/report.html'>{html.escape(title)}</a>"
+        rows.append(f"<tr><td>{link}</td>{cells}</tr>")
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Scheduling Reports</title>"
+            f"<style>{STYLE}</style></head><body><h1>Scheduling Reports</h1>"
+            f"<table><tr><th>Report</th>{header}</tr>{''.join(rows)}</table></body></html>")
+
+
+def collect_sources(paths, workspace_root=None):
+    """(source, title) pairs for the given paths and every run of the workspace"""
+    sources = []
+    for pattern in paths:
+        for path in sorted(glob.glob(pattern)) or [pattern]:
+            path = path.rstrip('/\\') or path
+            title = os.path.basename(path)
+            if title == 'context_switch_log.csv':
+                title = os.path.basename(os.path.dirname(os.path.abspath(path)))
+            elif not os.path.isdir(path):
+                title = os.path.splitext(title)[0]
+            sources.append((('csv', path, None), title))
+    if workspace_root is not None:
+        workspace = Workspace(workspace_root)
+        for name in workspace.names():
+            sources.append((('workspace', workspace.get(name).path, name), name))
+    return sources
+
+
+def _directory_names(titles):
+    """A distinct directory name for every report title"""
+    used = set()
+    names = []
+    for title in titles:
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', title).strip('_') or 'report'
+        name, k = slug, 2
+        while name in used:
+            name = f"{slug}_{k}"
+            k += 1
+        used.add(name)
+        names.append(name)
+    return names
+
+
+def run_reports(sources, output, formats, workers=None, max_processes=500, dpi=100):
+    """Render every source on a process pool; returns (title, directory, outcome) entries"""
+    os.makedirs(output, exist_ok=True)
+    directories = _directory_names([title for _, title in sources])
+    entries = [None] * len(sources)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(render_report, source, title, os.path.join(output, directory),
+                        formats, max_processes, dpi): k
+            for k, ((source, title), directory) in enumerate(zip(sources, directories))
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            k = futures[future]
+            title = sources[k][1]
+            try:
+                outcome = future.result()
+                print(f"[{done}/{len(sources)}] {title}: {outcome['seconds']:.2f}s")
+            except Exception as e:
+                outcome = {'error': str(e)}
+                print(f"[{done}/{len(sources)}] {title}: FAILED ({e})", file=sys.stderr)
+            entries[k] = (title, directories[k], outcome)
+
+    with open(os.path.join(output, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(index_html(entries))
+    return entries
+
+
+def _csv_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('paths', nargs='*',
+                        help='result directories or process table CSV files (globs allowed)')
+    parser.add_argument('--workspace', default=None,
+                        help='also report every run stored in this comparison workspace')
+    parser.add_argument('--output', default='reports', help='directory to write the reports to')
+    parser.add_argument('--formats', type=_csv_list, default=['png', 'html'],
+                        help=f"comma separated, any of {', '.join(FORMATS)} (default: png,html)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help='rendering processes (default: one per CPU)')
+    parser.add_argument('--max-chart-processes', type=int, default=500,
+                        help='processes drawn per chart; larger traces chart the earliest arrivals')
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args(argv)
+    unknown = set(args.formats) - set(FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    if not args.paths and args.workspace is None:
+        parser.error("give result paths and/or --workspace")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    sources = collect_sources(args.paths, args.workspace)
+    start = time.perf_counter()
+    entries = run_reports(sources, args.output, args.formats, args.workers,
+                          args.max_chart_processes, args.dpi)
+    failed = sum(1 for _, _, outcome in entries if 'error' in outcome)
+    print(f"Rendered {len(entries) - failed} of {len(entries)} reports to {args.output} "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
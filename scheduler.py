@@ -0,0 +1,578 @@
+"""CPU scheduling engine shared by the GUI, the benchmarks and batch tools.
+
+The functions here have no Tk dependency so they can run headless.
+
+Workloads are columnar: a dict of equally long NumPy arrays ``arrival``,
+``burst`` and ``priority`` plus an optional ``name`` column. The GUI's list
+of process dicts is converted by ``as_workload``; generated workloads (see
+``workload.generate_workload``) are used as they are.
+"""
+from array import array
+from bisect import bisect_left
+from collections import deque
+import heapq
+
+import numpy as np
+import pandas as pd
+
+PID_BASE = 1000
+IDLE_PID = -1
+
+PROCESS_COLUMNS = {
+    'pid': 'PID',
+    'name': 'Process Name',
+    'arrival': 'Arrival Time',
+    'burst': 'Burst Time',
+    'completion': 'Completion Time',
+    'turnaround': 'Turnaround Time',
+    'wait': 'Wait Time',
+    'response': 'Response Time',
+    'priority': 'Priority',
+    'state': 'State'
+}
+
+SWITCH_COLUMNS = {
+    'time': 'Time',
+    'from_pid': 'From PID',
+    'from': 'From Process',
+    'to_pid': 'To PID',
+    'to': 'To Process',
+    'reason': 'Reason'
+}
+
+# Why the CPU switched, stored as an index into this tuple:
+#   start      - first dispatch, nothing ran before
+#   completion - the previous process had finished
+#   quantum    - RR moved on when the previous process's time slice ran out
+#   preempt    - PRIORITY preempted the previous process for a more urgent one
+SWITCH_REASONS = ('start', 'completion', 'quantum', 'preempt')
+
+
+def as_workload(processes):
+    """Return the columnar form of a list of process dicts or a workload"""
+    if isinstance(processes, dict):
+        workload = {
+            'arrival': np.asarray(processes['arrival'], dtype=np.int64),
+            'burst': np.asarray(processes['burst'], dtype=np.int64),
+            'priority': np.asarray(processes['priority'])
+        }
+        if processes.get('name') is not None:
+            workload['name'] = np.asarray(processes['name'], dtype=object)
+        return workload
+
+    return {
+        'name': np.array([p['name'] for p in processes], dtype=object),
+        'arrival': np.array([p['arrival'] for p in processes], dtype=np.int64),
+        'burst': np.array([p['burst'] for p in processes], dtype=np.int64),
+        'priority': np.array([p['priority'] for p in processes], dtype=np.int64)
+    }
+
+
+def default_names(indexes):
+    """Names used for processes that were generated without one (P1, P2, ...)"""
+    return ('P' + pd.Series(np.asarray(indexes) + 1).astype(str)).to_numpy(dtype=object)
+
+
+def _snapshot(current_time, completed, next_arrival, current, active, remaining,
+              response, log_time, counters, **extra):
+    """Scheduler state at the top of the loop, before arrivals are admitted
+
+    Only the processes in the ready queue are copied; everything else is
+    recovered from the recorded run's final columns when resuming.
+    """
+    state = {
+        'time': int(current_time),
+        'completed': completed,
+        'next_arrival': next_arrival,
+        'current': int(current),
+        'active': array('q', active),
+        'remaining': array('q', [remaining[i] for i in active]),
+        'response': array('q', [response[i] for i in active]),
+        'log_length': len(log_time),
+        'counters': dict(counters)
+    }
+    state.update(extra)
+    return state
+
+
+def _restore(trace, position, order, burst):
+    """Per-process arrays and the switch log as they were at a recorded checkpoint"""
+    state = trace['checkpoints'][position]
+    active = np.frombuffer(state['active'], dtype=np.int64)
+    remaining = burst.astype(np.int64)
+    remaining[active] = state['remaining']
+    response = trace['response'].copy()
+    # Processes admitted after the checkpoint have not run yet
+    response[order[state['next_arrival']:]] = -1
+    response[active] = state['response']
+    log = tuple(column[:state['log_length']] for column in trace['log'])
+    return (trace['completion'].copy(), response, remaining, log,
+            dict(state['counters']), trace['checkpoints'][:position + 1])
+
+
+def _short_tail(state, n):
+    """Whether a resumed run has so little left that list conversions would dominate"""
+    return (n - state['next_arrival'] + len(state['active'])) * 16 < n
+
+
+def _next_checkpoint(trace, dispatches, queue_length):
+    # Spacing grows with the queue so copying it stays amortized O(1)
+    if trace is None or not trace['checkpoint_every']:
+        return float('inf')
+    return dispatches + max(trace['checkpoint_every'], queue_length)
+
+
+def _round_robin(arrival, burst, quantum, trace=None, resume=None):
+    if quantum < 1:
+        raise ValueError("Time quantum must be at least 1")
+
+    n = len(arrival)
+    order = np.argsort(arrival, kind='stable')
+    short_tail = False
+
+    if resume is None:
+        remaining = burst.tolist()
+        admitted = [0] * n
+        completion = [0] * n
+        response = [-1] * n
+        log_time, log_from, log_to = array('q'), array('q'), array('q')
+        # idle_time is in time units: each idle jump adds the gap it skips
+        counters = {'dispatches': 0, 'queue_ops': 0, 'idle_time': 0}
+        checkpoints = []
+        queue = deque()
+        current_time = 0
+        completed = 0
+        next_arrival = 0
+        current = IDLE_PID
+        next_checkpoint = 0 if trace is not None and trace['checkpoint_every'] else float('inf')
+    else:
+        base, position = resume
+        state = base['checkpoints'][position]
+        completion, response, remaining, log, counters, checkpoints = _restore(base, position, order, burst)
+        log_time, log_from, log_to = log
+        # Processes admitted before the checkpoint kept their admission time
+        admitted = base['admitted'].copy()
+        queue = deque(state['active'])
+        current_time = state['time']
+        completed = state['completed']
+        next_arrival = state['next_arrival']
+        current = state['current']
+        next_checkpoint = _next_checkpoint(trace, counters['dispatches'], len(queue))
+        short_tail = _short_tail(state, n)
+        if not short_tail:
+            completion, response, remaining, admitted = (
+                column.tolist() for column in (completion, response, remaining, admitted))
+
+    if short_tail:
+        # Element access on NumPy arrays is slower, but only a few
+        # dispatches are left and the O(n) list conversions are skipped
+        sorted_arrival = arrival[order]
+        arrival_list = arrival
+    else:
+        sorted_arrival = arrival[order].tolist()
+        arrival_list = arrival.tolist()
+        order = order.tolist()
+
+    while completed < n:
+        if counters['dispatches'] >= next_checkpoint:
+            checkpoints.append(_snapshot(current_time, completed, next_arrival, current, queue,
+                                         remaining, response, log_time, counters))
+            next_checkpoint = _next_checkpoint(trace, counters['dispatches'], len(queue))
+
+        # Admit arrived processes in input order, like a scan over the table
+        if next_arrival < n and sorted_arrival[next_arrival] <= current_time:
+            end = next_arrival
+            while end < n and sorted_arrival[end] <= current_time:
+                end += 1
+            batch = order[next_arrival:end]
+            batch.sort()
+            for i in batch:
+                admitted[i] = current_time
+            queue.extend(batch)
+            counters['queue_ops'] += len(batch)
+            next_arrival = end
+
+        if not queue:
+            # CPU idle: jump straight to the next arrival
+            counters['idle_time'] += sorted_arrival[next_arrival] - current_time
+            current_time = sorted_arrival[next_arrival]
+            continue
+
+        i = queue.popleft()
+        counters['queue_ops'] += 1
+        counters['dispatches'] += 1
+
+        if i != current:
+            log_time.append(current_time)
+            log_from.append(current)
+            log_to.append(i)
+            current = i
+
+        if response[i] == -1:
+            response[i] = current_time - arrival_list[i]
+
+        exec_time = min(quantum, remaining[i])
+        remaining[i] -= exec_time
+        current_time += exec_time
+
+        if remaining[i] == 0:
+            completion[i] = current_time
+            completed += 1
+        else:
+            queue.append(i)
+            counters['queue_ops'] += 1
+
+    completion = np.array(completion, dtype=np.int64)
+    response = np.array(response, dtype=np.int64)
+    admitted = np.array(admitted, dtype=np.int64)
+    if trace is not None:
+        trace.update(completion=completion, response=response, admitted=admitted,
+                     log=(log_time, log_from, log_to), checkpoints=checkpoints)
+    # A queued process waits for every slice it does not run in between
+    # admission and completion, and the CPU is never idle in that window
+    wait = completion - admitted - burst
+    return (completion, wait, response, None,
+            (log_time, log_from, log_to), counters, current_time)
+
+
+def _fcfs(arrival, burst):
+    n = len(arrival)
+    order = None
+    run_order = np.arange(n, dtype=np.int64)
+    if n > 1 and (arrival[1:] < arrival[:-1]).any():
+        order = run_order = np.argsort(arrival, kind='stable')
+        arrival, burst = arrival[order], burst[order]
+
+    # Process k starts once the CPU is free and it has arrived:
+    #   start_k = B_k + max(0, max_{j<=k}(arrival_j - B_j))
+    # where B_k is the total burst of the processes ahead of it
+    busy_before = np.cumsum(burst) - burst
+    slack = np.maximum.accumulate(arrival - busy_before) if n else busy_before
+    np.maximum(slack, 0, out=slack)
+    start = busy_before + slack
+    completion = start + burst
+    wait = start - arrival
+
+    total_time = int(completion[-1]) if n else 0
+    log_from = np.empty(n, dtype=np.int64)
+    log_from[:1] = IDLE_PID
+    log_from[1:] = run_order[:-1]
+    counters = {
+        'dispatches': n,
+        'queue_ops': 0,
+        'idle_time': total_time - int(burst.sum())
+    }
+    # Per-process columns are already in run order
+    return (completion, wait, wait, order, (start, log_from, run_order), counters, total_time)
+
+
+def _priority(arrival, burst, priority, trace=None, resume=None):
+    n = len(arrival)
+    order = np.argsort(arrival, kind='stable')
+    short_tail = False
+
+    if resume is None:
+        remaining = burst.tolist()
+        completion = [0] * n
+        response = [-1] * n
+        late_wait = np.zeros(n, dtype=np.int64)
+        log_time, log_from, log_to = array('q'), array('q'), array('q')
+        counters = {'dispatches': 0, 'queue_ops': 0, 'idle_time': 0}
+        checkpoints = []
+        ready = []
+        current_time = 0
+        completed = 0
+        next_arrival = 0
+        current = IDLE_PID
+        busy = False
+        next_checkpoint = 0 if trace is not None and trace['checkpoint_every'] else float('inf')
+    else:
+        base, position = resume
+        state = base['checkpoints'][position]
+        completion, response, remaining, log, counters, checkpoints = _restore(base, position, order, burst)
+        log_time, log_from, log_to = log
+        late_wait = base['late_wait'].copy()
+        late_wait[order[state['next_arrival']:]] = 0
+        current_time = state['time']
+        completed = state['completed']
+        next_arrival = state['next_arrival']
+        current = state['current']
+        busy = state['busy']
+        next_checkpoint = _next_checkpoint(trace, counters['dispatches'], len(state['active']))
+        short_tail = _short_tail(state, n)
+        if not short_tail:
+            completion, response, remaining = (
+                column.tolist() for column in (completion, response, remaining))
+
+    if short_tail:
+        sorted_arrival = arrival[order]
+        arrival_list = arrival
+        priority_list = priority
+    else:
+        sorted_arrival = arrival[order].tolist()
+        arrival_list = arrival.tolist()
+        priority_list = priority.tolist()
+        order = order.tolist()
+    if resume is not None:
+        # Copying the heap list keeps its layout, so pops come out the same
+        ready = [(priority_list[i], i) for i in state['active']]
+
+    while completed < n:
+        if counters['dispatches'] >= next_checkpoint:
+            checkpoints.append(_snapshot(current_time, completed, next_arrival, current,
+                                         [entry[1] for entry in ready], remaining, response,
+                                         log_time, counters, busy=busy))
+            next_checkpoint = _next_checkpoint(trace, counters['dispatches'], len(ready))
+
+        while next_arrival < n and sorted_arrival[next_arrival] <= current_time:
+            i = order[next_arrival]
+            heapq.heappush(ready, (priority_list[i], i))
+            counters['queue_ops'] += 1
+            # Wait is charged after each tick to every process that has
+            # arrived by the end of it, so a process arriving right after a
+            # busy tick is charged for that tick too
+            if busy:
+                late_wait[i] = 1
+            next_arrival += 1
+
+        if not ready:
+            counters['idle_time'] += sorted_arrival[next_arrival] - current_time
+            current_time = sorted_arrival[next_arrival]
+            busy = False
+            continue
+
+        # Lowest priority value wins, ties go to the earliest process in the
+        # table; the choice can only change when something arrives
+        i = ready[0][1]
+        counters['dispatches'] += 1
+
+        if i != current:
+            log_time.append(current_time)
+            log_from.append(current)
+            log_to.append(i)
+            current = i
+
+        if response[i] == -1:
+            response[i] = current_time - arrival_list[i]
+
+        exec_time = remaining[i]
+        if next_arrival < n:
+            exec_time = min(exec_time, sorted_arrival[next_arrival] - current_time)
+        remaining[i] -= exec_time
+        current_time += exec_time
+        if exec_time:
+            busy = True
+
+        if remaining[i] == 0:
+            heapq.heappop(ready)
+            counters['queue_ops'] += 1
+            completion[i] = current_time
+            completed += 1
+
+    completion = np.array(completion, dtype=np.int64)
+    response = np.array(response, dtype=np.int64)
+    if trace is not None:
+        trace.update(completion=completion, response=response, late_wait=late_wait,
+                     log=(log_time, log_from, log_to), checkpoints=checkpoints)
+    wait = completion - arrival - burst + late_wait
+    return (completion, wait, response, None,
+            (log_time, log_from, log_to), counters, current_time)
+
+
+def _run_engine(workload, algorithm, quantum, trace=None, resume=None):
+    arrival = workload['arrival']
+    burst = workload['burst']
+
+    if algorithm == "RR":
+        return _round_robin(arrival, burst, quantum, trace, resume)
+    if algorithm == "FCFS":
+        return _fcfs(arrival, burst)
+    if algorithm == "PRIORITY":
+        return _priority(arrival, burst, workload['priority'], trace, resume)
+    raise ValueError(f"Unknown scheduling algorithm: {algorithm}")
+
+
+def _switch_reasons(algorithm, proc_columns, log_time, log_from):
+    # The process switched away from was the last one running, so it either
+    # finished by then or was still runnable and got preempted
+    finished_at = np.empty(len(proc_columns['pid']), dtype=np.int64)
+    finished_at[proc_columns['pid'] - PID_BASE] = proc_columns['completion']
+    preempted = SWITCH_REASONS.index('quantum' if algorithm == "RR" else 'preempt')
+    reason = np.full(len(log_time), preempted, dtype=np.int8)
+    started = log_from < 0
+    finished = ~started
+    finished[finished] = finished_at[log_from[finished]] <= log_time[finished]
+    reason[finished] = SWITCH_REASONS.index('completion')
+    reason[started] = SWITCH_REASONS.index('start')
+    return reason
+
+
+def _build_result(workload, algorithm, outcome):
+    completion, wait, response, order, log, counters, total_time = outcome
+
+    proc_columns = {
+        'pid': PID_BASE + np.arange(len(workload['arrival']), dtype=np.int64),
+        'arrival': workload['arrival'],
+        'burst': workload['burst'],
+        'priority': workload['priority']
+    }
+    if 'name' in workload:
+        proc_columns['name'] = workload['name']
+    if order is not None:
+        # FCFS reports processes in the order they ran; its engine already
+        # returns the computed columns in that order
+        proc_columns = {key: column[order] for key, column in proc_columns.items()}
+    proc_columns.update({
+        'wait': wait,
+        'turnaround': completion - proc_columns['arrival'],
+        'completion': completion,
+        'response': response
+    })
+
+    log_time, log_from, log_to = (np.asarray(column, dtype=np.int64) for column in log)
+    switches = {
+        'time': log_time,
+        'from_pid': np.where(log_from >= 0, log_from + PID_BASE, IDLE_PID),
+        'to_pid': np.where(log_to >= 0, log_to + PID_BASE, IDLE_PID),
+        'reason': _switch_reasons(algorithm, proc_columns, log_time, log_from)
+    }
+    counters = {key: int(value) for key, value in counters.items()}
+    counters['context_switches'] = len(log_time)
+
+    return {
+        'processes': proc_columns,
+        'switches': switches,
+        'context_switches': len(log_time),
+        'total_time': int(total_time),
+        'algorithm': algorithm,
+        'counters': counters
+    }
+
+
+def simulate_scheduling(processes, algorithm, quantum):
+    """Simulate CPU scheduling
+
+    ``processes`` is a list of process dicts or a columnar workload. The
+    per-process results and the switch log come back as NumPy columns.
+    """
+    workload = as_workload(processes)
+    return _build_result(workload, algorithm, _run_engine(workload, algorithm, quantum))
+
+
+class IncrementalSimulation:
+    """A simulation that re-runs only what a workload edit can change
+
+    RR and PRIORITY runs record a checkpoint of the scheduler state every
+    ``checkpoint_every`` dispatches. Nothing that happens before a process
+    arrives depends on its burst or priority, so after an edit ``update``
+    resumes from the latest checkpoint taken before the earliest edited
+    arrival (old or new) and gives exactly the result of a full re-run.
+    FCFS is computed in closed form and is always re-run in full.
+    """
+
+    def __init__(self, processes, algorithm, quantum, checkpoint_every=4096):
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.checkpoint_every = checkpoint_every
+        self.resumed_at = None
+        self._run(as_workload(processes))
+
+    def _run(self, workload, position=None):
+        trace = {'checkpoint_every': self.checkpoint_every}
+        resume = (self.trace, position) if position is not None else None
+        outcome = _run_engine(workload, self.algorithm, self.quantum, trace, resume)
+        # Keep a private copy so callers can edit their arrays in place
+        self.workload = {key: column.copy() for key, column in workload.items()}
+        self.trace = trace
+        self.result = _build_result(workload, self.algorithm, outcome)
+        return self.result
+
+    @property
+    def checkpoints(self):
+        return self.trace.get('checkpoints', [])
+
+    def update(self, processes):
+        """Simulate an edited copy of the workload and return its result"""
+        workload = as_workload(processes)
+        old = self.workload
+        self.resumed_at = None
+        if self.algorithm == "FCFS" or len(workload['arrival']) != len(old['arrival']):
+            return self._run(workload)
+
+        edited = ((workload['arrival'] != old['arrival'])
+                  | (workload['burst'] != old['burst'])
+                  | (workload['priority'] != old['priority']))
+        if not edited.any():
+            # Only names (or nothing) changed
+            self.workload = {key: column.copy() for key, column in workload.items()}
+            self.result = dict(self.result, processes=dict(self.result['processes']))
+            if 'name' in workload:
+                self.result['processes']['name'] = workload['name']
+            return self.result
+
+        # The checkpoint must come before every edited process has arrived,
+        # both at its old and at its new arrival time
+        horizon = min(workload['arrival'][edited].min(), old['arrival'][edited].min())
+        times = [state['time'] for state in self.checkpoints]
+        position = bisect_left(times, horizon) - 1
+        if position < 0:
+            return self._run(workload)
+        self.resumed_at = times[position]
+        return self._run(workload, position)
+
+
+def process_names(result, pids):
+    """Look up process names for ``pids`` (IDLE for -1)"""
+    pids = np.asarray(pids)
+    columns = result['processes']
+    index = np.where(pids >= 0, pids - PID_BASE, 0)
+
+    if 'name' in columns:
+        by_index = np.empty(len(columns['pid']), dtype=object)
+        by_index[columns['pid'] - PID_BASE] = columns['name']
+        names = by_index[index] if len(by_index) else np.array([], dtype=object)
+    else:
+        names = default_names(index)
+    return np.where(pids >= 0, names, 'IDLE')
+
+
+def process_frame(result):
+    """Build the process table DataFrame from a simulation result"""
+    columns = dict(result['processes'])
+    if 'name' not in columns:
+        columns['name'] = default_names(columns['pid'] - PID_BASE)
+    if 'state' not in columns:
+        # Every simulation runs to completion
+        columns['state'] = 'COMPLETED'
+    return pd.DataFrame({title: columns[key] for key, title in PROCESS_COLUMNS.items()})
+
+
+def switch_frame(result):
+    """Build the context switch DataFrame from a simulation result"""
+    switches = result['switches']
+    return pd.DataFrame({
+        SWITCH_COLUMNS['time']: switches['time'],
+        SWITCH_COLUMNS['from_pid']: switches['from_pid'],
+        SWITCH_COLUMNS['from']: process_names(result, switches['from_pid']),
+        SWITCH_COLUMNS['to_pid']: switches['to_pid'],
+        SWITCH_COLUMNS['to']: process_names(result, switches['to_pid']),
+        SWITCH_COLUMNS['reason']: np.array(SWITCH_REASONS, dtype=object)[switches['reason']]
+    })
+
+
+def save_simulation_results(result, process_path='context_switch_log.csv',
+                            switch_path='context_switches.csv',
+                            rates_path='context_switch_rates.csv', switch_log=None):
+    """Save results to CSV files, with per-bucket switch rates
+
+    ``switch_log`` is the run's ``SwitchLog`` if one was already built for it.
+    """
+    process_frame(result).to_csv(process_path, index=False)
+
+    if result['context_switches']:
+        switch_frame(result).to_csv(switch_path, index=False)
+        if switch_log is None:
+            # switchlog builds on this module, so it can only be imported here
+            from switchlog import SwitchLog
+            switch_log = SwitchLog.from_result(result)
+        switch_log.rates().to_csv(rates_path, index=False)
@@ -0,0 +1,344 @@
+"""Local HTTP/JSON simulation service.
+
+Runs ``scheduler.simulate_scheduling`` for other tools over plain HTTP on
+localhost, using only asyncio and the standard library.
+
+Endpoints:
+    GET  /health    - service status and load
+    POST /simulate  - run one simulation
+
+``/simulate`` takes a JSON object with ``algorithm``, ``quantum`` and one of
+
+    "processes": [{"name": "P1", "arrival": 0, "burst": 5, "priority": 2}, ...]
+    "workload":  {"arrival": [...], "burst": [...], "priority": [...], "name": [...]}
+    "generate":  {"num_processes": 1000, "seed": 1, ...generate_workload options}
+
+and streams the result back with chunked transfer encoding as JSON lines: a
+summary line, ``processes`` lines and ``switches`` lines of at most
+``--chunk-rows`` rows each (as column arrays), then ``{"done": true}``.
+Switch reasons are indexes into ``scheduler.SWITCH_REASONS``. Workers encode
+the lines themselves and send back bytes, so the event loop only writes them
+out and a large result never holds up other connections.
+
+Simulations run on a bounded process pool. Identical requests that arrive
+while one is already running share its result instead of running again, and
+requests beyond ``--max-pending`` are turned away with 503. Workers are
+spawned rather than forked, so they never inherit the listening socket or
+open client connections.
+
+Examples:
+    python service.py --port 8765 --workers 4
+    curl -s localhost:8765/simulate -d '{"algorithm": "RR", "quantum": 2,
+        "generate": {"num_processes": 100000, "seed": 1}}'
+"""
+import argparse
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+import scheduler
+from workload import generate_workload
+
+ALGORITHMS = ("RR", "FCFS", "PRIORITY")
+
+REASONS = {
+    200: 'OK',
+    400: 'Bad Request',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    413: 'Payload Too Large',
+    500: 'Internal Server Error',
+    503: 'Service Unavailable'
+}
+
+
+class RequestError(Exception):
+    """A request the service rejects, with the HTTP status to answer with"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _column(values, field, minimum):
+    column = np.asarray(values)
+    if column.ndim != 1 or (len(column) and not np.issubdtype(column.dtype, np.integer)):
+        raise ValueError(f"'{field}' must be a list of integers")
+    column = column.astype(np.int64)
+    if len(column) and column.min() < minimum:
+        raise ValueError(f"'{field}' values must be at least {minimum}")
+    return column
+
+
+def build_workload(spec, max_processes):
+    """Turn the workload part of a request into a columnar workload"""
+    if 'generate' in spec:
+        if not isinstance(spec['generate'], dict):
+            raise ValueError("'generate' must be an object of generate_workload options")
+        options = dict(spec['generate'])
+        num_processes = options.pop('num_processes', None)
+        if not isinstance(num_processes, int) or not 1 <= num_processes <= max_processes:
+            raise ValueError(f"'num_processes' must be an integer from 1 to {max_processes}")
+        try:
+            return generate_workload(num_processes, **options)
+        except TypeError as e:
+            raise ValueError(str(e))
+
+    if 'processes' in spec:
+        rows = spec['processes']
+        try:
+            columns = {field: [row[field] for row in rows] for field in ('arrival', 'burst')}
+            columns['priority'] = [row.get('priority', 1) for row in rows]
+            if all('name' in row for row in rows):
+                columns['name'] = [str(row['name']) for row in rows]
+        except (KeyError, TypeError, AttributeError):
+            raise ValueError("every process needs integer 'arrival' and 'burst' fields")
+    elif 'workload' in spec:
+        columns = spec['workload']
+        if not isinstance(columns, dict) or 'arrival' not in columns or 'burst' not in columns:
+            raise ValueError("'workload' needs 'arrival' and 'burst' columns")
+    else:
+        raise ValueError("request needs one of 'processes', 'workload' or 'generate'")
+
+    workload = {
+        'arrival': _column(columns['arrival'], 'arrival', 0),
+        'burst': _column(columns['burst'], 'burst', 1)
+    }
+    n = len(workload['arrival'])
+    if not 1 <= n <= max_processes:
+        raise ValueError(f"workload must have from 1 to {max_processes} processes")
+    priority = columns.get('priority')
+    workload['priority'] = (_column(priority, 'priority', 0) if priority is not None
+                            else np.ones(n, dtype=np.int64))
+    if columns.get('name') is not None:
+        workload['name'] = np.asarray([str(name) for name in columns['name']], dtype=object)
+    if any(len(column) != n for column in workload.values()):
+        raise ValueError("workload columns must all have the same length")
+    return workload
+
+
+def encode_result(result, chunk_rows):
+    """Yield a simulation result as the JSON lines streamed to the client"""
+    yield (json.dumps({
+        'algorithm': result['algorithm'],
+        'processes': len(result['processes']['pid']),
+        'context_switches': int(result['context_switches']),
+        'total_time': int(result['total_time']),
+        'counters': {key: int(value) for key, value in result['counters'].items()}
+    }) + '\n').encode()
+    for section in ('processes', 'switches'):
+        columns = result[section]
+        total = len(next(iter(columns.values())))
+        for first in range(0, total, chunk_rows):
+            yield (json.dumps({section: {
+                key: column[first:first + chunk_rows].tolist() for key, column in columns.items()
+            }}) + '\n').encode()
+    yield (json.dumps({'done': True}) + '\n').encode()
+
+
+def run_job(request, max_processes, chunk_rows):
+    """Simulate one request in a worker process and return its encoded lines"""
+    workload = build_workload(request, max_processes)
+    result = scheduler.simulate_scheduling(workload, request['algorithm'], request['quantum'])
+    return list(encode_result(result, chunk_rows))
+
+
+def request_key(request):
+    """Identity of a request for coalescing; equal requests give equal keys"""
+    canonical = json.dumps(request, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SimulationService:
+    """Accepts HTTP requests and runs simulations on a process pool"""
+
+    def __init__(self, workers=None, max_pending=256, max_body=64 << 20,
+                 max_processes=2000000, chunk_rows=10000):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.max_body = max_body
+        self.max_processes = max_processes
+        self.chunk_rows = chunk_rows
+        self.pool = None
+        self.in_flight = {}
+        self.pending = 0
+        self.stats = {'requests': 0, 'simulations': 0, 'coalesced': 0, 'rejected': 0}
+
+    async def start(self, host='127.0.0.1', port=8765):
+        # Forked workers would inherit the server's sockets and keep closed
+        # connections open on the client side
+        self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return await asyncio.start_server(self.handle, host, port, backlog=1024)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def simulate(self, request):
+        """The encoded result lines for ``request``, sharing any identical run in flight"""
+        key = request_key(request)
+        future = self.in_flight.get(key)
+        if future is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(future)
+
+        if self.pending >= self.max_pending:
+            self.stats['rejected'] += 1
+            raise RequestError(503, "Too many simulations pending, retry later")
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.pool, run_job, request,
+                                      self.max_processes, self.chunk_rows)
+        self.in_flight[key] = future
+        self.pending += 1
+        self.stats['simulations'] += 1
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+                self.pending -= 1
+
+    def validate(self, body):
+        try:
+            request = json.loads(body)
+        except (UnicodeDecodeError, ValueError):
+            raise RequestError(400, "Request body must be JSON")
+        if not isinstance(request, dict):
+            raise RequestError(400, "Request body must be a JSON object")
+        if request.get('algorithm') not in ALGORITHMS:
+            raise RequestError(400, f"'algorithm' must be one of {', '.join(ALGORITHMS)}")
+        quantum = request.setdefault('quantum', 2)
+        if not isinstance(quantum, int) or quantum < 1:
+            raise RequestError(400, "'quantum' must be a positive integer")
+        return request
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                method, path, body = await self.read_request(reader)
+                self.stats['requests'] += 1
+                if path == '/health':
+                    if method != 'GET':
+                        raise RequestError(405, "Use GET")
+                    await self.respond(writer, 200, {
+                        'status': 'ok',
+                        'workers': self.workers,
+                        'pending': self.pending,
+                        **self.stats
+                    })
+                elif path == '/simulate':
+                    if method != 'POST':
+                        raise RequestError(405, "Use POST")
+                    request = self.validate(body)
+                    try:
+                        lines = await self.simulate(request)
+                    except ValueError as e:
+                        raise RequestError(400, str(e))
+                    await self.stream(writer, lines)
+                else:
+                    raise RequestError(404, f"No such endpoint: {path}")
+            except RequestError as e:
+                await self.respond(writer, e.status, {'error': str(e)})
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            except Exception as e:
+                await self.respond(writer, 500, {'error': str(e)})
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        request_line = await reader.readline()
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise RequestError(400, "Malformed request line")
+        method, target, _ = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise RequestError(400, "Invalid Content-Length")
+        if length > self.max_body:
+            raise RequestError(413, f"Request body is larger than {self.max_body} bytes")
+        body = await reader.readexactly(length) if length else b''
+        return method, target.split('?', 1)[0], body
+
+    async def respond(self, writer, status, payload):
+        body = json.dumps(payload).encode()
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def stream(self, writer, lines):
+        writer.write(b"HTTP/1.1 200 OK\r\n"
+                     b"Content-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\n"
+                     b"Connection: close\r\n\r\n")
+        for line in lines:
+            writer.write(b"%x\r\n%s\r\n" % (len(line), line))
+            # Wait for slow clients instead of buffering the whole result
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--workers', type=int, default=None,
+                        help='simulation processes (default: one per CPU)')
+    parser.add_argument('--max-pending', type=int, default=256,
+                        help='distinct simulations queued or running before new ones get 503')
+    parser.add_argument('--max-processes', type=int, default=2000000,
+                        help='largest workload accepted')
+    parser.add_argument('--max-body', type=int, default=64 << 20,
+                        help='largest request body in bytes')
+    parser.add_argument('--chunk-rows', type=int, default=10000,
+                        help='rows per streamed result line')
+    return parser.parse_args(argv)
+
+
+async def serve(args):
+    service = SimulationService(args.workers, args.max_pending, args.max_body,
+                                args.max_processes, args.chunk_rows)
+    server = await service.start(args.host, args.port)
+    print(f"Simulation service on http://{args.host}:{args.port} "
+          f"with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def main(argv=None):
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
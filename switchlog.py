@@ -0,0 +1,211 @@
+"""Indexed, queryable context switch log.
+
+``SwitchLog`` keeps the switch log sorted by time and builds offset indexes
+(CSR style: one sorted position list per key plus an offsets array) by
+outgoing process, incoming process and reason. Time-range, by-process and
+by-reason queries binary-search those lists, so they cost O(log n + k) for
+k matching switches instead of a scan of the whole log.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+import scheduler
+
+ROLES = ('any', 'from', 'to')
+# The engines' switch reasons, plus one for logs loaded without (recognised) reasons
+REASONS = scheduler.SWITCH_REASONS + ('unknown',)
+UNKNOWN = REASONS.index('unknown')
+PREEMPTIONS = (REASONS.index('quantum'), REASONS.index('preempt'))
+
+
+def _offset_index(keys, num_keys, times):
+    """Positions grouped by key, each group in time order, with group offsets"""
+    positions = np.argsort(keys, kind='stable')
+    offsets = np.zeros(num_keys + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=num_keys), out=offsets[1:])
+    return positions, offsets, times[positions]
+
+
+def bucket_width(total_time, buckets=200):
+    """A round bucket width that splits ``total_time`` into about ``buckets`` buckets"""
+    if total_time <= buckets:
+        return 1
+    raw = total_time / buckets
+    magnitude = 10 ** int(math.floor(math.log10(raw)))
+    for step in (1, 2, 5, 10):
+        if raw <= step * magnitude:
+            return step * magnitude
+
+
+class SwitchLog:
+    """A context switch log with time, process and reason indexes
+
+    Processes are identified by small integer ids ``0 .. len(labels) - 1``;
+    ``labels`` holds their display names and id ``len(labels)`` is IDLE.
+    """
+
+    def __init__(self, time, from_id, to_id, reason, labels):
+        order = np.argsort(time, kind='stable')
+        self.time = np.asarray(time, dtype=np.int64)[order]
+        self.from_id = np.asarray(from_id, dtype=np.int64)[order]
+        self.to_id = np.asarray(to_id, dtype=np.int64)[order]
+        self.reason = np.asarray(reason, dtype=np.int8)[order]
+        self.labels = np.append(np.asarray(labels, dtype=object), 'IDLE')
+        self._ids = None
+
+        num_ids = len(self.labels)
+        self._by_from = _offset_index(self.from_id, num_ids, self.time)
+        self._by_to = _offset_index(self.to_id, num_ids, self.time)
+        self._by_reason = _offset_index(self.reason, len(REASONS), self.time)
+
+    @classmethod
+    def from_result(cls, result):
+        """Index the switch log of a simulation result"""
+        switches = result['switches']
+        n = len(result['processes']['pid'])
+        labels = scheduler.process_names(result, scheduler.PID_BASE + np.arange(n))
+
+        def to_ids(pids):
+            return np.where(pids >= 0, pids - scheduler.PID_BASE, n)
+
+        return cls(switches['time'], to_ids(switches['from_pid']), to_ids(switches['to_pid']),
+                   switches['reason'], labels)
+
+    @classmethod
+    def from_frame(cls, switch_data, process_data=None):
+        """Index a switch DataFrame as saved to CSV
+
+        Processes are keyed by PID, like ``from_result``, with names taken
+        from ``process_data`` when it is given. Logs saved without PID
+        columns only have names to go by, so same-named processes merge.
+        """
+        columns = scheduler.SWITCH_COLUMNS
+        if columns['reason'] in switch_data:
+            reason = switch_data[columns['reason']].map(
+                {name: k for k, name in enumerate(scheduler.SWITCH_REASONS)}).fillna(UNKNOWN)
+        else:
+            # Logs saved before reasons were recorded
+            reason = np.full(len(switch_data), UNKNOWN)
+        reason = np.asarray(reason, dtype=np.int8)
+        time = switch_data[columns['time']].to_numpy()
+
+        if columns['from_pid'] in switch_data and columns['to_pid'] in switch_data:
+            from_pid = switch_data[columns['from_pid']].to_numpy(dtype=np.int64)
+            to_pid = switch_data[columns['to_pid']].to_numpy(dtype=np.int64)
+            if process_data is not None:
+                pids = process_data['PID'].to_numpy(dtype=np.int64)
+                names = process_data['Process Name'].to_numpy(dtype=object)
+            else:
+                pids = np.concatenate([from_pid, to_pid])
+                names = np.concatenate([switch_data[columns['from']].to_numpy(dtype=object),
+                                        switch_data[columns['to']].to_numpy(dtype=object)])
+            pids, first = np.unique(pids, return_index=True)
+            running = pids >= 0
+            pids, labels = pids[running], names[first[running]]
+
+            def to_ids(values):
+                return np.where(values >= 0, np.searchsorted(pids, values), len(pids))
+
+            return cls(time, to_ids(from_pid), to_ids(to_pid), reason, labels)
+
+        names = pd.concat([switch_data[columns['from']], switch_data[columns['to']]])
+        labels = pd.unique(names[names != 'IDLE'])
+        ids = {label: k for k, label in enumerate(labels)}
+        ids['IDLE'] = len(labels)
+        return cls(time, switch_data[columns['from']].map(ids).to_numpy(),
+                   switch_data[columns['to']].map(ids).to_numpy(), reason, labels)
+
+    def process_ids(self, name):
+        """Ids of the processes called ``name``; several can share a name"""
+        if self._ids is None:
+            # Built on the first by-process query rather than up front
+            self._ids = {}
+            for k, label in enumerate(self.labels):
+                self._ids.setdefault(label, []).append(k)
+        return self._ids.get(name, [])
+
+    def __len__(self):
+        return len(self.time)
+
+    def _window(self, times, start, end):
+        lo = 0 if start is None else int(np.searchsorted(times, start, side='left'))
+        hi = len(times) if end is None else int(np.searchsorted(times, end, side='right'))
+        return lo, hi
+
+    def _lookup(self, index, key, start, end):
+        positions, offsets, times = index
+        first, last = offsets[key], offsets[key + 1]
+        lo, hi = self._window(times[first:last], start, end)
+        return positions[first + lo:first + hi]
+
+    def query(self, start=None, end=None, process=None, role='any', reason=None):
+        """Positions of the switches matching every given filter, in time order
+
+        ``start`` and ``end`` are inclusive times, ``process`` a process
+        name, ``role`` whether it is the process switched from, to, or
+        either, and ``reason`` one of ``REASONS``.
+        """
+        if role not in ROLES:
+            raise ValueError(f"role must be one of {', '.join(ROLES)}")
+
+        if process is not None:
+            parts = []
+            for key in self.process_ids(process):
+                if role in ('any', 'from'):
+                    parts.append(self._lookup(self._by_from, key, start, end))
+                if role in ('any', 'to'):
+                    parts.append(self._lookup(self._by_to, key, start, end))
+            if not parts:
+                return np.empty(0, dtype=np.int64)
+            matches = parts[0] if len(parts) == 1 else np.unique(np.concatenate(parts))
+            if reason is not None:
+                matches = matches[self.reason[matches] == REASONS.index(reason)]
+            return matches
+
+        if reason is not None:
+            return self._lookup(self._by_reason, REASONS.index(reason), start, end)
+
+        lo, hi = self._window(self.time, start, end)
+        return np.arange(lo, hi)
+
+    def frame(self, positions):
+        """The switches at ``positions`` as a DataFrame like ``switch_frame``"""
+        columns = scheduler.SWITCH_COLUMNS
+        return pd.DataFrame({
+            columns['time']: self.time[positions],
+            columns['from']: self.labels[self.from_id[positions]],
+            columns['to']: self.labels[self.to_id[positions]],
+            columns['reason']: np.array(REASONS, dtype=object)[self.reason[positions]]
+        })
+
+    def preempted_by(self, process, start=None, end=None):
+        """Names of the processes that took the CPU from ``process`` while it was still runnable"""
+        matches = self.query(start, end, process, role='from')
+        matches = matches[np.isin(self.reason[matches], PREEMPTIONS)]
+        return pd.unique(self.labels[self.to_id[matches]])
+
+    def rates(self, width=None):
+        """Switch counts per time bucket, overall and by reason
+
+        Each bucket is two binary searches per index, so any width is cheap.
+        An ``Unknown`` column is only added when some switches have no reason.
+        """
+        end = int(self.time[-1]) + 1 if len(self.time) else 1
+        if width is None:
+            width = bucket_width(end)
+        edges = np.arange(0, end + width, width, dtype=np.int64)
+        table = {
+            'Bucket Start': edges[:-1],
+            'Switches': np.diff(np.searchsorted(self.time, edges, side='left'))
+        }
+        positions, offsets, times = self._by_reason
+        for k, name in enumerate(REASONS):
+            if k == UNKNOWN and offsets[k] == offsets[k + 1]:
+                continue
+            group = times[offsets[k]:offsets[k + 1]]
+            table[name.capitalize()] = np.diff(np.searchsorted(group, edges, side='left'))
+        frame = pd.DataFrame(table)
+        frame['Rate'] = frame['Switches'] / width
+        return frame
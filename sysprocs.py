@@ -0,0 +1,126 @@
+"""Background enumeration of the running system processes.
+
+``ProcessScanner`` walks ``psutil.process_iter`` on a worker thread and
+posts what it finds to a queue that the Tk dialog polls, so the window opens
+at once and fills in as processes are found. The first ``cpu_percent``
+call on a process only starts its measurement, so after a short interval a
+second pass reads real CPU percentages for the same processes. A finished
+scan is cached for ``CACHE_TTL`` seconds and replayed instead of walking
+the process table again.
+
+Messages on ``ProcessScanner.messages``:
+    ('rows', [process dicts])   - newly found processes (CPU still 0)
+    ('cpu', {pid: percent})     - CPU percentages from the second pass
+    ('done', None)              - the scan is complete
+"""
+import queue
+import threading
+import time
+
+CACHE_TTL = 10.0
+SAMPLE_INTERVAL = 0.5
+BATCH_SIZE = 200
+
+_cache = {'time': 0.0, 'rows': None}
+_cache_lock = threading.Lock()
+
+
+def _cached_rows():
+    with _cache_lock:
+        if _cache['rows'] is not None and time.monotonic() - _cache['time'] < CACHE_TTL:
+            return [dict(row) for row in _cache['rows']]
+    return None
+
+
+class ProcessScanner:
+    """Enumerates processes on a daemon thread; read results from ``messages``"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL, use_cache=True):
+        self.interval = interval
+        self.use_cache = use_cache
+        self.messages = queue.Queue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='process-scanner', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Ask the scan to finish early (e.g. the dialog was closed)"""
+        self._stop.set()
+
+    def drain(self, limit=50):
+        """Up to ``limit`` pending messages, without blocking"""
+        found = []
+        try:
+            while len(found) < limit:
+                found.append(self.messages.get_nowait())
+        except queue.Empty:
+            pass
+        return found
+
+    def _run(self):
+        rows = _cached_rows() if self.use_cache else None
+        if rows is not None:
+            self.messages.put(('rows', rows))
+            self.messages.put(('done', None))
+            return
+
+        import psutil
+
+        handles = {}
+        rows = []
+        batch = []
+        for proc in psutil.process_iter(['pid', 'name', 'memory_percent', 'nice']):
+            if self._stop.is_set():
+                return
+            try:
+                info = proc.info
+                if not info['name'] or info['pid'] <= 0:
+                    continue
+                # Starts the CPU measurement; this first reading is always 0
+                proc.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            row = {
+                'pid': info['pid'],
+                'name': info['name'],
+                'cpu': 0.0,
+                'memory': info['memory_percent'] or 0,
+                'priority': info['nice'] if info['nice'] is not None else 0
+            }
+            handles[info['pid']] = proc
+            rows.append(row)
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE:
+                self.messages.put(('rows', [dict(r) for r in batch]))
+                batch = []
+        if batch:
+            self.messages.put(('rows', [dict(r) for r in batch]))
+
+        if self._stop.wait(self.interval):
+            return
+
+        measured = {}
+        cpu = {}
+        for pid, proc in handles.items():
+            if self._stop.is_set():
+                return
+            try:
+                cpu[pid] = measured[pid] = proc.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            if len(cpu) >= BATCH_SIZE:
+                self.messages.put(('cpu', cpu))
+                cpu = {}
+        if cpu:
+            self.messages.put(('cpu', cpu))
+
+        for row in rows:
+            row['cpu'] = measured.get(row['pid'], 0.0)
+        with _cache_lock:
+            _cache['time'] = time.monotonic()
+            _cache['rows'] = rows
+        self.messages.put(('done', None))
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+import continuous
+import scheduler
+from workload import generate_workload
+
+
+@pytest.mark.parametrize('algorithm', continuous.ALGORITHMS)
+def test_unsorted_workload_matches_batch_engine(algorithm):
+    for seed in range(20):
+        rng = np.random.default_rng(seed)
+        workload = generate_workload(200, seed=seed, arrival='bursty', burst='uniform')
+        perm = rng.permutation(200)
+        workload = {key: column[perm] for key, column in workload.items()}
+        result = scheduler.simulate_scheduling(workload, algorithm, 3)
+
+        sim = continuous.ContinuousSimulation(continuous.workload_stream(workload, chunk_size=17),
+                                              algorithm, 3, capacity=1000)
+        while sim.run(max_dispatches=25):
+            pass
+        assert sim.counters['context_switches'] == result['context_switches']
+        assert sim.time == result['total_time']
+        for key in ('wait', 'response', 'turnaround'):
+            done = np.asarray(getattr(sim, '_' + key)[:200])
+            assert np.array_equal(np.sort(done), np.sort(result['processes'][key]))
+
+
+def test_bucket_rings_are_bounded():
+    sim = continuous.ContinuousSimulation(continuous.arrival_stream(1), 'RR', 2, windows=(10, 10 ** 9))
+    assert sim.num_buckets <= continuous.MAX_BUCKETS
+    assert sim.num_buckets * sim.resolution >= 10 ** 9
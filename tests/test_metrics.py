@@ -0,0 +1,139 @@
+import json
+import os
+import subprocess
+
+import numpy as np
+import pytest
+
+from benchmark import build_cpp_backend, make_workload
+from metrics import MetricsExporter, openmetrics, run_metrics
+from profiling import Profiler
+import scheduler
+from timeseries import LoadSeries
+
+
+@pytest.fixture
+def record():
+    workload = make_workload(200, 1)
+    profiler = Profiler()
+    with profiler.span('simulate'):
+        result = scheduler.simulate_scheduling(workload, "RR", 3)
+    return run_metrics(result, profiler, quantum=3)
+
+
+def test_run_metrics_fields(record):
+    workload = make_workload(200, 1)
+    result = scheduler.simulate_scheduling(workload, "RR", 3)
+    assert record['engine'] == 'python'
+    assert record['algorithm'] == 'RR' and record['quantum'] == 3
+    assert record['total_processes'] == 200
+    assert record['context_switches'] == result['context_switches']
+    assert record['events'] == result['counters']['dispatches']
+    assert record['events_per_second'] == pytest.approx(record['events'] / record['simulate_seconds'])
+    assert record['peak_ready_queue'] == LoadSeries.from_result(result).peak_ready
+    assert set(record['phases']) == {'simulate'}
+    assert record['counters']['dispatches'] == record['events']
+    json.dumps(record)
+
+
+def test_run_metrics_without_profiler(record):
+    result = scheduler.simulate_scheduling(make_workload(20, 2), "FCFS", 2)
+    plain = run_metrics(result)
+    assert plain['simulate_seconds'] is None and plain['events_per_second'] is None
+    assert plain['phases'] == {}
+
+
+def test_openmetrics_exposition(record):
+    text = openmetrics([record], {('python', 'RR', 3): 2})
+    lines = text.splitlines()
+    assert lines[-1] == '# EOF' and text.endswith('\n')
+    assert '# TYPE ctxsim_peak_rss_bytes gauge' in lines
+    assert '# UNIT ctxsim_peak_rss_bytes bytes' in lines
+    assert '# UNIT ctxsim_phase_duration_seconds seconds' in lines
+    assert '# TYPE ctxsim_runs counter' in lines
+    assert 'ctxsim_runs_total{engine="python",algorithm="RR",quantum="3"} 2' in lines
+    assert f'ctxsim_events{{engine="python",algorithm="RR",quantum="3"}} {record["events"]}' in lines
+    # Every sample belongs to the family declared above it
+    family = None
+    for line in lines[:-1]:
+        if line.startswith('# TYPE '):
+            family = line.split()[2]
+        elif not line.startswith('#'):
+            assert line.startswith(family)
+
+
+def test_openmetrics_escapes_labels():
+    text = openmetrics([{'engine': 'a"b\\c', 'algorithm': 'FCFS', 'events': 1}])
+    assert 'ctxsim_events{engine="a\\"b\\\\c",algorithm="FCFS"} 1' in text.splitlines()
+
+
+def test_poll_waits_for_complete_lines(tmp_path):
+    path = str(tmp_path / 'cpp.jsonl')
+    exporter = MetricsExporter(watch=[path])
+    assert exporter.records() == []
+
+    first = json.dumps({'engine': 'cpp', 'algorithm': 'FCFS', 'events': 1})
+    second = json.dumps({'engine': 'cpp', 'algorithm': 'PRIORITY', 'events': 2})
+    with open(path, 'w') as f:
+        f.write(first + '\n' + second[:10])
+    assert [r['events'] for r in exporter.records()] == [1]
+
+    with open(path, 'a') as f:
+        f.write(second[10:] + '\nnot json\n')
+    assert sorted(r['events'] for r in exporter.records()) == [1, 2]
+    assert exporter.runs[('cpp', 'PRIORITY', None)] == 1
+
+
+def test_poll_rereads_truncated_file(tmp_path):
+    path = str(tmp_path / 'cpp.jsonl')
+    with open(path, 'w') as f:
+        for events in range(5):
+            f.write(json.dumps({'engine': 'cpp', 'algorithm': 'RR', 'quantum': 2,
+                                'events': events}) + '\n')
+    exporter = MetricsExporter(watch=[path])
+    assert exporter.records()[0]['events'] == 4
+
+    with open(path, 'w') as f:
+        f.write(json.dumps({'engine': 'cpp', 'algorithm': 'RR', 'quantum': 2, 'events': 9}) + '\n')
+    assert exporter.records()[0]['events'] == 9
+    assert exporter.runs[('cpp', 'RR', 2)] == 6
+
+
+def test_record_writes_export_files(tmp_path, record):
+    jsonl, prom = str(tmp_path / 'runs.jsonl'), str(tmp_path / 'runs.prom')
+    exporter = MetricsExporter(jsonl, prom)
+    exporter.record(record)
+    exporter.record(record)
+    with open(jsonl) as f:
+        assert len(f.readlines()) == 2
+    with open(prom) as f:
+        assert 'ctxsim_runs_total{engine="python",algorithm="RR",quantum="3"} 2' in f.read()
+    assert not os.path.exists(prom + '.tmp')
+
+
+@pytest.fixture(scope='module')
+def backend():
+    binary = build_cpp_backend(os.path.join(os.path.dirname(os.path.dirname(
+        os.path.abspath(__file__))), 'backend.cpp'))
+    if binary is None:
+        pytest.skip("no C++ compiler")
+    return binary
+
+
+@pytest.mark.parametrize('algorithm', ["RR", "FCFS", "PRIORITY"])
+def test_engines_count_the_same_events(tmp_path, backend, algorithm):
+    workload = make_workload(3000, 1)
+    path = str(tmp_path / 'workload.csv')
+    np.savetxt(path, np.column_stack([workload['arrival'], workload['burst'], workload['priority']]),
+               fmt='%d', delimiter=',')
+    metrics_path = str(tmp_path / 'metrics.jsonl')
+    subprocess.run([backend, '--bench', algorithm, '2', path, '--metrics', metrics_path],
+                   check=True, capture_output=True)
+    with open(metrics_path) as f:
+        cpp = json.loads(f.readline())
+
+    python = run_metrics(scheduler.simulate_scheduling(workload, algorithm, 2), quantum=2)
+    # C++ RR queues arrivals ahead of the process whose slice just ended, so
+    # the two engines can order an RR run (and its switches) differently
+    for field in ('events', 'peak_ready_queue', 'total_time'):
+        assert cpp[field] == python[field], field
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from replicas import METRICS, _fcfs_batch, _simulate_chunk, run_replicas, summarize, t_critical
+
+# Published two-sided critical values t_{(1+c)/2, dof}
+KNOWN = [
+    (0.95, 1, 12.706), (0.95, 2, 4.303), (0.95, 5, 2.571), (0.95, 10, 2.228),
+    (0.95, 30, 2.042), (0.95, 60, 2.000), (0.95, 120, 1.980),
+    (0.90, 1, 6.314), (0.90, 4, 2.132), (0.90, 40, 1.684),
+    (0.99, 1, 63.657), (0.99, 3, 5.841), (0.99, 20, 2.845), (0.99, 100, 2.626),
+]
+
+
+@pytest.mark.parametrize('confidence, dof, expected', KNOWN)
+def test_t_critical_matches_tables(confidence, dof, expected):
+    assert t_critical(confidence, dof) == pytest.approx(expected, abs=1e-3)
+
+
+def test_two_replica_interval_uses_exact_quantile():
+    samples = np.array([[1.0] * len(METRICS), [3.0] * len(METRICS)])
+    summary = summarize(samples, 0.95)
+    # std = sqrt(2), half width = t(1) * sqrt(2) / sqrt(2)
+    assert summary['avg_wait']['half_width'] == pytest.approx(12.706205, abs=1e-6)
+
+
+def test_unsupported_confidence_with_few_replicas():
+    with pytest.raises(ValueError):
+        t_critical(0.93, 4)
+
+
+def test_fcfs_batch_matches_single_runs():
+    seeds = np.random.SeedSequence(5).spawn(6)
+    options = {'arrival': 'bursty', 'burst': 'pareto'}
+    batch = _fcfs_batch(seeds, 200, options)
+    single = _simulate_chunk(seeds, 200, "FCFS", 2, options)
+    assert np.allclose(batch, single)
+
+
+def test_cpu_utilization_is_summarized():
+    summary = run_replicas(4, 100, "RR", 2, seed=3, arrival='poisson')
+    cpu_util = summary['samples'][:, METRICS.index('cpu_util')]
+    assert ((cpu_util > 0) & (cpu_util <= 100)).all()
+    assert summary['metrics']['cpu_util']['mean'] == pytest.approx(cpu_util.mean())
@@ -0,0 +1,46 @@
+import os
+
+import pandas as pd
+
+import report
+import scheduler
+from workload import generate_workload
+from workspace import Workspace
+
+
+def test_render_report_png_and_html(tmp_path):
+    result = scheduler.simulate_scheduling(generate_workload(30, seed=1), "RR", 2)
+    source_dir = tmp_path / 'trace'
+    source_dir.mkdir()
+    scheduler.save_simulation_results(result, str(source_dir / 'context_switch_log.csv'),
+                                      str(source_dir / 'context_switches.csv'),
+                                      str(source_dir / 'context_switch_rates.csv'))
+
+    out_dir = str(tmp_path / 'out')
+    outcome = report.render_report(('csv', str(source_dir), None), 'trace', out_dir,
+                                   ['png', 'html'], 500, 50)
+    assert outcome['stats']['total_processes'] == 30
+    assert outcome['stats']['context_switches'] == result['context_switches']
+    for name in ('gantt.png', 'performance.png'):
+        with open(os.path.join(out_dir, name), 'rb') as f:
+            assert f.read(8) == b'\x89PNG\r\n\x1a\n'
+    with open(os.path.join(out_dir, 'report.html'), encoding='utf-8') as f:
+        page = f.read()
+    assert page.count('data:image/png;base64,') == 2
+    assert not os.path.exists(os.path.join(out_dir, 'gantt.svg'))
+
+
+def test_workspace_runs_open_their_own_directory(tmp_path):
+    root = str(tmp_path / 'workspace')
+    workspace = Workspace(root)
+    result = scheduler.simulate_scheduling(generate_workload(20, seed=2), "FCFS", 2)
+    workspace.add('FCFS', result)
+    workspace.add('RR', scheduler.simulate_scheduling(generate_workload(20, seed=2), "RR", 2))
+
+    sources = report.collect_sources([], root)
+    assert [(source[1], title) for source, title in sources] == [
+        (workspace.get('FCFS').path, 'FCFS'), (workspace.get('RR').path, 'RR')]
+    process_data, stats = report.load_source(sources[0][0])
+    assert stats == workspace.get('FCFS').stats
+    pd.testing.assert_frame_equal(process_data, scheduler.process_frame(result),
+                                  check_dtype=False)
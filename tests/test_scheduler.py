@@ -0,0 +1,267 @@
+import numpy as np
+import pytest
+
+import scheduler
+from scheduler import IDLE_PID, PID_BASE
+
+
+def random_workload(rng, n, spread, max_burst=6, levels=3):
+    # Small ranges give tied arrivals, idle gaps and unsorted input
+    return {
+        'arrival': rng.integers(0, spread + 1, n).astype(np.int64),
+        'burst': rng.integers(1, max_burst + 1, n).astype(np.int64),
+        'priority': rng.integers(1, levels + 1, n).astype(np.int64)
+    }
+
+
+def reference_fcfs(workload):
+    """The original FCFS loop: run processes in stable arrival order"""
+    order = np.argsort(workload['arrival'], kind='stable')
+    time, completion, wait, log = 0, {}, {}, []
+    current = IDLE_PID
+    for i in order.tolist():
+        arrival = int(workload['arrival'][i])
+        time = max(time, arrival)
+        log.append((time, current, i))
+        current = i
+        wait[i] = time - arrival
+        time += int(workload['burst'][i])
+        completion[i] = time
+    return order, completion, wait, log
+
+
+def reference_round_robin(workload, quantum):
+    """The original RR tick loop, admitting every process that has arrived by now"""
+    arrival, burst = workload['arrival'].tolist(), workload['burst'].tolist()
+    n = len(arrival)
+    remaining, state = list(burst), ['NEW'] * n
+    wait, response, completion = [0] * n, [-1] * n, [0] * n
+    queue, log = [], []
+    time, completed, current = 0, 0, IDLE_PID
+    while completed < n:
+        for i in range(n):
+            if arrival[i] <= time and state[i] == 'NEW':
+                state[i] = 'READY'
+                queue.append(i)
+        if not queue:
+            time += 1
+            continue
+        i = queue.pop(0)
+        if i != current:
+            log.append((time, current, i))
+            current = i
+        if response[i] == -1:
+            response[i] = time - arrival[i]
+        exec_time = min(quantum, remaining[i])
+        remaining[i] -= exec_time
+        time += exec_time
+        for j in range(n):
+            if state[j] == 'READY' and j != i:
+                wait[j] += exec_time
+        if remaining[i] == 0:
+            state[i] = 'COMPLETED'
+            completion[i] = time
+            completed += 1
+        else:
+            queue.append(i)
+    return completion, wait, response, log
+
+
+def reference_priority(workload):
+    """The original preemptive PRIORITY loop, one time unit per step"""
+    arrival, burst = workload['arrival'].tolist(), workload['burst'].tolist()
+    priority = workload['priority'].tolist()
+    n = len(arrival)
+    remaining = list(burst)
+    wait, response, completion = [0] * n, [-1] * n, [0] * n
+    log = []
+    time, completed, current = 0, 0, IDLE_PID
+    while completed < n:
+        ready = [i for i in range(n) if arrival[i] <= time and remaining[i] > 0]
+        if not ready:
+            time += 1
+            continue
+        i = min(ready, key=lambda j: priority[j])
+        if i != current:
+            log.append((time, current, i))
+            current = i
+        if response[i] == -1:
+            response[i] = time - arrival[i]
+        remaining[i] -= 1
+        time += 1
+        for j in range(n):
+            if j != i and arrival[j] <= time and remaining[j] > 0:
+                wait[j] += 1
+        if remaining[i] == 0:
+            completion[i] = time
+            completed += 1
+    return completion, wait, response, log
+
+
+def by_index(result, key):
+    processes = result['processes']
+    return dict(zip((processes['pid'] - PID_BASE).tolist(), processes[key].tolist()))
+
+
+def switch_log(result):
+    switches = result['switches']
+    index = lambda pids: np.where(pids >= 0, pids - PID_BASE, IDLE_PID).tolist()
+    return list(zip(switches['time'].tolist(), index(switches['from_pid']), index(switches['to_pid'])))
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_fcfs_matches_reference_loop(seed):
+    rng = np.random.default_rng(seed)
+    workload = random_workload(rng, int(rng.integers(1, 40)), spread=int(rng.integers(0, 80)))
+    order, completion, wait, log = reference_fcfs(workload)
+
+    result = scheduler.simulate_scheduling(workload, "FCFS", 2)
+    assert (result['processes']['pid'] - PID_BASE).tolist() == order.tolist()
+    assert by_index(result, 'completion') == completion
+    assert by_index(result, 'wait') == wait
+    assert by_index(result, 'response') == wait
+    assert switch_log(result) == log
+    assert result['total_time'] == max(completion.values())
+
+
+def test_fcfs_idle_gap_and_ties():
+    workload = {
+        'arrival': np.array([10, 0, 10, 3], dtype=np.int64),
+        'burst': np.array([2, 2, 1, 1], dtype=np.int64),
+        'priority': np.ones(4, dtype=np.int64)
+    }
+    result = scheduler.simulate_scheduling(workload, "FCFS", 2)
+    # Ties keep table order; the CPU idles from 2 to 3 and from 4 to 10
+    assert (result['processes']['pid'] - PID_BASE).tolist() == [1, 3, 0, 2]
+    assert result['processes']['completion'].tolist() == [2, 4, 12, 13]
+    assert result['processes']['wait'].tolist() == [0, 0, 0, 2]
+    assert result['counters']['idle_time'] == 7
+
+
+def test_empty_workload():
+    empty = {key: np.empty(0, dtype=np.int64) for key in ('arrival', 'burst', 'priority')}
+    for algorithm in ("RR", "FCFS", "PRIORITY"):
+        result = scheduler.simulate_scheduling(empty, algorithm, 2)
+        assert result['context_switches'] == 0
+        assert result['total_time'] == 0
+
+
+@pytest.mark.parametrize('quantum', [1, 2, 5])
+@pytest.mark.parametrize('seed', range(15))
+def test_round_robin_matches_reference_loop(seed, quantum):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 30))
+    workload = random_workload(rng, n, spread=int(rng.integers(0, 4 * n)))
+    completion, wait, response, log = reference_round_robin(workload, quantum)
+
+    result = scheduler.simulate_scheduling(workload, "RR", quantum)
+    assert result['processes']['completion'].tolist() == completion
+    assert result['processes']['wait'].tolist() == wait
+    assert result['processes']['response'].tolist() == response
+    assert switch_log(result) == log
+    assert result['total_time'] == max(completion)
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_priority_matches_reference_loop(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(1, 30))
+    workload = random_workload(rng, n, spread=int(rng.integers(0, 4 * n)), levels=4)
+    completion, wait, response, log = reference_priority(workload)
+
+    result = scheduler.simulate_scheduling(workload, "PRIORITY", 2)
+    assert result['processes']['completion'].tolist() == completion
+    assert result['processes']['wait'].tolist() == wait
+    assert result['processes']['response'].tolist() == response
+    assert switch_log(result) == log
+    assert result['total_time'] == max(completion)
+
+
+def test_round_robin_admits_arrivals_from_inside_a_slice():
+    # P1 arrives at 1, while P0 runs its first slice; it is queued at 2,
+    # behind P0, rather than only if a slice happens to end exactly at 1
+    workload = {
+        'arrival': np.array([0, 1], dtype=np.int64),
+        'burst': np.array([4, 2], dtype=np.int64),
+        'priority': np.ones(2, dtype=np.int64)
+    }
+    result = scheduler.simulate_scheduling(workload, "RR", 2)
+    assert result['processes']['completion'].tolist() == [4, 6]
+    assert result['processes']['wait'].tolist() == [0, 2]
+    assert result['processes']['response'].tolist() == [0, 3]
+    assert switch_log(result) == [(0, IDLE_PID, 0), (4, 0, 1)]
+
+
+def assert_same_result(actual, expected):
+    for key, column in expected['processes'].items():
+        assert np.array_equal(actual['processes'][key], column), key
+    for key, column in expected['switches'].items():
+        assert np.array_equal(actual['switches'][key], column), key
+    assert actual['total_time'] == expected['total_time']
+    assert actual['context_switches'] == expected['context_switches']
+
+
+@pytest.fixture
+def tail_paths(monkeypatch):
+    """Records which way each resumed run went (True for the short-tail path)"""
+    taken = []
+    short_tail = scheduler._short_tail
+
+    def recording(state, n):
+        taken.append(short_tail(state, n))
+        return taken[-1]
+
+    monkeypatch.setattr(scheduler, '_short_tail', recording)
+    return taken
+
+
+@pytest.mark.parametrize('algorithm', ["RR", "PRIORITY"])
+@pytest.mark.parametrize('seed', range(8))
+def test_incremental_update_matches_full_run(algorithm, seed, tail_paths):
+    rng = np.random.default_rng(seed)
+    n = 300
+    workload = random_workload(rng, n, spread=6 * n, levels=5)
+    sim = scheduler.IncrementalSimulation(workload, algorithm, 3, checkpoint_every=8)
+    assert len(sim.checkpoints) > 1
+
+    arrival_order = np.argsort(workload['arrival'], kind='stable')
+    for step in range(12):
+        edited = {key: column.copy() for key, column in workload.items()}
+        # Alternate between edits late in the run and anywhere in it
+        if step % 2:
+            i = int(arrival_order[-1 - int(rng.integers(0, 3))])
+        else:
+            i = int(rng.integers(0, n))
+        column = ('burst', 'arrival', 'priority')[step % 3]
+        if column == 'burst':
+            edited['burst'][i] = rng.integers(1, 12)
+        elif column == 'arrival':
+            edited['arrival'][i] = max(0, edited['arrival'][i] + rng.integers(-20, 21))
+        else:
+            edited['priority'][i] = rng.integers(1, 6)
+
+        result = sim.update(edited)
+        assert_same_result(result, scheduler.simulate_scheduling(edited, algorithm, 3))
+        if sim.resumed_at is not None:
+            assert sim.resumed_at < min(workload['arrival'][i], edited['arrival'][i])
+        workload = edited
+        arrival_order = np.argsort(workload['arrival'], kind='stable')
+
+    assert True in tail_paths and False in tail_paths
+
+
+def test_incremental_update_resumes_from_checkpoint():
+    rng = np.random.default_rng(3)
+    workload = random_workload(rng, 200, spread=600)
+    sim = scheduler.IncrementalSimulation(workload, "RR", 2, checkpoint_every=4)
+    last = int(np.argmax(workload['arrival']))
+    workload['burst'][last] += 5
+    result = sim.update(workload)
+    assert sim.resumed_at is not None and sim.resumed_at > 0
+    assert_same_result(result, scheduler.simulate_scheduling(workload, "RR", 2))
+
+    # Nothing is checkpointed before time 0, so this re-runs in full
+    workload['arrival'][last] = 0
+    result = sim.update(workload)
+    assert sim.resumed_at is None
+    assert_same_result(result, scheduler.simulate_scheduling(workload, "RR", 2))
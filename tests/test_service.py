@@ -0,0 +1,79 @@
+import asyncio
+import json
+import socket
+import threading
+
+import pytest
+
+from service import SimulationService, run_job
+
+
+@pytest.fixture
+def service_port():
+    loop = asyncio.new_event_loop()
+    service = SimulationService(workers=2)
+    server = loop.run_until_complete(service.start('127.0.0.1', 0))
+    port = server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield port
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(5)
+    server.close()
+    loop.run_until_complete(server.wait_closed())
+    service.close()
+    loop.close()
+
+
+def request(port, body):
+    """Send one POST /simulate and read the response until the server closes it"""
+    payload = json.dumps(body).encode()
+    with socket.create_connection(('127.0.0.1', port), timeout=30) as sock:
+        sock.sendall(b"POST /simulate HTTP/1.1\r\nHost: localhost\r\n"
+                     b"Content-Length: %d\r\n\r\n%s" % (len(payload), payload))
+        data = b''
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                return data
+            data += chunk
+
+
+def dechunk(body):
+    lines = b''
+    while True:
+        size, _, rest = body.partition(b'\r\n')
+        size = int(size, 16)
+        if size == 0:
+            return lines
+        lines += rest[:size]
+        body = rest[size + 2:]
+
+
+def test_simulate_response_reaches_eof(service_port):
+    for seed in range(3):
+        data = request(service_port, {'algorithm': 'RR', 'quantum': 2,
+                                      'generate': {'num_processes': 5000, 'seed': seed}})
+        head, _, body = data.partition(b'\r\n\r\n')
+        assert head.startswith(b'HTTP/1.1 200')
+        lines = [json.loads(line) for line in dechunk(body).splitlines()]
+        assert lines[0]['processes'] == 5000
+        assert sum(len(line['processes']['pid']) for line in lines if 'processes' in line
+                   and isinstance(line['processes'], dict)) == 5000
+        assert lines[-1] == {'done': True}
+
+
+def test_generate_must_be_an_object(service_port):
+    data = request(service_port, {'algorithm': 'RR', 'generate': [1, 2]})
+    assert data.startswith(b'HTTP/1.1 400')
+    assert b"'generate' must be an object" in data
+
+
+def test_workers_return_encoded_lines():
+    lines = run_job({'algorithm': 'FCFS', 'quantum': 2,
+                     'generate': {'num_processes': 25, 'seed': 4}}, 100, 10)
+    assert all(isinstance(line, bytes) and line.endswith(b'\n') for line in lines)
+    decoded = [json.loads(line) for line in lines]
+    assert [len(line['processes']['pid']) for line in decoded if 'processes' in line
+            and isinstance(line['processes'], dict)] == [10, 10, 5]
+    assert decoded[-1] == {'done': True}
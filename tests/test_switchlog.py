@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+import scheduler
+from switchlog import SwitchLog
+
+
+def legacy_frame():
+    return pd.DataFrame({'Time': [0, 2, 4, 6],
+                         'From PID': [-1, 1000, 1001, 1000],
+                         'From Process': ['IDLE', 'A', 'B', 'A'],
+                         'To PID': [1000, 1001, 1000, -1],
+                         'To Process': ['A', 'B', 'A', 'IDLE']})
+
+
+def test_log_without_reasons_is_unknown():
+    log = SwitchLog.from_frame(legacy_frame())
+    assert len(log.query(reason='start')) == 0
+    assert len(log.query(reason='unknown')) == 4
+    assert len(log.preempted_by('A')) == 0
+    rates = log.rates()
+    assert rates['Start'].sum() == 0 and rates['Unknown'].sum() == 4
+
+
+def test_unrecognised_reasons_are_unknown():
+    frame = legacy_frame()
+    frame['Reason'] = ['start', 'TIME_QUANTUM', 'quantum', 'completion']
+    log = SwitchLog.from_frame(frame)
+    assert list(log.frame(log.query())['Reason']) == ['start', 'unknown', 'quantum', 'completion']
+
+
+def test_saved_log_keeps_reasons():
+    result = scheduler.simulate_scheduling(
+        [{'name': 'a', 'arrival': 0, 'burst': 5, 'priority': 1},
+         {'name': 'b', 'arrival': 1, 'burst': 3, 'priority': 2}], 'RR', 2)
+    log = SwitchLog.from_frame(scheduler.switch_frame(result))
+    assert 'Unknown' not in log.rates().columns
+    assert list(log.preempted_by('a')) == ['b']
+
+
+def same_named_result():
+    processes = [{'name': name, 'arrival': arrival, 'burst': 4, 'priority': priority}
+                 for name, arrival, priority in [('w', 0, 3), ('w', 1, 1), ('x', 2, 2), ('w', 5, 1)]]
+    return scheduler.simulate_scheduling(processes, 'PRIORITY', 2)
+
+
+def test_saved_log_keys_processes_by_pid(tmp_path):
+    result = same_named_result()
+    live = SwitchLog.from_result(result)
+    paths = [str(tmp_path / name) for name in ('procs.csv', 'switches.csv', 'rates.csv')]
+    scheduler.save_simulation_results(result, *paths)
+    loaded = SwitchLog.from_frame(pd.read_csv(paths[1]), pd.read_csv(paths[0]))
+
+    assert list(loaded.labels) == list(live.labels)
+    assert np.array_equal(loaded.from_id, live.from_id)
+    assert np.array_equal(loaded.to_id, live.to_id)
+    assert loaded.process_ids('w') == live.process_ids('w') == [0, 1, 3]
+    assert list(loaded.preempted_by('w')) == list(live.preempted_by('w'))
+    # Without the process table the names come from the log itself
+    assert np.array_equal(SwitchLog.from_frame(pd.read_csv(paths[1])).to_id, live.to_id)
+
+
+def test_save_writes_switch_rates(tmp_path):
+    result = same_named_result()
+    paths = [str(tmp_path / name) for name in ('procs.csv', 'switches.csv', 'rates.csv')]
+    scheduler.save_simulation_results(result, *paths)
+    rates = pd.read_csv(paths[2])
+    assert rates['Switches'].sum() == result['context_switches']
+    assert rates.equals(SwitchLog.from_result(result).rates())
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+import scheduler
+from scheduler import PID_BASE
+from timeseries import LoadSeries
+from workload import generate_workload
+
+
+def per_tick(result):
+    """Ready queue length, CPU busy flag and wait of arrivals at every time unit
+
+    The running process is read off the switch log, independently of the
+    arrival/completion step function LoadSeries is built on.
+    """
+    processes = result['processes']
+    end = result['total_time']
+    completion = np.empty(len(processes['pid']), dtype=np.int64)
+    completion[processes['pid'] - PID_BASE] = processes['completion']
+    switches = result['switches']
+
+    ready = np.zeros(end, dtype=np.int64)
+    busy = np.zeros(end, dtype=bool)
+    for t in range(end):
+        in_system = int(((processes['arrival'] <= t) & (processes['completion'] > t)).sum())
+        last = np.searchsorted(switches['time'], t, side='right') - 1
+        running = last >= 0 and switches['to_pid'][last] >= 0 and \
+            completion[switches['to_pid'][last] - PID_BASE] > t
+        busy[t] = running
+        ready[t] = in_system - running
+    return ready, busy
+
+
+@pytest.mark.parametrize('algorithm', ["RR", "FCFS", "PRIORITY"])
+@pytest.mark.parametrize('seed', range(4))
+def test_series_matches_brute_force(algorithm, seed):
+    workload = generate_workload(60, seed=seed, arrival='bursty', burst='uniform')
+    result = scheduler.simulate_scheduling(workload, algorithm, 3)
+    ready, busy = per_tick(result)
+    series = LoadSeries.from_result(result)
+    processes = result['processes']
+    assert series.peak_ready == ready.max()
+    assert series.end == result['total_time']
+
+    end = result['total_time']
+    # Widths that do not divide the span leave a short last bucket
+    for start, stop, width in [(0, end, 7), (0, end, 1), (3, end - 5, 13), (end // 3, end // 2, 4)]:
+        frame = series.series(start, stop, width=width)
+        edges = list(range(start, stop, width)) + [stop]
+        assert frame['Bucket Start'].tolist() == edges[:-1]
+        for row, (lo, hi) in enumerate(zip(edges[:-1], edges[1:])):
+            bucket = frame.iloc[row]
+            assert bucket['Ready (mean)'] == pytest.approx(ready[lo:hi].mean())
+            assert bucket['Ready (peak)'] == ready[lo:hi].max()
+            assert bucket['CPU Busy (%)'] == pytest.approx(busy[lo:hi].mean() * 100)
+            assert bucket['Switches'] == ((result['switches']['time'] >= lo)
+                                          & (result['switches']['time'] < hi)).sum()
+            assert bucket['Completions'] == ((processes['completion'] >= lo)
+                                             & (processes['completion'] < hi)).sum()
+            arrived = (processes['arrival'] >= lo) & (processes['arrival'] < hi)
+            assert bucket['Arrivals'] == arrived.sum()
+            if arrived.any():
+                assert bucket['Avg Wait (arrivals)'] == pytest.approx(processes['wait'][arrived].mean())
+            else:
+                assert np.isnan(bucket['Avg Wait (arrivals)'])
+
+
+def test_series_rejects_empty_range():
+    result = scheduler.simulate_scheduling(generate_workload(10, seed=1), "RR", 2)
+    with pytest.raises(ValueError):
+        LoadSeries.from_result(result).series(50, 50)
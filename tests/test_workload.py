@@ -0,0 +1,15 @@
+import pytest
+
+from workload import ARRIVAL_MODELS, BURST_MODELS, generate_workload
+
+
+@pytest.mark.parametrize('arrival', ARRIVAL_MODELS)
+@pytest.mark.parametrize('burst', BURST_MODELS)
+def test_empty_workload(arrival, burst):
+    workload = generate_workload(0, seed=1, arrival=arrival, burst=burst)
+    assert all(len(column) == 0 for column in workload.values())
+
+
+def test_bursty_group_size_must_be_positive():
+    with pytest.raises(ValueError):
+        generate_workload(10, seed=1, arrival='bursty', group_size=0)
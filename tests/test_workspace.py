@@ -0,0 +1,88 @@
+import os
+
+import numpy as np
+import pytest
+
+import scheduler
+from scheduler import PID_BASE
+from workload import generate_workload
+from workspace import Workspace
+
+
+@pytest.fixture
+def runs(tmp_path):
+    workload = generate_workload(300, seed=2, arrival='bursty')
+    results = {
+        'RR q=2': scheduler.simulate_scheduling(workload, "RR", 2),
+        'FCFS': scheduler.simulate_scheduling(workload, "FCFS", 2)
+    }
+    root = str(tmp_path / 'workspace')
+    workspace = Workspace(root)
+    workspace.add('RR q=2', results['RR q=2'], quantum=2)
+    workspace.add('FCFS', results['FCFS'])
+    # Reopen so every column comes back from disk
+    return Workspace(root), results
+
+
+def expected_by_pid(result, field):
+    processes = result['processes']
+    values = np.empty(len(processes['pid']), dtype=processes[field].dtype)
+    values[processes['pid'] - PID_BASE] = processes[field]
+    return values
+
+
+def test_workspace_is_created_on_first_add(tmp_path):
+    root = str(tmp_path / 'workspace')
+    workspace = Workspace(root)
+    assert len(workspace) == 0 and not os.path.exists(root)
+    workspace.add('run', scheduler.simulate_scheduling(generate_workload(5, seed=1), "RR", 2))
+    assert os.path.isdir(root)
+
+
+def test_reopened_runs_round_trip(runs):
+    workspace, results = runs
+    assert workspace.names() == ['FCFS', 'RR q=2']
+    assert workspace.get('RR q=2').meta['quantum'] == 2
+    for name, result in results.items():
+        run = workspace.get(name)
+        assert isinstance(run.column('wait'), np.memmap)
+        for field in ('wait', 'completion', 'response'):
+            assert np.array_equal(run.by_pid(field), expected_by_pid(result, field))
+        for field in ('time', 'from_pid', 'to_pid', 'reason'):
+            assert np.array_equal(run.column(field), result['switches'][field])
+
+
+def test_timeline_segments(runs):
+    workspace, results = runs
+    run = workspace.get('RR q=2')
+    start, length, pid = run.timeline()
+    # Segments tile the busy time: every time unit of every burst is covered once
+    assert length.sum() == results['RR q=2']['processes']['burst'].sum()
+    assert np.array_equal(pid, results['RR q=2']['switches']['to_pid'])
+    assert (start[1:] >= start[:-1] + length[:-1]).all()
+
+    window = run.timeline(100, 200)
+    first = np.searchsorted(start, 100, side='right') - 1
+    last = np.searchsorted(start, 200, side='left')
+    assert np.array_equal(window[0], start[first:last])
+    assert np.array_equal(window[1], length[first:last])
+
+
+def test_process_diff(runs):
+    workspace, results = runs
+    summary, table = workspace.process_diff('FCFS', 'RR q=2', metric='wait', top=10)
+    delta = expected_by_pid(results['RR q=2'], 'wait') - expected_by_pid(results['FCFS'], 'wait')
+    assert summary['mean_delta'] == pytest.approx(delta.mean())
+    assert summary['improved'] + summary['worse'] + summary['unchanged'] == len(delta)
+    assert summary['worse'] == (delta > 0).sum()
+    assert len(table) == 10
+    assert np.array_equal(table['Δ'].to_numpy(), delta[table['PID'].to_numpy() - PID_BASE])
+    assert (np.abs(table['Δ']).to_numpy() == np.sort(np.abs(delta))[::-1][:10]).all()
+    assert table['Process Name'].iloc[0] == f"P{table['PID'].iloc[0] - PID_BASE + 1}"
+
+
+def test_process_diff_needs_the_same_workload(runs, tmp_path):
+    workspace, _ = runs
+    workspace.add('small', scheduler.simulate_scheduling(generate_workload(10, seed=1), "RR", 2))
+    with pytest.raises(ValueError):
+        workspace.process_diff('FCFS', 'small')
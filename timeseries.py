@@ -0,0 +1,135 @@
+"""Per-bucket time series of scheduler load: ready queue, CPU busy time, switches.
+
+Every engine is work-conserving: the CPU only idles when no process is
+waiting. So with N(t) the number of processes that have arrived but not
+completed, the CPU is busy exactly while N(t) > 0 and the ready queue holds
+max(N(t) - 1, 0) processes. N(t) is a step function of the arrival and
+completion times alone, so ``LoadSeries`` builds it once by merging the two
+sorted columns, takes running integrals of queue depth and busy time at its
+steps, and answers any bucketing with binary searches: a series of B buckets
+costs O(B log n) however long the run was, which keeps zooming cheap even
+for runs with tens of millions of events.
+"""
+import numpy as np
+import pandas as pd
+
+from switchlog import bucket_width
+
+DEFAULT_BUCKETS = 400
+
+SERIES_COLUMNS = ('Bucket Start', 'Ready (mean)', 'Ready (peak)', 'CPU Busy (%)',
+                  'Switches', 'Arrivals', 'Completions', 'Avg Wait (arrivals)')
+
+
+def _sorted(values):
+    values = np.asarray(values, dtype=np.int64)
+    if len(values) > 1 and (values[1:] < values[:-1]).any():
+        return np.sort(values, kind='stable')
+    return values
+
+
+class LoadSeries:
+    """Load of one run as a step function, bucketed on demand by ``series``"""
+
+    def __init__(self, arrival, completion, switch_time, wait=None):
+        arrival = np.asarray(arrival, dtype=np.int64)
+        order = np.argsort(arrival, kind='stable')
+        self.arrival = arrival[order]
+        self.completion = _sorted(completion)
+        self.switch_time = _sorted(switch_time)
+        self._wait_sums = None
+        if wait is not None:
+            self._wait_sums = np.concatenate([[0.0], np.cumsum(np.asarray(wait, dtype=np.float64)[order])])
+
+        # Merge arrivals (+1) and completions (-1); both runs are already
+        # sorted, so the stable sort is a linear merge
+        times = np.concatenate([self.arrival, self.completion])
+        merged = np.argsort(times, kind='stable')
+        times = times[merged]
+        level = np.cumsum(np.where(merged < len(self.arrival), 1, -1))
+        # Only the level after the last event at each time counts
+        last = np.append(times[1:] != times[:-1], True) if len(times) else np.empty(0, dtype=bool)
+        # A zero level before the first event makes every lookup land on a step
+        self.step_time = np.concatenate([[np.iinfo(np.int64).min // 2], times[last]])
+        self.level = np.concatenate([[0], level[last]])
+
+        span = np.diff(self.step_time).astype(np.float64)
+        span[0] = 0
+        ready = np.maximum(self.level - 1, 0)
+        busy = (self.level > 0).astype(np.float64)
+        self._ready_area = np.concatenate([[0.0], np.cumsum(ready[:-1] * span)])
+        self._busy_area = np.concatenate([[0.0], np.cumsum(busy[:-1] * span)])
+        self._ready = ready
+        self._busy = busy
+
+    @classmethod
+    def from_result(cls, result):
+        processes = result['processes']
+        return cls(processes['arrival'], processes['completion'], result['switches']['time'],
+                   processes['wait'])
+
+    @classmethod
+    def from_frame(cls, process_data, switch_times=()):
+        """Series for a process table (and switch times) as saved to CSV"""
+        return cls(process_data['Arrival Time'].to_numpy(), process_data['Completion Time'].to_numpy(),
+                   switch_times, process_data['Wait Time'].to_numpy())
+
+    @property
+    def end(self):
+        """Time the last process completed"""
+        return int(self.completion[-1]) if len(self.completion) else 0
+
+    @property
+    def peak_ready(self):
+        """Most processes waiting in the ready queue at any one time"""
+        return int(self._ready.max())
+
+    def _integral(self, area, values, at):
+        step = np.searchsorted(self.step_time, at, side='right') - 1
+        return area[step] + values[step] * (at - self.step_time[step])
+
+    def series(self, start=None, end=None, buckets=DEFAULT_BUCKETS, width=None):
+        """Per-bucket load over ``[start, end)`` as a DataFrame of ``SERIES_COLUMNS``
+
+        ``width`` defaults to a round bucket width giving about ``buckets``
+        buckets, so a narrower time range gets finer buckets.
+        """
+        start = 0 if start is None else int(start)
+        end = max(self.end, start + 1) if end is None else int(end)
+        if end <= start:
+            raise ValueError("end must be after start")
+        if width is None:
+            width = bucket_width(end - start, buckets)
+        edges = np.arange(start, end + width, width, dtype=np.int64)
+        edges[-1] = min(edges[-1], max(end, edges[-2] + 1))
+        lengths = np.diff(edges).astype(np.float64)
+
+        ready_area = np.diff(self._integral(self._ready_area, self._ready, edges))
+        busy_area = np.diff(self._integral(self._busy_area, self._busy, edges))
+
+        # Peak: the level at each bucket start and every step inside the bucket
+        first = np.searchsorted(self.step_time, edges, side='right') - 1
+        peak = np.maximum.reduceat(self._ready, first)[:-1] if len(edges) > 1 else np.empty(0)
+        # reduceat stops before the next bucket's first step; that step also
+        # lies inside this bucket unless it starts exactly on the edge
+        inside = self.step_time[first[1:]] < edges[1:]
+        peak = np.where(inside, np.maximum(peak, self._ready[first[1:]]), peak)
+
+        arrived = np.searchsorted(self.arrival, edges, side='left')
+        table = {
+            'Bucket Start': edges[:-1],
+            'Ready (mean)': ready_area / lengths,
+            'Ready (peak)': peak.astype(np.int64),
+            'CPU Busy (%)': busy_area / lengths * 100,
+            'Switches': np.diff(np.searchsorted(self.switch_time, edges, side='left')),
+            'Arrivals': np.diff(arrived),
+            'Completions': np.diff(np.searchsorted(self.completion, edges, side='left'))
+        }
+        if self._wait_sums is not None:
+            counts = table['Arrivals']
+            sums = np.diff(self._wait_sums[arrived])
+            table['Avg Wait (arrivals)'] = np.divide(sums, counts, out=np.full(len(counts), np.nan),
+                                                     where=counts > 0)
+        frame = pd.DataFrame(table)
+        frame.attrs['width'] = width
+        return frame
@@ -0,0 +1,244 @@
+"""On-disk workspace of named simulation runs for side-by-side comparison.
+
+Each run is a directory holding one ``.npy`` file per result column plus a
+``meta.json`` with the run's settings and summary statistics. Columns are
+opened as read-only memory maps the first time they are needed, so keeping
+dozens of large runs open costs address space rather than RAM, and stats
+comparisons only ever read the small metadata files.
+"""
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import scheduler
+
+PROCESS_FIELDS = ('pid', 'arrival', 'burst', 'priority', 'wait', 'turnaround',
+                  'completion', 'response')
+SWITCH_FIELDS = ('time', 'from_pid', 'to_pid', 'reason')
+COMPARE_METRICS = ('wait', 'turnaround', 'response', 'completion')
+DEFAULT_ROOT = 'workspace'
+
+STAT_LABELS = {
+    'total_processes': 'Total Processes',
+    'context_switches': 'Context Switches',
+    'total_time': 'Total Time',
+    'avg_wait': 'Avg Wait Time',
+    'avg_turnaround': 'Avg Turnaround',
+    'avg_response': 'Avg Response',
+    'cpu_util': 'CPU Utilization (%)',
+    'throughput': 'Throughput'
+}
+
+
+def run_statistics(result):
+    """Whole-run statistics stored with each run"""
+    processes = result['processes']
+    n = len(processes['pid'])
+    total_time = int(result['total_time'])
+    total_burst = int(np.sum(processes['burst']))
+    return {
+        'total_processes': n,
+        'context_switches': int(result['context_switches']),
+        'total_time': total_time,
+        'avg_wait': float(np.mean(processes['wait'])) if n else 0.0,
+        'avg_turnaround': float(np.mean(processes['turnaround'])) if n else 0.0,
+        'avg_response': float(np.mean(processes['response'])) if n else 0.0,
+        'cpu_util': total_burst / total_time * 100 if total_time > 0 else 0.0,
+        'throughput': n / total_time if total_time > 0 else 0.0
+    }
+
+
+class Run:
+    """A stored run whose columns are memory-mapped on first access"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self._columns = {}
+
+    @property
+    def name(self):
+        return self.meta['name']
+
+    @property
+    def stats(self):
+        return self.meta['stats']
+
+    def column(self, field):
+        """Return a read-only memory map of one result column"""
+        if field not in self._columns:
+            self._columns[field] = np.load(os.path.join(self.path, field + '.npy'),
+                                           mmap_mode='r', allow_pickle=False)
+        return self._columns[field]
+
+    def has_column(self, field):
+        return os.path.exists(os.path.join(self.path, field + '.npy'))
+
+    def by_pid(self, field):
+        """A column reordered so that index ``pid - PID_BASE`` is that process"""
+        pids = self.column('pid')
+        values = self.column(field)
+        if len(pids) and pids[0] == scheduler.PID_BASE and (np.diff(pids) == 1).all():
+            return values
+        ordered = np.empty(len(pids), dtype=values.dtype)
+        ordered[pids - scheduler.PID_BASE] = values
+        return ordered
+
+    def release(self):
+        """Drop the open memory maps"""
+        self._columns.clear()
+
+    def timeline(self, start=None, end=None, limit=20000):
+        """Execution segments overlapping [start, end) as (start, length, pid)
+
+        A process runs from its switch-in until the next switch or until it
+        completes, whichever comes first (the CPU only idles when nothing is
+        ready). The switch log is sorted by time, so the window is found by
+        binary search and only the segments inside it are read.
+        """
+        times = self.column('time')
+        to_pid = self.column('to_pid')
+        lo = 0 if start is None else max(int(np.searchsorted(times, start, side='right')) - 1, 0)
+        hi = len(times) if end is None else int(np.searchsorted(times, end, side='left'))
+        hi = min(hi, lo + limit)
+
+        seg_start = np.asarray(times[lo:hi])
+        seg_pid = np.asarray(to_pid[lo:hi])
+        next_switch = np.asarray(times[lo + 1:hi + 1])
+        if len(next_switch) < len(seg_start):
+            next_switch = np.append(next_switch, np.iinfo(np.int64).max)
+        completion = self.by_pid('completion')[seg_pid - scheduler.PID_BASE]
+        seg_end = np.minimum(next_switch, completion)
+        return seg_start, seg_end - seg_start, seg_pid
+
+
+class Workspace:
+    """A directory of named runs; the directory is created by the first ``add``"""
+
+    def __init__(self, root=DEFAULT_ROOT):
+        self.root = root
+        self._runs = {}
+        entries = sorted(os.listdir(root)) if os.path.isdir(root) else []
+        for entry in entries:
+            path = os.path.join(root, entry)
+            if os.path.exists(os.path.join(path, 'meta.json')):
+                run = Run(path)
+                self._runs[run.name] = run
+
+    def names(self):
+        return list(self._runs)
+
+    def get(self, name):
+        return self._runs[name]
+
+    def __len__(self):
+        return len(self._runs)
+
+    def unique_name(self, base):
+        name, k = base, 2
+        while name in self._runs:
+            name = f"{base} ({k})"
+            k += 1
+        return name
+
+    def add(self, name, result, quantum=None):
+        """Store a simulation result under ``name`` and return its Run"""
+        if name in self._runs:
+            raise ValueError(f"A run named '{name}' already exists")
+
+        slug = re.sub(r'[^A-Za-z0-9_.-]+', '_', name).strip('_') or 'run'
+        path = os.path.join(self.root, slug)
+        k = 2
+        while os.path.exists(path):
+            path = os.path.join(self.root, f"{slug}_{k}")
+            k += 1
+        os.makedirs(path)
+
+        processes = result['processes']
+        for field in PROCESS_FIELDS:
+            np.save(os.path.join(path, field + '.npy'), np.ascontiguousarray(processes[field]))
+        if 'name' in processes:
+            np.save(os.path.join(path, 'name.npy'), np.asarray(processes['name']).astype(str))
+        for field in SWITCH_FIELDS:
+            np.save(os.path.join(path, field + '.npy'),
+                    np.ascontiguousarray(result['switches'][field]))
+
+        meta = {
+            'name': name,
+            'algorithm': result['algorithm'],
+            'quantum': quantum,
+            'stats': run_statistics(result)
+        }
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        run = Run(path)
+        self._runs[name] = run
+        return run
+
+    def remove(self, name):
+        run = self._runs.pop(name)
+        run.release()
+        shutil.rmtree(run.path, ignore_errors=True)
+
+    def stats_table(self, names):
+        """Stats of several runs side by side (rows: statistic, columns: run)"""
+        table = pd.DataFrame({name: self._runs[name].stats for name in names})
+        return table.reindex(list(STAT_LABELS)).rename(index=STAT_LABELS)
+
+    def stats_diff(self, base, other):
+        """``other`` minus ``base`` for every statistic, absolute and relative"""
+        a = pd.Series(self._runs[base].stats).reindex(list(STAT_LABELS))
+        b = pd.Series(self._runs[other].stats).reindex(list(STAT_LABELS))
+        delta = b - a
+        return pd.DataFrame({
+            base: a,
+            other: b,
+            'Δ': delta,
+            'Δ %': (delta / a.where(a != 0)) * 100
+        }).rename(index=STAT_LABELS)
+
+    def process_diff(self, base, other, metric='wait', top=200):
+        """Per-process ``metric`` of two runs of the same workload
+
+        Returns a summary dict and a DataFrame of the ``top`` processes with
+        the largest absolute change.
+        """
+        run_a, run_b = self._runs[base], self._runs[other]
+        a = run_a.by_pid(metric)
+        b = run_b.by_pid(metric)
+        if len(a) != len(b):
+            raise ValueError("Runs have different process counts; per-process diff needs the same workload")
+
+        delta = np.asarray(b, dtype=np.int64) - np.asarray(a, dtype=np.int64)
+        count = min(top, len(delta))
+        if count < len(delta):
+            picked = np.argpartition(-np.abs(delta), count - 1)[:count]
+        else:
+            picked = np.arange(len(delta))
+        picked = picked[np.argsort(-np.abs(delta[picked]), kind='stable')]
+
+        if run_a.has_column('name'):
+            names = run_a.by_pid('name')[picked]
+        else:
+            names = scheduler.default_names(picked)
+
+        table = pd.DataFrame({
+            'PID': picked + scheduler.PID_BASE,
+            'Process Name': names,
+            base: a[picked],
+            other: b[picked],
+            'Δ': delta[picked]
+        })
+        summary = {
+            'mean_delta': float(delta.mean()) if len(delta) else 0.0,
+            'improved': int((delta < 0).sum()),
+            'worse': int((delta > 0).sum()),
+            'unchanged': int((delta == 0).sum())
+        }
+        return summary, table